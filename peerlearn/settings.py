@@ -108,13 +108,24 @@ CHANNEL_LAYERS = {
 }
 
 # Caching
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'TIMEOUT': 900,
+# Shared through Redis when it is available, so every worker sees the same index
+# version stamps, match cache and counters; process-local otherwise (local development)
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'TIMEOUT': 900,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'TIMEOUT': 900,
+        }
     }
-}
 
 # REST Framework
 REST_FRAMEWORK = {
@@ -202,6 +213,13 @@ LOGGING = {
 RAZORPAY_KEY_ID = os.getenv('RAZORPAY_KEY_ID')
 RAZORPAY_KEY_SECRET = os.getenv('RAZORPAY_KEY_SECRET')
 
+# Recommendations
+# Adds a hashed n-gram vector retrieval stage to session recommendations (CPU only, no external model)
+RECOMMENDATION_SEMANTIC_RETRIEVAL = os.getenv('RECOMMENDATION_SEMANTIC_RETRIEVAL', '').lower() in ('1', 'true', 'yes')
+# Mentor matching scores candidate sets at least this large in a process pool when callers ask for it
+MENTOR_MATCHING_PARALLEL_THRESHOLD = int(os.getenv('MENTOR_MATCHING_PARALLEL_THRESHOLD', '5000'))
+MENTOR_MATCHING_WORKERS = int(os.getenv('MENTOR_MATCHING_WORKERS', '4'))
+
 # WebRTC config
 WEBRTC_CONFIG = {
     'iceServers': [
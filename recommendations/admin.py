@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import PopularityMetric
+from .models import PopularityMetric, UserRecommendation, MentorStats, SkillRelation, SkillPhraseStat
 
 @admin.register(PopularityMetric)
 class PopularityMetricAdmin(admin.ModelAdmin):
@@ -7,3 +7,29 @@ class PopularityMetricAdmin(admin.ModelAdmin):
     list_filter = ('updated_at',)
     search_fields = ('session__title', 'session__mentor__username')
     readonly_fields = ('updated_at',)
+
+@admin.register(UserRecommendation)
+class UserRecommendationAdmin(admin.ModelAdmin):
+    list_display = ('user', 'computed_at')
+    search_fields = ('user__username', 'user__email')
+    readonly_fields = ('computed_at',)
+
+@admin.register(MentorStats)
+class MentorStatsAdmin(admin.ModelAdmin):
+    list_display = ('mentor', 'avg_rating', 'rating_count', 'total_sessions', 'completed_sessions', 'follower_count', 'updated_at')
+    search_fields = ('mentor__username', 'mentor__email')
+    readonly_fields = ('updated_at',)
+
+@admin.register(SkillRelation)
+class SkillRelationAdmin(admin.ModelAdmin):
+    list_display = ('skill', 'related_skill', 'weight', 'updated_at')
+    list_editable = ('weight',)
+    search_fields = ('skill', 'related_skill')
+    readonly_fields = ('created_at', 'updated_at')
+
+@admin.register(SkillPhraseStat)
+class SkillPhraseStatAdmin(admin.ModelAdmin):
+    list_display = ('phrase', 'domain', 'session_count', 'recent_count', 'previous_count', 'growth', 'updated_at')
+    list_filter = ('domain',)
+    search_fields = ('phrase',)
+    readonly_fields = ('updated_at',)
@@ -0,0 +1,329 @@
+"""
+Recommendation Benchmark Suite for PeerLearn
+Seeds a reproducible synthetic dataset and times the recommendation and matching
+entry points, reporting wall time, query count and peak Python memory per case
+"""
+
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from sessions.models import Session, Booking, Feedback
+from users.models import User
+from .models import PopularityMetric, MentorStats, MentorSkillTag
+from .index_version import bump_version
+from .skill_index import INDEX_VERSION_KEY
+from .collaborative import MATRIX_VERSION_KEY
+from . import trending
+
+USERNAME_PREFIX = 'bench_'
+
+SKILLS = [
+    'python', 'django', 'flask', 'javascript', 'react', 'vue', 'node.js', 'typescript',
+    'html', 'css', 'java', 'kotlin', 'swift', 'flutter', 'android', 'ios',
+    'sql', 'postgresql', 'data science', 'machine learning', 'statistics', 'pandas',
+    'tensorflow', 'pytorch', 'docker', 'kubernetes', 'aws', 'ui design', 'figma', 'marketing',
+]
+
+TITLE_TEMPLATES = [
+    'Introduction to {skill}',
+    '{skill} for beginners',
+    'Advanced {skill} workshop',
+    'Hands-on {skill} project session',
+    '{skill} interview preparation',
+]
+
+# Keeps index stamps and cached matches from the throwaway database out of the shared cache
+ISOLATED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'recommendation-benchmark',
+    }
+}
+
+CATEGORIES = [choice for choice, _ in Session.CATEGORY_CHOICES]
+DOMAINS = ['technology', 'programming', 'data science', 'design', 'business']
+
+
+@contextmanager
+def isolated_database():
+    """
+    Run the enclosed code against a freshly migrated test database and a private cache
+
+    The configured database is restored and the test database destroyed afterwards,
+    so nothing generated or rebuilt by the benchmark touches live data. Tables are
+    created straight from the models; the benchmark needs no migration data.
+    """
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    previous_migrate = test_settings.get('MIGRATE', True)
+    test_settings['MIGRATE'] = False
+    try:
+        with override_settings(CACHES=ISOLATED_CACHES):
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                yield
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+    finally:
+        test_settings['MIGRATE'] = previous_migrate
+
+
+def generate_dataset(learners=200, mentors=40, sessions=400, bookings=2000, feedback=600, seed=42):
+    """
+    Create a synthetic dataset with bulk inserts
+
+    All users are prefixed with USERNAME_PREFIX so clear_dataset() can remove
+    everything generated here (sessions, bookings and feedback cascade).
+
+    Returns:
+        Dict of created row counts
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password(None)
+
+    with transaction.atomic():
+        mentor_users = [
+            User(
+                username=f'{USERNAME_PREFIX}mentor_{i}',
+                email=f'{USERNAME_PREFIX}mentor_{i}@example.com',
+                password=password,
+                role='mentor',
+                skills=', '.join(rng.sample(SKILLS, rng.randint(2, 6))),
+                domain=rng.choice(DOMAINS),
+                hourly_rate=Decimal(rng.choice([0, 300, 500, 800, 1200, 2000])),
+                experience_years=rng.randint(0, 15),
+                is_verified=True,
+                last_active=now - timedelta(hours=rng.randint(0, 24 * 14)),
+            )
+            for i in range(mentors)
+        ]
+        learner_users = [
+            User(
+                username=f'{USERNAME_PREFIX}learner_{i}',
+                email=f'{USERNAME_PREFIX}learner_{i}@example.com',
+                password=password,
+                role='learner',
+                skills=', '.join(rng.sample(SKILLS, rng.randint(1, 4))),
+                interests=', '.join(rng.sample(SKILLS, rng.randint(1, 4))),
+                domain=rng.choice(DOMAINS),
+            )
+            for i in range(learners)
+        ]
+        User.objects.bulk_create(mentor_users + learner_users, batch_size=500)
+
+        session_rows = []
+        for i in range(sessions):
+            mentor = rng.choice(mentor_users)
+            skill = rng.choice(mentor.skills.split(', '))
+            schedule = now + timedelta(hours=rng.randint(-24 * 30, 24 * 30))
+            session_rows.append(Session(
+                mentor=mentor,
+                title=rng.choice(TITLE_TEMPLATES).format(skill=skill.title()),
+                description=f'Learn {skill} with practical examples and live Q&A.',
+                category=rng.choice(CATEGORIES),
+                skills=', '.join(dict.fromkeys([skill, *rng.sample(SKILLS, 2)])),
+                price=Decimal(rng.choice([0, 199, 499, 999])) or None,
+                schedule=schedule,
+                duration=rng.choice([30, 45, 60, 90]),
+                max_participants=rng.randint(5, 30),
+                status='scheduled' if schedule > now else 'completed',
+            ))
+        Session.objects.bulk_create(session_rows, batch_size=500)
+
+        PopularityMetric.objects.bulk_create([
+            PopularityMetric(
+                session=session,
+                view_count=rng.randint(0, 500),
+                booking_count=rng.randint(0, 30),
+                completion_rate=rng.uniform(0, 100),
+                rating_average=rng.uniform(3, 5),
+            )
+            for session in session_rows
+        ], batch_size=500)
+
+        pairs = set()
+        booking_rows = []
+        attempts = 0
+        while len(booking_rows) < bookings and attempts < bookings * 5 and learner_users and session_rows:
+            attempts += 1
+            learner, session = rng.choice(learner_users), rng.choice(session_rows)
+            if (learner.pk, session.pk) in pairs:
+                continue
+            pairs.add((learner.pk, session.pk))
+            booking_rows.append(Booking(
+                learner=learner,
+                session=session,
+                status='cancelled' if rng.random() < 0.1 else 'confirmed',
+            ))
+        Booking.objects.bulk_create(booking_rows, batch_size=500)
+        Booking.objects.filter(pk__in=[b.pk for b in booking_rows[:max(1, len(booking_rows) // 5)]]).update(
+            created_at=now - timedelta(days=rng.randint(0, 6))
+        )
+
+        completed = [b for b in booking_rows if b.status == 'confirmed' and b.session.status == 'completed']
+        feedback_rows = [
+            Feedback(
+                session=booking.session,
+                user=booking.learner,
+                rating=rng.choice([3, 4, 4, 5, 5]),
+                comment='Generated for benchmarking',
+            )
+            for booking in rng.sample(completed, min(feedback, len(completed)))
+        ]
+        Feedback.objects.bulk_create(feedback_rows, batch_size=500)
+
+    # Bulk inserts skip signals, so refresh the derived data they would have kept current
+    MentorStats.refresh([mentor.pk for mentor in mentor_users])
+    MentorSkillTag.objects.bulk_create([
+        MentorSkillTag(mentor=mentor, skill=skill)
+        for mentor in mentor_users
+        for skill in MentorSkillTag.normalize(mentor.skills)
+    ], batch_size=500, ignore_conflicts=True)
+    trending.rebuild_buckets()
+    bump_version(INDEX_VERSION_KEY)
+    bump_version(MATRIX_VERSION_KEY)
+
+    return {
+        'mentors': len(mentor_users),
+        'learners': len(learner_users),
+        'sessions': len(session_rows),
+        'bookings': len(booking_rows),
+        'feedback': len(feedback_rows),
+    }
+
+
+def clear_dataset():
+    """Delete every generated user along with their sessions, bookings and feedback"""
+    deleted, _ = User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+    bump_version(INDEX_VERSION_KEY)
+    bump_version(MATRIX_VERSION_KEY)
+    return deleted
+
+
+def learner_profile(learner):
+    """Matching-engine profile built from a learner's stored fields"""
+    return {
+        'skills': [skill.strip() for skill in (learner.interests or learner.skills or '').split(',') if skill.strip()],
+        'domain': learner.domain or '',
+        'urgency': 'flexible',
+        'budget': '1000',
+    }
+
+
+def get_cases():
+    """Benchmark cases as (name, callable taking a learner)"""
+    from sessions.matching import MentorMatchingEngine
+    from .precompute import invalidate_user
+    from .recommendation_engine import get_recommendations_for_user, get_mentor_recommendations_for_user
+
+    def recommendations_cold(learner):
+        invalidate_user(learner.pk)
+        return get_recommendations_for_user(learner)
+
+    def mentor_recommendations_cold(learner):
+        invalidate_user(learner.pk)
+        return get_mentor_recommendations_for_user(learner)
+
+    return [
+        ('get_recommendations_for_user (cold)', recommendations_cold),
+        ('get_recommendations_for_user (warm)', get_recommendations_for_user),
+        ('get_mentor_recommendations_for_user (cold)', mentor_recommendations_cold),
+        ('get_mentor_recommendations_for_user (warm)', get_mentor_recommendations_for_user),
+        ('MentorMatchingEngine.find_best_mentors', lambda learner: MentorMatchingEngine().find_best_mentors(learner_profile(learner))),
+        ('MentorMatchingEngine.find_session_recommendations', lambda learner: MentorMatchingEngine().find_session_recommendations(learner)),
+    ]
+
+
+def measure(func, *args):
+    """Run func once; returns (seconds, query count, peak traced bytes)"""
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            func(*args)
+            elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, len(queries), peak
+
+
+def run_benchmarks(learners, repeat=3, cases=None, names=None):
+    """
+    Time every case against every sample learner, after one untimed warm-up call each
+
+    Returns:
+        List of result dicts: name, runs, mean_ms, median_ms, max_ms, queries, peak_kb, error
+    """
+    results = []
+    for name, func in cases or get_cases():
+        if names and not any(part.lower() in name.lower() for part in names):
+            continue
+
+        timings, query_counts, peaks, error = [], [], [], None
+        for learner in learners:
+            try:
+                func(learner)  # Untimed warm-up: builds in-process indexes and stored lists
+            except Exception as e:
+                error = f'{type(e).__name__}: {e}'
+                break
+            for _ in range(repeat):
+                try:
+                    elapsed, query_count, peak = measure(func, learner)
+                except Exception as e:
+                    error = f'{type(e).__name__}: {e}'
+                    break
+                timings.append(elapsed * 1000)
+                query_counts.append(query_count)
+                peaks.append(peak)
+            if error:
+                break
+
+        results.append({
+            'name': name,
+            'runs': len(timings),
+            'mean_ms': round(statistics.mean(timings), 3) if timings else None,
+            'median_ms': round(statistics.median(timings), 3) if timings else None,
+            'max_ms': round(max(timings), 3) if timings else None,
+            'queries': round(statistics.mean(query_counts), 1) if query_counts else None,
+            'peak_kb': round(max(peaks) / 1024, 1) if peaks else None,
+            'error': error,
+        })
+    return results
+
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Regressions against a previous run's results
+
+    A case regresses when its mean time grows by more than the tolerance
+    fraction, or it issues more queries than before.
+    """
+    previous = {result['name']: result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result['name'])
+        if not before:
+            continue
+        if result['error'] and not before.get('error'):
+            regressions.append(f"{result['name']}: now fails ({result['error']})")
+            continue
+        if result['mean_ms'] is None or before.get('mean_ms') is None:
+            continue
+        if result['mean_ms'] > before['mean_ms'] * (1 + tolerance):
+            regressions.append(
+                f"{result['name']}: mean {before['mean_ms']:.1f}ms -> {result['mean_ms']:.1f}ms"
+            )
+        if result['queries'] > before['queries']:
+            regressions.append(
+                f"{result['name']}: queries {before['queries']} -> {result['queries']}"
+            )
+    return regressions
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Warning, register, Tags
+
+# Backends whose contents are private to one process
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Index version stamps only reach other workers through a cache they all share"""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f"The default cache ({backend}) is private to each process.",
+            hint="Set REDIS_URL (or configure a shared cache) so recommendation index updates, "
+                 "the mentor match cache and buffered counters reach every worker.",
+            id='recommendations.W001',
+        )
+    ]
@@ -0,0 +1,173 @@
+"""
+Vectorized Collaborative Filtering for PeerLearn
+Sparse learner x skill matrix scored against a learner in one pass, with neighbour
+bookings folded into a learner x session matrix to rank candidate sessions
+"""
+
+import threading
+import time
+import numpy as np
+from scipy import sparse
+from django.utils import timezone
+from sessions.models import Booking
+from users.models import User
+from .index_version import current_version, publish_change
+from .skill_index import parse_skills
+
+MATRIX_VERSION_KEY = 'recommendations_learner_matrix_version'
+REBUILD_INTERVAL = 900
+
+
+class LearnerSkillMatrix:
+    """Binary learner x skill matrix over every learner's interests"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.built_at = 0
+        self.learner_ids = []                                # row -> learner id
+        self.rows = {}                                       # learner id -> row
+        self.row_skills = []                                 # row -> frozenset of skills
+        self.vocabulary = {}                                 # skill -> column
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.row_sizes = np.zeros(0, dtype=np.float32)
+
+    def build(self, version):
+        """Rebuild the matrix from learner interests"""
+        learners = User.objects.filter(
+            role='learner',
+            interests__isnull=False
+        ).exclude(interests='').values_list('id', 'interests')
+
+        learner_ids, row_skills, vocabulary = [], [], {}
+        row_index, col_index = [], []
+        for learner_id, interests in learners:
+            skills = frozenset(parse_skills(interests))
+            if not skills:
+                continue
+            row = len(learner_ids)
+            learner_ids.append(learner_id)
+            row_skills.append(skills)
+            for skill in skills:
+                row_index.append(row)
+                col_index.append(vocabulary.setdefault(skill, len(vocabulary)))
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(row_index), dtype=np.float32), (row_index, col_index)),
+            shape=(len(learner_ids), len(vocabulary))
+        )
+
+        with self.lock:
+            self.learner_ids = learner_ids
+            self.rows = {learner_id: row for row, learner_id in enumerate(learner_ids)}
+            self.row_skills = row_skills
+            self.vocabulary = vocabulary
+            self.matrix = matrix
+            self.row_sizes = np.asarray(matrix.sum(axis=1), dtype=np.float32).ravel()
+            self.version = version
+            self.built_at = time.monotonic()
+
+    def is_current_for(self, user):
+        """Whether the matrix already reflects this user's role and interests"""
+        skills = frozenset(parse_skills(user.interests or '')) if user.role == 'learner' else frozenset()
+        row = self.rows.get(user.pk)
+        if row is None:
+            return not skills
+        return self.row_skills[row] == skills
+
+    def similar_learners(self, skills, exclude_id=None, threshold=0.3, top_k=5):
+        """Top-k (learner_id, jaccard) pairs above the similarity threshold"""
+        skills = set(skills)
+        with self.lock:
+            columns = [self.vocabulary[skill] for skill in skills if skill in self.vocabulary]
+            if not columns or not self.learner_ids:
+                return []
+
+            query = np.zeros(len(self.vocabulary), dtype=np.float32)
+            query[columns] = 1.0
+
+            # Jaccard for every learner at once: |A & B| / (|A| + |B| - |A & B|)
+            intersection = self.matrix @ query
+            union = self.row_sizes + len(skills) - intersection
+            similarity = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+            exclude_row = self.rows.get(exclude_id)
+            if exclude_row is not None:
+                similarity[exclude_row] = 0.0
+
+            candidates = np.flatnonzero(similarity > threshold)
+            if len(candidates) > top_k:
+                candidates = candidates[np.argpartition(-similarity[candidates], top_k - 1)[:top_k]]
+            candidates = candidates[np.argsort(-similarity[candidates], kind='stable')]
+
+            return [(self.learner_ids[row], float(similarity[row])) for row in candidates]
+
+
+_learner_matrix = LearnerSkillMatrix()
+
+
+def get_learner_matrix():
+    """Return the process-wide matrix, rebuilding it when stale"""
+    version = current_version(MATRIX_VERSION_KEY)
+    if (_learner_matrix.version != version or
+            time.monotonic() - _learner_matrix.built_at > REBUILD_INTERVAL):
+        _learner_matrix.build(version)
+    return _learner_matrix
+
+
+def invalidate_learner(user):
+    """Mark the matrix stale in every process if this user's interests may no longer match it"""
+    def update():
+        if _learner_matrix.is_current_for(user):
+            return False
+        # Rows are not patched in place; rebuild on the next lookup like every other process
+        _learner_matrix.version = None
+
+    publish_change(MATRIX_VERSION_KEY, _learner_matrix, update)
+
+
+def similar_learner_sessions(user, skills, top_k=5, threshold=0.3):
+    """
+    Score upcoming sessions booked by the user's nearest neighbours
+
+    Returns:
+        Dict of session_id -> summed neighbour similarity
+    """
+    neighbours = get_learner_matrix().similar_learners(
+        skills, exclude_id=user.pk, threshold=threshold, top_k=top_k
+    )
+    if not neighbours:
+        return {}
+
+    neighbour_rows = {learner_id: row for row, (learner_id, _) in enumerate(neighbours)}
+    similarities = np.array([similarity for _, similarity in neighbours], dtype=np.float32)
+
+    # One query for every neighbour's upcoming confirmed bookings
+    bookings = Booking.objects.filter(
+        learner_id__in=list(neighbour_rows),
+        status='confirmed',
+        session__status='scheduled',
+        session__schedule__gte=timezone.now()
+    ).exclude(
+        session__in=Booking.objects.filter(learner=user, status='confirmed').values('session_id')
+    ).values_list('learner_id', 'session_id')
+
+    session_ids, session_columns = [], {}
+    row_index, col_index = [], []
+    for learner_id, session_id in bookings:
+        if session_id not in session_columns:
+            session_columns[session_id] = len(session_ids)
+            session_ids.append(session_id)
+        row_index.append(neighbour_rows[learner_id])
+        col_index.append(session_columns[session_id])
+
+    if not session_ids:
+        return {}
+
+    booked = sparse.csr_matrix(
+        (np.ones(len(row_index), dtype=np.float32), (row_index, col_index)),
+        shape=(len(neighbours), len(session_ids))
+    )
+    scores = booked.T @ similarities
+
+    return {session_id: float(scores[column]) for session_id, column in session_columns.items()}
@@ -0,0 +1,46 @@
+"""
+Shared version stamps for in-process recommendation indexes
+Each index remembers the stamp it was built from; bumping the stamp in the cache tells
+every other process to rebuild on its next lookup. That needs a cache shared by all
+workers (Redis via REDIS_URL); with a process-local cache each worker only catches up
+at its periodic rebuild, which the recommendations.W001 check warns about.
+"""
+
+import uuid
+from django.core.cache import cache
+
+
+def current_version(key):
+    """Read the shared version stamp, creating one if the cache has none"""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """Publish a new version stamp and return it"""
+    version = uuid.uuid4().hex
+    cache.set(key, version, None)
+    return version
+
+
+def publish_change(key, index, update):
+    """
+    Apply an incremental update to this process's index and tell the others to rebuild
+
+    The update is only applied to an index that is built and current. One that already
+    missed another process's change is marked stale instead, so its next lookup rebuilds
+    rather than claiming the new stamp. update() may return False when nothing changed,
+    in which case nothing is published, or set index.version to None when the change
+    cannot be applied in place, so this process rebuilds along with the others.
+    """
+    if index.version is not None and index.version == current_version(key):
+        if update() is False:
+            return
+        if index.version is not None:
+            index.version = bump_version(key)
+            return
+    index.version = None
+    bump_version(key)
@@ -0,0 +1,127 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from users.models import User
+from recommendations import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic dataset and time the recommendation and mentor matching entry points. '
+        'Runs in a throwaway test database unless --allow-live-db is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--learners', type=int, default=200, help='Learners to generate')
+        parser.add_argument('--mentors', type=int, default=40, help='Mentors to generate')
+        parser.add_argument('--sessions', type=int, default=400, help='Sessions to generate')
+        parser.add_argument('--bookings', type=int, default=2000, help='Bookings to generate')
+        parser.add_argument('--feedback', type=int, default=600, help='Feedback entries to generate')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for a reproducible dataset')
+        parser.add_argument('--samples', type=int, default=5, help='Learners to run each case for')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per case and learner')
+        parser.add_argument(
+            '--case',
+            action='append',
+            dest='cases',
+            help='Only run cases whose name contains this text (repeatable)'
+        )
+        parser.add_argument(
+            '--allow-live-db',
+            action='store_true',
+            help='Run against the configured database instead of a throwaway one; generated '
+                 'bench_* users (and any real account with that prefix) are deleted there'
+        )
+        parser.add_argument(
+            '--reuse',
+            action='store_true',
+            help='Benchmark an existing generated dataset instead of regenerating it (needs --allow-live-db)'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Leave the generated dataset in the database afterwards (needs --allow-live-db)'
+        )
+        parser.add_argument('--output', help='Write results as JSON to this file')
+        parser.add_argument(
+            '--baseline',
+            help='JSON results from a previous run; exit with an error if any case regressed'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed fractional slowdown against the baseline (default 0.25)'
+        )
+
+    def handle(self, *args, **options):
+        if options['allow_live_db']:
+            self.run(options)
+            return
+
+        if options['reuse'] or options['keep']:
+            raise CommandError('--reuse and --keep only apply to the configured database; add --allow-live-db')
+        self.stdout.write('Running in a throwaway test database')
+        with benchmark.isolated_database():
+            self.run(options)
+
+    def run(self, options):
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as f:
+                    baseline = json.load(f)['results']
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Could not read baseline {options['baseline']}: {e}")
+
+        if options['reuse']:
+            dataset = None
+        else:
+            benchmark.clear_dataset()
+            dataset = benchmark.generate_dataset(
+                learners=options['learners'],
+                mentors=options['mentors'],
+                sessions=options['sessions'],
+                bookings=options['bookings'],
+                feedback=options['feedback'],
+                seed=options['seed'],
+            )
+            self.stdout.write(
+                'Generated ' + ', '.join(f'{count} {name}' for name, count in dataset.items())
+            )
+
+        try:
+            learners = list(User.objects.filter(
+                username__startswith=f'{benchmark.USERNAME_PREFIX}learner_'
+            ).order_by('username')[:options['samples']])
+            if not learners:
+                raise CommandError('No generated learners found; run without --reuse first')
+
+            results = benchmark.run_benchmarks(learners, repeat=options['repeat'], names=options['cases'])
+        finally:
+            if not options['keep'] and not options['reuse']:
+                benchmark.clear_dataset()
+
+        self.stdout.write(f"\n{'case':<52}{'runs':>6}{'mean ms':>10}{'median':>10}{'max':>10}{'queries':>9}{'peak KB':>10}")
+        for result in results:
+            if result['error']:
+                self.stdout.write(self.style.ERROR(f"{result['name']:<52}  failed: {result['error']}"))
+                continue
+            self.stdout.write(
+                f"{result['name']:<52}{result['runs']:>6}{result['mean_ms']:>10.2f}{result['median_ms']:>10.2f}"
+                f"{result['max_ms']:>10.2f}{result['queries']:>9}{result['peak_kb']:>10.1f}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'dataset': dataset, 'options': {
+                    key: options[key] for key in ('learners', 'mentors', 'sessions', 'bookings', 'feedback', 'seed', 'samples', 'repeat')
+                }, 'results': results}, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if baseline is not None:
+            regressions = benchmark.compare(results, baseline, tolerance=options['tolerance'])
+            if regressions:
+                for regression in regressions:
+                    self.stderr.write(self.style.ERROR(f'Regression: {regression}'))
+                raise CommandError(f'{len(regressions)} benchmark regression(s) against {options["baseline"]}')
+            self.stdout.write(self.style.SUCCESS('No regressions against baseline'))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from users.models import User
+from recommendations.models import UserRecommendation
+from recommendations.precompute import MAX_AGE
+from recommendations.recommendation_engine import precompute_recommendations_for_user
+
+
+class Command(BaseCommand):
+    help = 'Precompute top session and mentor recommendations for every active learner (run on a schedule)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-only',
+            action='store_true',
+            help='Only recompute learners with no stored lists or lists older than half the max age'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Stop after this many learners'
+        )
+
+    def handle(self, *args, **options):
+        learners = User.objects.filter(role='learner', is_active=True).order_by('date_joined')
+
+        if options['stale_only']:
+            fresh_after = timezone.now() - MAX_AGE / 2
+            learners = learners.exclude(
+                id__in=UserRecommendation.objects.filter(
+                    computed_at__gte=fresh_after,
+                    session_ids__isnull=False,
+                    mentors__isnull=False
+                ).values('user_id')
+            )
+
+        if options['limit']:
+            learners = learners[:options['limit']]
+
+        computed = failed = 0
+        for learner in learners.iterator():
+            try:
+                precompute_recommendations_for_user(learner)
+                computed += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Failed to precompute recommendations for {learner.username}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Precomputed recommendations for {computed} learners ({failed} failed)"
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from recommendations import popularity
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute completion rate, rating and score for every session (run on a schedule). '
+        'View and booking counts are flushed by the web workers themselves.'
+    )
+
+    def handle(self, *args, **options):
+        updated = popularity.recompute_quality()
+        self.stdout.write(self.style.SUCCESS(f"Recomputed popularity for {updated} sessions"))
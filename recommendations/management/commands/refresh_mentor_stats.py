@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from recommendations.models import MentorStats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the MentorStats rollup for every mentor (run on a schedule so the 30-day activity window slides)'
+
+    def handle(self, *args, **options):
+        refreshed = MentorStats.refresh()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed stats for {refreshed} mentors"))
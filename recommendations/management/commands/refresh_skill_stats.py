@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from recommendations import skill_phrases
+
+
+class Command(BaseCommand):
+    help = 'Recompute skill phrase counts and 7-day growth behind skill suggestions (run on a schedule)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--extract',
+            action='store_true',
+            help='Re-extract every session\'s phrases first, picking up phrases newly listed elsewhere'
+        )
+
+    def handle(self, *args, **options):
+        if options['extract']:
+            extracted = skill_phrases.extract_all()
+            self.stdout.write(f"Extracted {extracted} session skill phrases")
+
+        refreshed = skill_phrases.refresh_stats()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} skill phrase stats"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from recommendations import trending
+
+
+class Command(BaseCommand):
+    help = 'Drop hourly booking buckets that slid out of the trending window (run on a schedule)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recount every bucket in the window from bookings instead of only pruning'
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            written = trending.rebuild_buckets()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} trending buckets from bookings"))
+            return
+
+        pruned = trending.prune_buckets()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} expired trending buckets"))
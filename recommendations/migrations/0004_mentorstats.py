@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:27
+
+import django.db.models.deletion
+from datetime import timedelta
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+
+def backfill_mentor_stats(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Session = apps.get_model('learning_sessions', 'Session')
+    Feedback = apps.get_model('learning_sessions', 'Feedback')
+    Follow = apps.get_model('users', 'Follow')
+    MentorStats = apps.get_model('recommendations', 'MentorStats')
+
+    ratings = {
+        row['session__mentor_id']: row
+        for row in Feedback.objects.values('session__mentor_id').annotate(
+            avg_rating=Avg('rating'), rating_count=Count('id')
+        )
+    }
+    recent_date = timezone.now() - timedelta(days=30)
+    sessions = {
+        row['mentor_id']: row
+        for row in Session.objects.values('mentor_id').annotate(
+            total_sessions=Count('id'),
+            completed_sessions=Count('id', filter=Q(status='completed')),
+            recent_sessions=Count('id', filter=Q(schedule__gte=recent_date))
+        )
+    }
+    followers = dict(
+        Follow.objects.values('following_id').annotate(
+            follower_count=Count('id')
+        ).values_list('following_id', 'follower_count')
+    )
+
+    rows = []
+    for mentor_id in User.objects.filter(role='mentor').values_list('id', flat=True):
+        rating = ratings.get(mentor_id, {})
+        session = sessions.get(mentor_id, {})
+        rows.append(MentorStats(
+            mentor_id=mentor_id,
+            avg_rating=rating.get('avg_rating') or 0.0,
+            rating_count=rating.get('rating_count', 0),
+            total_sessions=session.get('total_sessions', 0),
+            completed_sessions=session.get('completed_sessions', 0),
+            recent_sessions=session.get('recent_sessions', 0),
+            follower_count=followers.get(mentor_id, 0),
+        ))
+    MentorStats.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0003_userrecommendation'),
+        ('learning_sessions', '0006_remove_notification_feedback_requested_and_more'),
+        ('users', '0005_alter_user_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MentorStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('avg_rating', models.FloatField(default=0.0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('total_sessions', models.IntegerField(default=0)),
+                ('completed_sessions', models.IntegerField(default=0)),
+                ('recent_sessions', models.IntegerField(default=0, help_text='Sessions scheduled in the last 30 days or later')),
+                ('follower_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('mentor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='mentor_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Mentor stats',
+                'indexes': [models.Index(fields=['-avg_rating'], name='recommendat_avg_rat_6443de_idx'), models.Index(fields=['-total_sessions'], name='recommendat_total_s_f8c5a6_idx'), models.Index(fields=['-completed_sessions'], name='recommendat_complet_fdb1ee_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_mentor_stats, migrations.RunPython.noop),
+    ]
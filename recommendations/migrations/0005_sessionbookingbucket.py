@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:33
+
+import django.db.models.deletion
+from datetime import timedelta, timezone as dt_timezone
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+
+def backfill_buckets(apps, schema_editor):
+    Booking = apps.get_model('learning_sessions', 'Booking')
+    SessionBookingBucket = apps.get_model('recommendations', 'SessionBookingBucket')
+
+    window_start = (timezone.now() - timedelta(days=7)).replace(minute=0, second=0, microsecond=0)
+    counts = Booking.objects.filter(
+        created_at__gte=window_start
+    ).exclude(status='cancelled').annotate(
+        hour=TruncHour('created_at', tzinfo=dt_timezone.utc)
+    ).values('session_id', 'hour').annotate(count=Count('id'))
+
+    SessionBookingBucket.objects.bulk_create([
+        SessionBookingBucket(session_id=row['session_id'], hour=row['hour'], count=row['count'])
+        for row in counts
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_sessions', '0006_remove_notification_feedback_requested_and_more'),
+        ('recommendations', '0004_mentorstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionBookingBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(help_text='Start of the hour the bookings were made in')),
+                ('count', models.IntegerField(default=0)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_buckets', to='learning_sessions.session')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='recommendat_hour_3169fc_idx')],
+                'unique_together': {('session', 'hour')},
+            },
+        ),
+        migrations.RunPython(backfill_buckets, migrations.RunPython.noop),
+    ]
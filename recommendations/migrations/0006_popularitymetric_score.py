@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:34
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_score(apps, schema_editor):
+    PopularityMetric = apps.get_model('recommendations', 'PopularityMetric')
+    PopularityMetric.objects.update(score=(
+        F('view_count') * 0.1 +
+        F('booking_count') * 0.3 +
+        F('completion_rate') * 0.4 +
+        F('rating_average') * 0.2
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0005_sessionbookingbucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='popularitymetric',
+            name='score',
+            field=models.FloatField(db_index=True, default=0.0, help_text='Stored calculate_score() for ordering in SQL'),
+        ),
+        migrations.RunPython(backfill_score, migrations.RunPython.noop),
+    ]
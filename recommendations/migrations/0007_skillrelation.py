@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:36
+
+from django.db import migrations, models
+
+# The keyword table MentorMatchingEngine._find_related_skills used to hardcode
+SEED_RELATIONS = {
+    'python': ['django', 'flask', 'fastapi', 'programming'],
+    'javascript': ['react', 'vue', 'angular', 'node.js', 'web development'],
+    'web development': ['html', 'css', 'javascript', 'frontend', 'backend'],
+    'data science': ['python', 'r', 'statistics', 'machine learning', 'analytics'],
+    'machine learning': ['python', 'tensorflow', 'pytorch', 'data science', 'ai'],
+    'mobile development': ['android', 'ios', 'react native', 'flutter', 'swift', 'kotlin'],
+}
+
+
+def seed_relations(apps, schema_editor):
+    SkillRelation = apps.get_model('recommendations', 'SkillRelation')
+    SkillRelation.objects.bulk_create([
+        SkillRelation(skill=skill, related_skill=related_skill, weight=1.0)
+        for skill, related_skills in SEED_RELATIONS.items()
+        for related_skill in related_skills
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0006_popularitymetric_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillRelation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(db_index=True, max_length=100)),
+                ('related_skill', models.CharField(max_length=100)),
+                ('weight', models.FloatField(default=1.0, help_text='Strength of the relation, 0 to 1')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['skill', '-weight'],
+                'unique_together': {('skill', 'related_skill')},
+            },
+        ),
+        migrations.RunPython(seed_relations, migrations.RunPython.noop),
+    ]
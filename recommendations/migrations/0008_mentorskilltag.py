@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_tags(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    MentorSkillTag = apps.get_model('recommendations', 'MentorSkillTag')
+
+    tags = []
+    for mentor_id, skills in User.objects.filter(role='mentor').values_list('id', 'skills'):
+        normalized = {skill.strip().lower()[:100] for skill in (skills or '').split(',') if skill.strip()}
+        tags.extend(MentorSkillTag(mentor_id=mentor_id, skill=skill) for skill in normalized)
+    MentorSkillTag.objects.bulk_create(tags, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0007_skillrelation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MentorSkillTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=100)),
+                ('mentor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_tags', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'mentor'], name='recommendat_skill_e6c215_idx')],
+                'unique_together': {('mentor', 'skill')},
+            },
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_listed_phrases(apps, schema_editor):
+    # Only phrases listed in skills; refresh_skill_stats --extract adds ones found in text
+    Session = apps.get_model('learning_sessions', 'Session')
+    SessionSkillPhrase = apps.get_model('recommendations', 'SessionSkillPhrase')
+
+    rows = []
+    for session_id, skills in Session.objects.values_list('id', 'skills'):
+        phrases = {skill.strip().lower()[:100] for skill in (skills or '').split(',') if skill.strip()}
+        rows.extend(SessionSkillPhrase(session_id=session_id, phrase=phrase, listed=True) for phrase in phrases)
+    SessionSkillPhrase.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_sessions', '0006_remove_notification_feedback_requested_and_more'),
+        ('recommendations', '0008_mentorskilltag'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillPhraseStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phrase', models.CharField(max_length=100)),
+                ('domain', models.CharField(blank=True, help_text='Session category', max_length=50)),
+                ('session_count', models.IntegerField(default=0, help_text='Open or scheduled sessions mentioning the phrase')),
+                ('recent_count', models.IntegerField(default=0, help_text='Sessions created in the last 7 days')),
+                ('previous_count', models.IntegerField(default=0, help_text='Sessions created 7 to 14 days ago')),
+                ('growth', models.FloatField(default=0.0, help_text='Change from the previous 7 days to the last 7, as a fraction')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['phrase'], name='recommendat_phrase_788d97_idx'), models.Index(fields=['-growth'], name='recommendat_growth_0ad979_idx')],
+                'unique_together': {('phrase', 'domain')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SessionSkillPhrase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phrase', models.CharField(max_length=100)),
+                ('listed', models.BooleanField(default=False, help_text="Listed in the session's skills rather than found in its text")),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_phrases', to='learning_sessions.session')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['phrase'], name='recommendat_phrase_ade373_idx')],
+                'unique_together': {('session', 'phrase')},
+            },
+        ),
+        migrations.RunPython(backfill_listed_phrases, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,10 @@
+from datetime import timedelta
+from django.conf import settings
 from django.db import models
-from sessions.models import Session
+from django.db.models import Avg, Count, F, Q
+from django.utils import timezone
+from sessions.models import Session, Feedback
+from users.models import User, Follow
 
 class PopularityMetric(models.Model):
     """Track session popularity for recommendations"""
@@ -8,6 +13,7 @@ class PopularityMetric(models.Model):
     booking_count = models.IntegerField(default=0)
     completion_rate = models.FloatField(default=0.0)  # Percentage of bookings that were completed
     rating_average = models.FloatField(default=0.0)
+    score = models.FloatField(default=0.0, db_index=True, help_text="Stored calculate_score() for ordering in SQL")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -22,5 +28,234 @@ class PopularityMetric(models.Model):
         )
         return score
     
+    @staticmethod
+    def score_expression(view_delta=0, booking_delta=0):
+        """calculate_score() as an SQL expression for UPDATEs that also add the given counter deltas"""
+        return (
+            (F('view_count') + view_delta) * 0.1 +
+            (F('booking_count') + booking_delta) * 0.3 +
+            F('completion_rate') * 0.4 +
+            F('rating_average') * 0.2
+        )
+    
+    def save(self, *args, **kwargs):
+        self.score = self.calculate_score()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'score' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'score']
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"Popularity for {self.session.title}"
+
+
+class UserRecommendation(models.Model):
+    """Precomputed session and mentor recommendations for a user"""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='precomputed_recommendations')
+    session_ids = models.JSONField(null=True, blank=True)  # Ranked session IDs, null until computed
+    mentors = models.JSONField(null=True, blank=True)  # Ranked [{'id', 'score', 'reasons'}], null until computed
+    profile_hash = models.CharField(max_length=40, blank=True, help_text="Skills/interests the lists were computed from")
+    computed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['computed_at']),
+        ]
+    
+    def __str__(self):
+        return f"Recommendations for {self.user.username}"
+
+
+class MentorStats(models.Model):
+    """Materialized per-mentor rollup read by recommendations, matching and admin lists"""
+    mentor = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='mentor_stats')
+    avg_rating = models.FloatField(default=0.0)
+    rating_count = models.IntegerField(default=0)
+    total_sessions = models.IntegerField(default=0)
+    completed_sessions = models.IntegerField(default=0)
+    recent_sessions = models.IntegerField(default=0, help_text="Sessions scheduled in the last 30 days or later")
+    follower_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = 'Mentor stats'
+        indexes = [
+            models.Index(fields=['-avg_rating']),
+            models.Index(fields=['-total_sessions']),
+            models.Index(fields=['-completed_sessions']),
+        ]
+    
+    def __str__(self):
+        return f"Stats for {self.mentor.username}"
+    
+    @classmethod
+    def refresh(cls, mentor_ids=None):
+        """Recompute the rollup for the given mentors (or every mentor) with grouped queries"""
+        mentors = User.objects.filter(role='mentor')
+        if mentor_ids is not None:
+            mentors = mentors.filter(id__in=list(mentor_ids))
+        mentor_ids = list(mentors.values_list('id', flat=True))
+        if not mentor_ids:
+            return 0
+        
+        ratings = {
+            row['session__mentor_id']: row
+            for row in Feedback.objects.filter(session__mentor_id__in=mentor_ids).values(
+                'session__mentor_id'
+            ).annotate(avg_rating=Avg('rating'), rating_count=Count('id'))
+        }
+        
+        recent_date = timezone.now() - timedelta(days=30)
+        sessions = {
+            row['mentor_id']: row
+            for row in Session.objects.filter(mentor_id__in=mentor_ids).values('mentor_id').annotate(
+                total_sessions=Count('id'),
+                completed_sessions=Count('id', filter=Q(status='completed')),
+                recent_sessions=Count('id', filter=Q(schedule__gte=recent_date))
+            )
+        }
+        
+        followers = dict(
+            Follow.objects.filter(following_id__in=mentor_ids).values('following_id').annotate(
+                follower_count=Count('id')
+            ).values_list('following_id', 'follower_count')
+        )
+        
+        rows = []
+        for mentor_id in mentor_ids:
+            rating = ratings.get(mentor_id, {})
+            session = sessions.get(mentor_id, {})
+            rows.append(cls(
+                mentor_id=mentor_id,
+                avg_rating=rating.get('avg_rating') or 0.0,
+                rating_count=rating.get('rating_count', 0),
+                total_sessions=session.get('total_sessions', 0),
+                completed_sessions=session.get('completed_sessions', 0),
+                recent_sessions=session.get('recent_sessions', 0),
+                follower_count=followers.get(mentor_id, 0),
+                updated_at=timezone.now(),
+            ))
+        
+        cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['mentor'],
+            update_fields=[
+                'avg_rating', 'rating_count', 'total_sessions', 'completed_sessions',
+                'recent_sessions', 'follower_count', 'updated_at',
+            ],
+        )
+        return len(rows)
+
+
+class SessionBookingBucket(models.Model):
+    """Hourly count of non-cancelled bookings per session, summed over a sliding window for trending"""
+    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='booking_buckets')
+    hour = models.DateTimeField(help_text="Start of the hour the bookings were made in")
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['session', 'hour']
+        indexes = [
+            models.Index(fields=['hour']),
+        ]
+    
+    def __str__(self):
+        return f"{self.count} bookings for {self.session.title} at {self.hour:%Y-%m-%d %H:00}"
+
+
+class SkillRelation(models.Model):
+    """Weighted, directed edge in the skill taxonomy ("python" -> "django")"""
+    skill = models.CharField(max_length=100, db_index=True)
+    related_skill = models.CharField(max_length=100)
+    weight = models.FloatField(default=1.0, help_text="Strength of the relation, 0 to 1")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['skill', 'related_skill']
+        ordering = ['skill', '-weight']
+    
+    def save(self, *args, **kwargs):
+        self.skill = self.skill.strip().lower()
+        self.related_skill = self.related_skill.strip().lower()
+        super().save(*args, **kwargs)
+    
+    def __str__(self):
+        return f"{self.skill} -> {self.related_skill} ({self.weight:g})"
+
+
+class MentorSkillTag(models.Model):
+    """One normalized skill per row for each mentor, so mentors can be selected by skill through an index"""
+    mentor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='skill_tags')
+    skill = models.CharField(max_length=100)
+    
+    class Meta:
+        unique_together = ['mentor', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'mentor']),
+        ]
+    
+    def __str__(self):
+        return f"{self.mentor.username}: {self.skill}"
+    
+    @staticmethod
+    def normalize(skills_text):
+        """Comma-separated skills as the lowercase set the matching engine compares"""
+        return {skill.strip().lower()[:100] for skill in (skills_text or '').split(',') if skill.strip()}
+    
+    @classmethod
+    def sync(cls, user):
+        """Make the user's tags match their skills (none unless they are a mentor)"""
+        wanted = cls.normalize(user.skills) if user.role == 'mentor' else set()
+        current = set(cls.objects.filter(mentor=user).values_list('skill', flat=True))
+        
+        if current - wanted:
+            cls.objects.filter(mentor=user, skill__in=current - wanted).delete()
+        if wanted - current:
+            cls.objects.bulk_create(
+                [cls(mentor=user, skill=skill) for skill in wanted - current],
+                ignore_conflicts=True
+            )
+
+
+class SessionSkillPhrase(models.Model):
+    """A skill phrase found in a session's skills, title or description, extracted once when the session is saved"""
+    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='skill_phrases')
+    phrase = models.CharField(max_length=100)
+    listed = models.BooleanField(default=False, help_text="Listed in the session's skills rather than found in its text")
+    
+    class Meta:
+        unique_together = ['session', 'phrase']
+        indexes = [
+            models.Index(fields=['phrase']),
+        ]
+    
+    def __str__(self):
+        return f"{self.session.title}: {self.phrase}"
+
+
+class SkillPhraseStat(models.Model):
+    """Session counts and 7-day growth per skill phrase and session category, recomputed by refresh_skill_stats"""
+    phrase = models.CharField(max_length=100)
+    domain = models.CharField(max_length=50, blank=True, help_text="Session category")
+    session_count = models.IntegerField(default=0, help_text="Open or scheduled sessions mentioning the phrase")
+    recent_count = models.IntegerField(default=0, help_text="Sessions created in the last 7 days")
+    previous_count = models.IntegerField(default=0, help_text="Sessions created 7 to 14 days ago")
+    growth = models.FloatField(default=0.0, help_text="Change from the previous 7 days to the last 7, as a fraction")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['phrase', 'domain']
+        indexes = [
+            models.Index(fields=['phrase']),
+            models.Index(fields=['-growth']),
+        ]
+    
+    def __str__(self):
+        return f"{self.phrase} ({self.domain or 'all'}): {self.session_count}"
+    
+    @staticmethod
+    def calculate_growth(recent_count, previous_count):
+        """Week-over-week change; a phrase new this week counts as growing by its recent count"""
+        return (recent_count - previous_count) / max(previous_count, 1)
@@ -0,0 +1,147 @@
+"""
+Buffered Popularity Counters
+Session views and bookings are counted in process memory and flushed as grouped
+F() updates, so a page view costs no database round-trip and concurrent requests
+never overwrite each other's increments. Each worker process flushes its own buffer
+from a background thread every FLUSH_INTERVAL and again when it exits.
+completion_rate and rating_average are recomputed for every session by a scheduled job.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from django.db import connection
+from django.db.models import Avg, Count, F, OuterRef, Q, Subquery
+from sessions.models import Session, Feedback
+from .models import PopularityMetric
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 30   # Seconds between background flushes
+FLUSH_SIZE = 500      # Flush early once this many sessions have pending counts
+
+_lock = threading.Lock()
+_pending = defaultdict(lambda: [0, 0])  # session id -> [views, bookings]
+_flusher_pid = None  # Process the flush thread was started in; forked workers start their own
+
+
+def record_view(session_id):
+    _record(session_id, 0)
+
+
+def record_booking(session_id):
+    _record(session_id, 1)
+
+
+def _record(session_id, counter):
+    _ensure_flusher()
+    with _lock:
+        _pending[session_id][counter] += 1
+        due = len(_pending) >= FLUSH_SIZE
+    if due:
+        flush()
+
+
+def _ensure_flusher():
+    """Start this process's background flush thread on first use"""
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+    threading.Thread(target=_flush_periodically, name='popularity-flush', daemon=True).start()
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        if not _pending:
+            continue
+        try:
+            flush()
+        except Exception:
+            logger.exception("Failed to flush buffered popularity counts")
+        finally:
+            connection.close()  # This thread's own connection; reopened on the next flush
+
+
+def flush():
+    """
+    Write buffered counts to PopularityMetric
+
+    Sessions with identical deltas share one UPDATE, so a flush costs a handful
+    of statements however many sessions were touched. Returns sessions flushed.
+    """
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+    if not pending:
+        return 0
+
+    # Sessions seen for the first time need a row to increment
+    existing = set(PopularityMetric.objects.filter(session_id__in=list(pending)).values_list('session_id', flat=True))
+    missing = set(Session.objects.filter(id__in=[sid for sid in pending if sid not in existing]).values_list('id', flat=True))
+    if missing:
+        PopularityMetric.objects.bulk_create(
+            [PopularityMetric(session_id=session_id) for session_id in missing],
+            ignore_conflicts=True
+        )
+
+    by_delta = defaultdict(list)
+    for session_id, (views, bookings) in pending.items():
+        if session_id in existing or session_id in missing:
+            by_delta[(views, bookings)].append(session_id)
+
+    for (views, bookings), session_ids in by_delta.items():
+        PopularityMetric.objects.filter(session_id__in=session_ids).update(
+            view_count=F('view_count') + views,
+            booking_count=F('booking_count') + bookings,
+            score=PopularityMetric.score_expression(views, bookings),
+        )
+    return sum(len(session_ids) for session_ids in by_delta.values())
+
+
+def _flush_at_exit():
+    if _pending:
+        try:
+            flush()
+        except Exception:
+            logger.exception("Failed to flush buffered popularity counts at exit")
+
+
+atexit.register(_flush_at_exit)
+
+
+def recompute_quality(batch_size=500):
+    """
+    Derive completion_rate and rating_average for every tracked session
+
+    One aggregate query reads booking completion and average rating for all
+    sessions; rows are written back in bulk, then one UPDATE refreshes the
+    stored score from the current counters. Returns metrics updated.
+    """
+    average_rating = Feedback.objects.filter(session=OuterRef('session_id')).values('session').annotate(
+        avg=Avg('rating')
+    ).values('avg')
+
+    metrics = list(PopularityMetric.objects.annotate(
+        counted_bookings=Count('session__bookings', filter=~Q(session__bookings__status='cancelled')),
+        attended_bookings=Count('session__bookings', filter=Q(session__bookings__status='attended')),
+        average_rating=Subquery(average_rating)
+    ))
+
+    for metric in metrics:
+        metric.completion_rate = (
+            metric.attended_bookings / metric.counted_bookings * 100 if metric.counted_bookings else 0.0
+        )
+        metric.rating_average = metric.average_rating or 0.0
+
+    PopularityMetric.objects.bulk_update(metrics, ['completion_rate', 'rating_average'], batch_size=batch_size)
+    # Score from the counters as stored now, so views flushed meanwhile are not overwritten
+    PopularityMetric.objects.update(score=PopularityMetric.score_expression())
+    return len(metrics)
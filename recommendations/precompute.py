@@ -0,0 +1,119 @@
+"""
+Precomputed Recommendation Storage
+Read-through store for per-user recommendation lists written by the
+precompute_recommendations batch job, with live computation as the fallback
+"""
+
+import hashlib
+import uuid
+from datetime import timedelta
+from django.utils import timezone
+from sessions.models import Session, Booking
+from users.models import User
+from .models import UserRecommendation
+
+MAX_AGE = timedelta(hours=24)  # Lists older than this are recomputed on read
+
+
+def profile_hash(user):
+    """Fingerprint of the profile fields recommendations depend on"""
+    profile = f"{user.role}|{user.skills or ''}|{user.interests or ''}"
+    return hashlib.sha1(profile.encode('utf-8')).hexdigest()
+
+
+def load_row(user):
+    """Return the user's precomputed row if it is fresh and matches their current profile"""
+    row = UserRecommendation.objects.filter(user=user).first()
+    if row is None:
+        return None
+    if row.profile_hash != profile_hash(user) or row.computed_at < timezone.now() - MAX_AGE:
+        return None
+    return row
+
+
+def store(user, session_ids=None, mentors=None):
+    """
+    Replace the given precomputed lists
+
+    A list that is not passed is kept while the row is still fresh for the user's
+    current profile, and cleared otherwise so it is recomputed on its next read.
+    """
+    defaults = {'profile_hash': profile_hash(user)}
+    if session_ids is not None:
+        defaults['session_ids'] = [str(session_id) for session_id in session_ids]
+    if mentors is not None:
+        defaults['mentors'] = mentors
+    if (session_ids is None or mentors is None) and load_row(user) is None:
+        defaults.setdefault('session_ids', None)
+        defaults.setdefault('mentors', None)
+    UserRecommendation.objects.update_or_create(user=user, defaults=defaults)
+
+
+def store_mentors(row, mentors):
+    """Fill in the mentor list on an otherwise fresh row"""
+    UserRecommendation.objects.filter(pk=row.pk).update(mentors=mentors)
+
+
+def serialize_mentors(recommended_mentors):
+    """Reduce mentor recommendation dicts to JSON-safe data"""
+    return [
+        {
+            'id': str(item['mentor'].id),
+            'score': item['score'],
+            'reasons': item['reasons'],
+        }
+        for item in recommended_mentors
+    ]
+
+
+def resolve_sessions(user, session_ids, limit):
+    """Turn stored session IDs back into sessions that are still bookable for the user"""
+    sessions = Session.objects.filter(
+        id__in=session_ids,
+        status='scheduled',
+        schedule__gte=timezone.now()
+    ).exclude(
+        id__in=Booking.objects.filter(learner=user, status='confirmed').values('session_id')
+    ).select_related('mentor').in_bulk()
+
+    resolved = []
+    for session_id in session_ids:
+        session = sessions.get(_as_uuid(session_id))
+        if session:
+            resolved.append(session)
+        if len(resolved) >= limit:
+            break
+    return resolved
+
+
+def resolve_mentors(mentors, limit):
+    """Turn stored mentor entries back into recommendation dicts"""
+    users = User.objects.filter(
+        id__in=[item['id'] for item in mentors],
+        is_active=True
+    ).in_bulk()
+
+    resolved = []
+    for item in mentors:
+        mentor = users.get(_as_uuid(item['id']))
+        if mentor:
+            resolved.append({
+                'mentor': mentor,
+                'score': item['score'],
+                'reasons': item['reasons'],
+            })
+        if len(resolved) >= limit:
+            break
+    return resolved
+
+
+def invalidate_user(user_id):
+    """Drop a user's precomputed lists so the next request recomputes them"""
+    UserRecommendation.objects.filter(user_id=user_id).delete()
+
+
+def _as_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return value
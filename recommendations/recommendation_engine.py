@@ -4,15 +4,28 @@ Real Machine Learning-based recommendations using learner profile, mentor expert
 """
 
 from django.db.models import Q, Count, Avg, Case, When, FloatField
+from django.conf import settings
 from django.utils import timezone
 from sessions.models import Session, Booking, Feedback
 from users.models import User
 from .models import PopularityMetric
+from .skill_index import get_skill_index, parse_skills
+from .collaborative import similar_learner_sessions
+from .topk import TopK, top_k
+from .semantic_index import get_semantic_index
+from . import trending
+from .skill_graph import get_skill_graph
+from . import precompute
 import json
 from datetime import datetime, timedelta
-from collections import Counter
+from collections import Counter, defaultdict
 import re
 
+# Stored lists carry headroom so read-time filtering (new bookings, full sessions) still fills a page
+PRECOMPUTE_SESSIONS = 16
+PRECOMPUTE_MENTORS = 12
+SEMANTIC_CANDIDATES = 50
+
 class RecommendationEngine:
     """Advanced ML-based recommendation system"""
     
@@ -23,37 +36,45 @@ class RecommendationEngine:
         
     def parse_skills(self, skills_data):
         """Parse skills from various formats"""
-        if isinstance(skills_data, str):
-            try:
-                skills_data = json.loads(skills_data)
-            except:
-                skills_data = [s.strip() for s in skills_data.split(',') if s.strip()]
-        
-        if isinstance(skills_data, list):
-            return [skill.lower().strip() for skill in skills_data if skill]
-        
-        return []
+        return parse_skills(skills_data)
+    
+    def get_candidate_pool(self):
+        """Fetch every session the user could book, once, annotated with what the scorers need"""
+        sessions = Session.objects.filter(
+            status='scheduled',
+            schedule__gte=timezone.now()
+        ).exclude(
+            id__in=Booking.objects.filter(learner=self.user, status='confirmed').values('session_id')
+        ).select_related('mentor', 'popularity')
+        return {session.id: session for session in sessions}
     
-    def get_personalized_recommendations(self):
+    def get_personalized_recommendations(self, limit=8):
         """Get personalized session recommendations based on user profile"""
         recommendations = []
         
+        # Eligible sessions are fetched once and shared by every scorer
+        pool = self.get_candidate_pool()
+        
         # 1. Content-based filtering (skills and interests)
-        content_based = self.content_based_filtering()
+        content_based = self.content_based_filtering(pool)
         recommendations.extend(content_based)
         
         # 2. Collaborative filtering (similar users)
-        collaborative = self.collaborative_filtering()
+        collaborative = self.collaborative_filtering(pool)
         recommendations.extend(collaborative)
         
         # 3. Popularity-based recommendations
-        popularity_based = self.popularity_based_filtering()
+        popularity_based = self.popularity_based_filtering(pool)
         recommendations.extend(popularity_based)
         
         # 4. Trending sessions
-        trending = self.get_trending_sessions()
+        trending = self.get_trending_sessions(pool)
         recommendations.extend(trending)
         
+        # 5. Semantic retrieval (optional, catches related wording the phrase index misses)
+        if getattr(settings, 'RECOMMENDATION_SEMANTIC_RETRIEVAL', False):
+            recommendations.extend(self.semantic_filtering(pool))
+        
         # Remove duplicates and score
         unique_sessions = {}
         for session, score, reason in recommendations:
@@ -67,16 +88,12 @@ class RecommendationEngine:
                 unique_sessions[session.id]['score'] += score * 0.5
                 unique_sessions[session.id]['reasons'].append(reason)
         
-        # Sort by score and return top recommendations
-        sorted_recommendations = sorted(
-            unique_sessions.values(),
-            key=lambda x: x['score'],
-            reverse=True
-        )
+        # Keep only the top recommendations in a bounded heap instead of sorting every candidate
+        top_recommendations = top_k(unique_sessions.values(), limit, key=lambda x: x['score'])
         
-        return [item['session'] for item in sorted_recommendations[:8]]
+        return [item['session'] for item in top_recommendations]
     
-    def content_based_filtering(self):
+    def content_based_filtering(self, pool=None):
         """Recommend sessions based on user skills and interests"""
         recommendations = []
         all_skills = self.user_skills + self.user_interests
@@ -84,94 +101,88 @@ class RecommendationEngine:
         if not all_skills:
             return recommendations
         
-        # Get available sessions
-        available_sessions = Session.objects.filter(
-            status='scheduled',
-            schedule__gte=timezone.now()
-        ).exclude(
-            bookings__learner=self.user,
-            bookings__status='confirmed'
-        ).select_related('mentor')
+        # Candidates come straight from the inverted index; only matching sessions get scored
+        index = get_skill_index()
+        scores = defaultdict(float)
+        reasons = defaultdict(list)
         
-        for session in available_sessions:
-            score = 0
-            reasons = []
-            
-            # Check title and description for skill matches
-            session_text = f"{session.title} {session.description}".lower()
-            
-            for skill in all_skills:
-                if skill in session_text:
-                    score += 2.0
-                    reasons.append(f"Matches your interest in {skill}")
-            
-            # Mentor skills match
-            mentor_skills = self.parse_skills(session.mentor.skills or [])
-            for user_skill in all_skills:
-                for mentor_skill in mentor_skills:
-                    if user_skill in mentor_skill or mentor_skill in user_skill:
-                        score += 1.5
-                        reasons.append(f"Mentor expert in {mentor_skill}")
-            
-            if score > 0:
-                reason = "; ".join(reasons[:2])
-                recommendations.append((session, score, reason))
+        # Check title and description for skill matches
+        for skill in all_skills:
+            for session_id in index.sessions_for_skill(skill):
+                scores[session_id] += 2.0
+                reasons[session_id].append(f"Matches your interest in {skill}")
+        
+        # Mentor skills match
+        for user_skill in all_skills:
+            for mentor_skill in index.mentor_skills_matching(user_skill):
+                for session_id in index.sessions_for_mentor_skill(mentor_skill):
+                    scores[session_id] += 1.5
+                    reasons[session_id].append(f"Mentor expert in {mentor_skill}")
+        
+        # Related skills from the skill graph ("python" also surfaces Django sessions)
+        graph = get_skill_graph()
+        for skill in all_skills:
+            for related_skill, weight in graph.related(skill).items():
+                if related_skill in all_skills:
+                    continue
+                for session_id in index.sessions_for_skill(related_skill):
+                    scores[session_id] += 1.0 * weight
+                    reasons[session_id].append(f"Related to your interest in {skill}")
+        
+        for session in self._available_sessions(scores, pool):
+            reason = "; ".join(reasons[session.id][:2])
+            recommendations.append((session, scores[session.id], reason))
         
         return recommendations
     
-    def collaborative_filtering(self):
+    def collaborative_filtering(self, pool=None):
         """Find sessions liked by similar users"""
         recommendations = []
         
-                # Find users with similar skills/interests
-        similar_users = User.objects.filter(
-            role='learner',
-            interests__isnull=False
-        ).exclude(id=self.user.id)
-
-        user_similarities = []
-        for other_user in similar_users:
-            other_skills = self.parse_skills(other_user.interests or [])
-            similarity = self.calculate_skill_similarity(self.user_skills, other_skills)
-            
-            if similarity > 0.3:  # 30% similarity threshold
-                user_similarities.append((other_user, similarity))
-        
-        # Get sessions attended by similar users
-        for similar_user, similarity in user_similarities[:5]:
-            similar_user_sessions = Session.objects.filter(
-                bookings__learner=similar_user,
-                bookings__status='confirmed',
-                status='scheduled',
-                schedule__gte=timezone.now()
-            ).exclude(
-                bookings__learner=self.user,
-                bookings__status='confirmed'
-            )
-            
-            for session in similar_user_sessions:
-                score = similarity * 1.5
-                reason = f"Learners with similar interests also booked this"
-                recommendations.append((session, score, reason))
+        if not self.user_skills:
+            return recommendations
+        
+        # Similarities for every learner come from one sparse matrix product,
+        # and the top neighbours' bookings are fetched in a single query
+        session_scores = similar_learner_sessions(self.user, self.user_skills)
+        if not session_scores:
+            return recommendations
+        
+        for session in self._available_sessions(session_scores, pool):
+            score = session_scores[session.id] * 1.5
+            reason = "Learners with similar interests also booked this"
+            recommendations.append((session, score, reason))
+        
+        return recommendations
+    
+    def semantic_filtering(self, pool=None):
+        """Recommend sessions whose text is close to the user's skills and interests in vector space"""
+        recommendations = []
+        profile_text = ' '.join(self.user_skills + self.user_interests)
+        
+        if not profile_text:
+            return recommendations
+        
+        similar = dict(get_semantic_index().similar_sessions(profile_text, top_k=SEMANTIC_CANDIDATES))
+        
+        for session in self._available_sessions(similar, pool):
+            score = similar[session.id] * 2.0
+            reason = "Related to your skills and interests"
+            recommendations.append((session, score, reason))
         
         return recommendations
     
-    def popularity_based_filtering(self):
+    def popularity_based_filtering(self, pool=None):
         """Recommend popular sessions"""
         recommendations = []
+        pool = self.get_candidate_pool() if pool is None else pool
         
         # Get sessions with high popularity metrics
-        popular_sessions = Session.objects.filter(
-            status='scheduled',
-            schedule__gte=timezone.now(),
-            popularity__isnull=False
-        ).exclude(
-            bookings__learner=self.user,
-            bookings__status='confirmed'
-        ).select_related('popularity', 'mentor').order_by(
-            '-popularity__rating_average',
-            '-popularity__booking_count'
-        )[:5]
+        popular_sessions = top_k(
+            (session for session in pool.values() if getattr(session, 'popularity', None)),
+            5,
+            key=lambda session: session.popularity.score
+        )
         
         for session in popular_sessions:
             popularity = session.popularity
@@ -181,22 +192,20 @@ class RecommendationEngine:
         
         return recommendations
     
-    def get_trending_sessions(self):
+    def get_trending_sessions(self, pool=None):
         """Get currently trending sessions"""
         recommendations = []
+        pool = self.get_candidate_pool() if pool is None else pool
         
-        # Sessions with recent bookings
-        recent_date = timezone.now() - timedelta(days=7)
-        trending_sessions = Session.objects.filter(
-            status='scheduled',
-            schedule__gte=timezone.now(),
-            bookings__created_at__gte=recent_date
-        ).exclude(
-            bookings__learner=self.user,
-            bookings__status='confirmed'
-        ).annotate(
-            recent_bookings=Count('bookings', filter=Q(bookings__created_at__gte=recent_date))
-        ).filter(recent_bookings__gte=2).order_by('-recent_bookings')[:3]
+        # Sessions with at least two bookings in the last 7 days, read off the cached leaderboard
+        trending_sessions = []
+        for session_id, recent_bookings in trending.get_leaderboard():
+            if recent_bookings < 2 or len(trending_sessions) >= 3:
+                break
+            session = pool.get(session_id)
+            if session is not None:
+                session.recent_bookings = recent_bookings
+                trending_sessions.append(session)
         
         for session in trending_sessions:
             score = 1.8
@@ -205,6 +214,19 @@ class RecommendationEngine:
         
         return recommendations
     
+    def _available_sessions(self, session_ids, pool=None):
+        """Bookable sessions among the given IDs, from the shared pool when there is one"""
+        if pool is not None:
+            return [pool[session_id] for session_id in session_ids if session_id in pool]
+        
+        return Session.objects.filter(
+            id__in=list(session_ids),
+            status='scheduled',
+            schedule__gte=timezone.now()
+        ).exclude(
+            id__in=Booking.objects.filter(learner=self.user, status='confirmed').values('session_id')
+        ).select_related('mentor')
+    
     def calculate_skill_similarity(self, skills1, skills2):
         """Calculate similarity between two skill sets"""
         if not skills1 or not skills2:
@@ -219,25 +241,21 @@ class RecommendationEngine:
         
         return intersection / union if union > 0 else 0.0
     
-    def get_mentor_recommendations(self):
+    def get_mentor_recommendations(self, limit=6):
         """Get recommended mentors based on user interests"""
-        recommended_mentors = []
+        recommended_mentors = TopK(limit)
         
+        # Per-mentor aggregates come from the MentorStats rollup, not a multi-join annotate
         mentors = User.objects.filter(
             role='mentor',
-            is_active=True
-        ).annotate(
-            avg_rating=Avg('mentored_sessions__feedback__rating'),
-            session_count=Count('mentored_sessions'),
-            recent_sessions=Count(
-                'mentored_sessions',
-                filter=Q(mentored_sessions__schedule__gte=timezone.now() - timedelta(days=30))
-            )
-        ).filter(session_count__gte=1)
+            is_active=True,
+            mentor_stats__total_sessions__gte=1
+        ).select_related('mentor_stats')
         
         for mentor in mentors:
             score = 0
             reasons = []
+            stats = mentor.mentor_stats
             
             # Check skill match
             mentor_skills = self.parse_skills(mentor.skills or [])
@@ -248,30 +266,58 @@ class RecommendationEngine:
                         reasons.append(f"Expert in {mentor_skill}")
             
             # Rating factor
-            if mentor.avg_rating:
-                score += mentor.avg_rating * 0.5
-                reasons.append(f"{mentor.avg_rating:.1f}⭐ rating")
+            if stats.rating_count:
+                score += stats.avg_rating * 0.5
+                reasons.append(f"{stats.avg_rating:.1f}⭐ rating")
             
             # Activity factor
-            if mentor.recent_sessions > 0:
-                score += min(mentor.recent_sessions / 5, 1) * 0.8
-                reasons.append(f"{mentor.recent_sessions} recent sessions")
+            if stats.recent_sessions > 0:
+                score += min(stats.recent_sessions / 5, 1) * 0.8
+                reasons.append(f"{stats.recent_sessions} recent sessions")
             
             if score > 1.0:
-                recommended_mentors.append({
+                recommended_mentors.push(score, {
                     'mentor': mentor,
                     'score': score,
                     'reasons': reasons[:2]
                 })
         
-        return sorted(recommended_mentors, key=lambda x: x['score'], reverse=True)[:6]
+        return recommended_mentors.items()
 
-def get_recommendations_for_user(user):
+def get_recommendations_for_user(user, limit=8):
     """Main function to get recommendations for a user"""
+    row = precompute.load_row(user)
+    if row is not None and row.session_ids is not None:
+        return precompute.resolve_sessions(user, row.session_ids, limit)
+    
+    # New or changed profile: compute live and keep the result for the next request
     engine = RecommendationEngine(user)
-    return engine.get_personalized_recommendations()
+    sessions = engine.get_personalized_recommendations(limit=PRECOMPUTE_SESSIONS)
+    precompute.store(user, session_ids=[session.id for session in sessions])
+    return sessions[:limit]
 
-def get_mentor_recommendations_for_user(user):
+def get_mentor_recommendations_for_user(user, limit=6):
     """Get mentor recommendations for a user"""
+    row = precompute.load_row(user)
+    if row is not None and row.mentors is not None:
+        return precompute.resolve_mentors(row.mentors, limit)
+    
+    engine = RecommendationEngine(user)
+    mentors = engine.get_mentor_recommendations(limit=PRECOMPUTE_MENTORS)
+    if row is not None:
+        precompute.store_mentors(row, precompute.serialize_mentors(mentors))
+    else:
+        precompute.store(user, mentors=precompute.serialize_mentors(mentors))
+    return mentors[:limit]
+
+def precompute_recommendations_for_user(user):
+    """Compute and store both recommendation lists for a user (used by the batch job)"""
     engine = RecommendationEngine(user)
-    return engine.get_mentor_recommendations()
\ No newline at end of file
+    session_ids = [session.id for session in engine.get_personalized_recommendations(limit=PRECOMPUTE_SESSIONS)]
+    try:
+        mentors = precompute.serialize_mentors(engine.get_mentor_recommendations(limit=PRECOMPUTE_MENTORS))
+    except Exception:
+        # Keep the session list; mentors fall back to live computation on the next request
+        precompute.store(user, session_ids=session_ids)
+        raise
+    precompute.store(user, session_ids=session_ids, mentors=mentors)
@@ -0,0 +1,177 @@
+"""
+Semantic Session Retrieval for PeerLearn Recommendations
+Hashed word and character n-gram TF-IDF vectors for upcoming sessions, kept in a
+float32 array and searched with a single matrix-vector product on CPU.
+Character n-grams let "reactjs" or "programmer" reach sessions worded differently,
+which the exact phrase index misses.
+"""
+
+import threading
+import time
+import zlib
+import numpy as np
+from django.utils import timezone
+from .index_version import current_version, publish_change
+from .skill_index import tokenize
+
+SEMANTIC_VERSION_KEY = 'recommendations_semantic_index_version'
+REBUILD_INTERVAL = 3600
+DIMENSIONS = 512          # Hashed feature space; 10k sessions take about 20 MB per matrix copy
+NGRAM_SIZES = (3, 4)
+INITIAL_CAPACITY = 256
+
+
+def features(text):
+    """Word tokens plus character n-grams of each padded token"""
+    grams = []
+    for token in tokenize(text):
+        grams.append(token)
+        padded = f'#{token}#'
+        for size in NGRAM_SIZES:
+            grams.extend(padded[i:i + size] for i in range(len(padded) - size + 1))
+    return grams
+
+
+def hashed_counts(text):
+    """Signed hashed feature counts as a float32 vector (sublinear term frequency)"""
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    for gram in features(text):
+        digest = zlib.crc32(gram.encode('utf-8'))
+        # Low bits pick the bucket, a high bit picks the sign so collisions cancel out on average
+        vector[digest % DIMENSIONS] += 1.0 if digest & 0x80000000 else -1.0
+    return np.sign(vector) * np.log1p(np.abs(vector))
+
+
+class SemanticIndex:
+    """Dense TF-IDF matrix over scheduled sessions, one row per session"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.built_at = 0
+        self._reset(INITIAL_CAPACITY)
+
+    def _reset(self, capacity):
+        self.vectors = np.zeros((capacity, DIMENSIONS), dtype=np.float32)  # raw hashed term frequencies
+        self.document_frequency = np.zeros(DIMENSIONS, dtype=np.float32)
+        self.session_rows = {}          # session id -> row
+        self.row_sessions = [None] * capacity
+        self.free_rows = list(range(capacity - 1, -1, -1))
+        self.weighted = None            # cached idf-weighted, L2-normalised rows; None when stale
+        self.idf = None
+
+    def build(self, version):
+        """Rebuild the whole index from upcoming scheduled sessions"""
+        from sessions.models import Session
+
+        sessions = list(Session.objects.filter(
+            status='scheduled',
+            schedule__gte=timezone.now()
+        ).values_list('id', 'title', 'description', 'skills'))
+
+        with self.lock:
+            self._reset(max(INITIAL_CAPACITY, len(sessions)))
+            for session_id, title, description, skills in sessions:
+                self._add(session_id, f'{title} {description} {skills}')
+            self.version = version
+            self.built_at = time.monotonic()
+
+    def _add(self, session_id, text):
+        if not self.free_rows:
+            self._grow()
+        row = self.free_rows.pop()
+        vector = hashed_counts(text)
+        self.vectors[row] = vector
+        self.document_frequency += vector != 0
+        self.session_rows[session_id] = row
+        self.row_sessions[row] = session_id
+        self.weighted = None
+
+    def _remove(self, session_id):
+        row = self.session_rows.pop(session_id, None)
+        if row is None:
+            return
+        self.document_frequency -= self.vectors[row] != 0
+        self.vectors[row] = 0.0
+        self.row_sessions[row] = None
+        self.free_rows.append(row)
+        self.weighted = None
+
+    def _grow(self):
+        capacity = len(self.row_sessions)
+        self.vectors = np.vstack([self.vectors, np.zeros((capacity, DIMENSIONS), dtype=np.float32)])
+        self.row_sessions.extend([None] * capacity)
+        self.free_rows.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def _weighted_matrix(self):
+        """IDF-weighted unit rows, recomputed lazily after the corpus changed"""
+        if self.weighted is None:
+            documents = max(len(self.session_rows), 1)
+            self.idf = (np.log((1 + documents) / (1 + self.document_frequency)) + 1).astype(np.float32)
+            weighted = self.vectors * self.idf
+            norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+            self.weighted = np.divide(weighted, norms, out=np.zeros_like(weighted), where=norms > 0)
+        return self.weighted
+
+    def update_session(self, session):
+        """Re-index a single session after it was saved"""
+        with self.lock:
+            self._remove(session.pk)
+            if session.status == 'scheduled' and session.schedule and session.schedule >= timezone.now():
+                self._add(session.pk, f'{session.title} {session.description} {session.skills}')
+
+    def remove_session(self, session_id):
+        with self.lock:
+            self._remove(session_id)
+
+    def similar_sessions(self, text, top_k=50, min_score=0.15):
+        """
+        Nearest sessions to free text by cosine similarity
+
+        Returns:
+            List of (session_id, similarity) pairs, best first
+        """
+        query = hashed_counts(text)
+        if not query.any():
+            return []
+
+        with self.lock:
+            if not self.session_rows:
+                return []
+            matrix = self._weighted_matrix()
+            query = query * self.idf
+            query /= np.linalg.norm(query)
+
+            scores = matrix @ query
+            candidates = np.flatnonzero(scores >= min_score)
+            if len(candidates) > top_k:
+                candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+            candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+            return [
+                (self.row_sessions[row], float(scores[row]))
+                for row in candidates
+                if self.row_sessions[row] is not None
+            ]
+
+
+_semantic_index = SemanticIndex()
+
+
+def get_semantic_index():
+    """Return the process-wide index, rebuilding it if another process changed it or it aged out"""
+    version = current_version(SEMANTIC_VERSION_KEY)
+    if (_semantic_index.version != version or
+            time.monotonic() - _semantic_index.built_at > REBUILD_INTERVAL):
+        _semantic_index.build(version)
+    return _semantic_index
+
+
+def index_session(session):
+    """Incrementally index a saved session"""
+    publish_change(SEMANTIC_VERSION_KEY, _semantic_index, lambda: _semantic_index.update_session(session))
+
+
+def unindex_session(session_id):
+    """Drop a deleted session from the index"""
+    publish_change(SEMANTIC_VERSION_KEY, _semantic_index, lambda: _semantic_index.remove_session(session_id))
@@ -0,0 +1,121 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from sessions.models import Session, Booking, Feedback
+from users.models import User, Follow
+from .models import MentorStats, SkillRelation, MentorSkillTag
+from .skill_index import index_session, unindex_session, index_mentor
+from . import semantic_index, skill_autocomplete
+from .collaborative import invalidate_learner
+from .precompute import invalidate_user
+from sessions.matching import invalidate_match_cache
+from sessions import availability
+from . import trending, popularity, skill_graph, skill_phrases
+
+# Profile fields the skill and autocomplete indexes read
+INDEXED_USER_FIELDS = {'skills', 'domain', 'is_active'}
+
+# Profile fields the learner similarity matrix reads
+LEARNER_MATRIX_FIELDS = {'interests', 'role'}
+
+# Profile fields the mentor matcher reads
+MATCHED_MENTOR_FIELDS = {
+    'skills', 'role', 'domain', 'hourly_rate', 'is_active', 'is_verified', 'availability', 'timezone'
+}
+
+
+def refresh_mentor_stats(mentor_id):
+    """Refresh one mentor's rollup once the surrounding transaction commits, then drop cached matches"""
+    if mentor_id:
+        def refresh():
+            MentorStats.refresh([mentor_id])
+            invalidate_match_cache()
+        transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=Session)
+def session_saved(sender, instance, **kwargs):
+    """Keep the skill, semantic, autocomplete and availability indexes and mentor stats in step with session edits and status changes"""
+    index_session(instance)
+    semantic_index.index_session(instance)
+    skill_autocomplete.index_session(instance)
+    availability.publish_change()
+    refresh_mentor_stats(instance.mentor_id)
+    # Phrases are extracted once per write, after commit so a rolled-back save leaves no rows;
+    # it still runs in the saving request (one read, plus a write only when phrases changed)
+    transaction.on_commit(lambda: skill_phrases.sync_session(instance))
+
+
+@receiver(post_delete, sender=Session)
+def session_deleted(sender, instance, **kwargs):
+    """Remove deleted sessions from the skill, semantic, autocomplete and availability indexes"""
+    unindex_session(instance.pk)
+    semantic_index.unindex_session(instance.pk)
+    skill_autocomplete.unindex_session(instance.pk)
+    availability.publish_change()
+    refresh_mentor_stats(instance.mentor_id)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    """Refresh indexed mentor skills and learner interests when a profile changes"""
+    if update_fields is None or INDEXED_USER_FIELDS & set(update_fields):
+        index_mentor(instance)
+        skill_autocomplete.index_user(instance)
+    if update_fields is None or LEARNER_MATRIX_FIELDS & set(update_fields):
+        invalidate_learner(instance)
+    if update_fields is None or {'skills', 'role'} & set(update_fields):
+        MentorSkillTag.sync(instance)
+    if instance.role == 'mentor' and (update_fields is None or MATCHED_MENTOR_FIELDS & set(update_fields)):
+        availability.publish_change()
+        invalidate_match_cache()
+
+
+@receiver(pre_save, sender=Booking)
+def booking_status_before_save(sender, instance, **kwargs):
+    """Remember the stored status so post_save can tell a cancellation from an edit"""
+    instance._previous_status = None
+    if instance.pk and not instance._state.adding:
+        instance._previous_status = Booking.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+
+@receiver(post_save, sender=Booking)
+def booking_saved(sender, instance, created, **kwargs):
+    """Bookings and cancellations change what a learner should be shown next"""
+    invalidate_user(instance.learner_id)
+    
+    was_counted = not created and getattr(instance, '_previous_status', None) is not None and \
+        trending.counts_toward_trending(instance._previous_status)
+    is_counted = trending.counts_toward_trending(instance.status)
+    if is_counted != was_counted:
+        trending.record_booking(instance.session_id, instance.created_at, 1 if is_counted else -1)
+    if created:
+        popularity.record_booking(instance.session_id)
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance, **kwargs):
+    invalidate_user(instance.learner_id)
+    if trending.counts_toward_trending(instance.status):
+        trending.record_booking(instance.session_id, instance.created_at, -1)
+
+
+@receiver(post_save, sender=Feedback)
+@receiver(post_delete, sender=Feedback)
+def feedback_changed(sender, instance, **kwargs):
+    """Ratings feed the mentor's average"""
+    mentor_id = Session.objects.filter(pk=instance.session_id).values_list('mentor_id', flat=True).first()
+    refresh_mentor_stats(mentor_id)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def follow_changed(sender, instance, **kwargs):
+    refresh_mentor_stats(instance.following_id)
+
+
+@receiver(post_save, sender=SkillRelation)
+@receiver(post_delete, sender=SkillRelation)
+def skill_relation_changed(sender, instance, **kwargs):
+    """Every process reloads the skill graph on its next lookup"""
+    skill_graph.publish_change()
@@ -0,0 +1,216 @@
+"""
+Skill Autocomplete Index
+Skill phrases listed on open sessions and user profiles, kept as a sorted array of
+word-start keys so an autocomplete query is a binary search plus a short scan instead
+of loading and splitting every session on each keystroke
+"""
+
+import bisect
+import threading
+import time
+from .index_version import current_version, publish_change
+from .skill_index import TOKEN_PATTERN, parse_skills
+
+AUTOCOMPLETE_VERSION_KEY = 'recommendations_skill_autocomplete_version'
+REBUILD_INTERVAL = 3600
+MAX_PHRASE_LENGTH = 30  # Longer entries are sentences, not skill names
+SUGGESTION_STATUSES = ['open', 'scheduled']
+
+
+def skill_phrases(skills_data):
+    """Distinct lowercase skill phrases from a skills field"""
+    return {phrase for phrase in parse_skills(skills_data or '') if 0 < len(phrase) <= MAX_PHRASE_LENGTH}
+
+
+def phrase_keys(phrase):
+    """Keys a phrase is found under: the phrase itself and every later word start ("machine learning" -> "learning")"""
+    return {phrase[match.start():] for match in TOKEN_PATTERN.finditer(phrase)} | {phrase}
+
+
+class SkillAutocompleteIndex:
+    """Sorted word-start keys over skill phrases, with the sessions and users listing each phrase"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = None
+        self.built_at = 0
+        self._reset()
+
+    def _reset(self):
+        self.keys = []             # sorted (key, phrase) pairs
+        self.phrase_sessions = {}  # phrase -> session ids listing it
+        self.phrase_users = {}     # phrase -> user ids listing it
+        self.session_phrases = {}  # session id -> phrases
+        self.session_text = {}     # session id -> lowercased title, description and skills, for domain filters
+        self.user_phrases = {}     # user id -> phrases
+        self.user_domain = {}      # user id -> lowercased domain
+
+    def build(self, version):
+        """Rebuild from every open or scheduled session and every active user with skills"""
+        from sessions.models import Session
+        from users.models import User
+
+        sessions = Session.objects.filter(status__in=SUGGESTION_STATUSES).values_list(
+            'id', 'title', 'description', 'skills'
+        )
+        users = User.objects.filter(is_active=True).exclude(skills='').values_list('id', 'skills', 'domain')
+
+        with self.lock:
+            self._reset()
+            pairs = set()
+            for session_id, title, description, skills in sessions:
+                pairs |= self._add_session(session_id, title, description, skills)
+            for user_id, skills, domain in users:
+                pairs |= self._add_user(user_id, skills, domain)
+            self.keys = sorted(pairs)
+
+            self.version = version
+            self.built_at = time.monotonic()
+
+    def _attach(self, owners, phrase, owner_id):
+        """Record that owner_id lists phrase; returns the phrase's new keys if it was unknown"""
+        known = phrase in self.phrase_sessions or phrase in self.phrase_users
+        owners.setdefault(phrase, set()).add(owner_id)
+        return set() if known else {(key, phrase) for key in phrase_keys(phrase)}
+
+    def _detach(self, owners, phrase, owner_id):
+        """Forget that owner_id lists phrase, dropping its keys once nobody does"""
+        owner_ids = owners.get(phrase)
+        if owner_ids is None:
+            return
+        owner_ids.discard(owner_id)
+        if not owner_ids:
+            del owners[phrase]
+            if phrase not in self.phrase_sessions and phrase not in self.phrase_users:
+                for key in phrase_keys(phrase):
+                    position = bisect.bisect_left(self.keys, (key, phrase))
+                    if position < len(self.keys) and self.keys[position] == (key, phrase):
+                        del self.keys[position]
+
+    def _add_session(self, session_id, title, description, skills):
+        phrases = skill_phrases(skills)
+        self.session_phrases[session_id] = phrases
+        self.session_text[session_id] = f"{title} {description} {skills}".lower()
+        new_keys = set()
+        for phrase in phrases:
+            new_keys |= self._attach(self.phrase_sessions, phrase, session_id)
+        return new_keys
+
+    def _remove_session(self, session_id):
+        self.session_text.pop(session_id, None)
+        for phrase in self.session_phrases.pop(session_id, ()):
+            self._detach(self.phrase_sessions, phrase, session_id)
+
+    def _add_user(self, user_id, skills, domain):
+        phrases = skill_phrases(skills)
+        if not phrases:
+            return set()
+        self.user_phrases[user_id] = phrases
+        self.user_domain[user_id] = (domain or '').lower()
+        new_keys = set()
+        for phrase in phrases:
+            new_keys |= self._attach(self.phrase_users, phrase, user_id)
+        return new_keys
+
+    def _remove_user(self, user_id):
+        self.user_domain.pop(user_id, None)
+        for phrase in self.user_phrases.pop(user_id, ()):
+            self._detach(self.phrase_users, phrase, user_id)
+
+    def _insert_keys(self, pairs):
+        for pair in pairs:
+            bisect.insort(self.keys, pair)
+
+    def update_session(self, session):
+        """Re-index a single session after it was saved"""
+        with self.lock:
+            self._remove_session(session.pk)
+            if session.status in SUGGESTION_STATUSES:
+                self._insert_keys(self._add_session(session.pk, session.title, session.description, session.skills))
+
+    def remove_session(self, session_id):
+        with self.lock:
+            self._remove_session(session_id)
+
+    def update_user(self, user):
+        """Refresh a user's skills; returns True if the index changed"""
+        with self.lock:
+            phrases = skill_phrases(user.skills) if user.is_active else set()
+            domain = (user.domain or '').lower()
+            if phrases == self.user_phrases.get(user.pk, set()) and domain == self.user_domain.get(user.pk, domain):
+                return False
+            self._remove_user(user.pk)
+            if phrases:
+                self._insert_keys(self._add_user(user.pk, user.skills, user.domain))
+            return True
+
+    def session_count(self, phrase):
+        """Number of open or scheduled sessions listing a phrase"""
+        with self.lock:
+            return len(self.phrase_sessions.get(phrase.lower(), ()))
+
+    def search(self, query, domains=None, limit=None):
+        """
+        Skill phrases with a word starting with the query, listed on the most sessions first
+
+        With domains, only sessions whose text and users whose domain mention one
+        of them are counted.
+
+        Returns:
+            List of (phrase, session count, user count) triples
+        """
+        query = query.lower().strip()
+        if not query:
+            return []
+        domain_terms = [domain.replace('-', ' ').lower() for domain in domains or []]
+
+        with self.lock:
+            phrases = set()
+            position = bisect.bisect_left(self.keys, (query,))
+            while position < len(self.keys) and self.keys[position][0].startswith(query):
+                phrases.add(self.keys[position][1])
+                position += 1
+
+            results = []
+            for phrase in phrases:
+                session_ids = self.phrase_sessions.get(phrase, ())
+                user_ids = self.phrase_users.get(phrase, ())
+                if domain_terms:
+                    session_count = sum(1 for session_id in session_ids
+                                        if any(term in self.session_text[session_id] for term in domain_terms))
+                    user_count = sum(1 for user_id in user_ids
+                                     if any(term in self.user_domain[user_id] for term in domain_terms))
+                else:
+                    session_count, user_count = len(session_ids), len(user_ids)
+                if session_count or user_count:
+                    results.append((phrase, session_count, user_count))
+
+        results.sort(key=lambda result: (-result[1], -result[2], result[0]))
+        return results[:limit] if limit else results
+
+
+_autocomplete_index = SkillAutocompleteIndex()
+
+
+def get_autocomplete_index():
+    """Return the process-wide index, rebuilding it if another process changed it or it aged out"""
+    version = current_version(AUTOCOMPLETE_VERSION_KEY)
+    if (_autocomplete_index.version != version or
+            time.monotonic() - _autocomplete_index.built_at > REBUILD_INTERVAL):
+        _autocomplete_index.build(version)
+    return _autocomplete_index
+
+
+def index_session(session):
+    """Incrementally index a saved session"""
+    publish_change(AUTOCOMPLETE_VERSION_KEY, _autocomplete_index, lambda: _autocomplete_index.update_session(session))
+
+
+def unindex_session(session_id):
+    """Drop a deleted session from the index"""
+    publish_change(AUTOCOMPLETE_VERSION_KEY, _autocomplete_index, lambda: _autocomplete_index.remove_session(session_id))
+
+
+def index_user(user):
+    """Refresh the index after a user's skills may have changed"""
+    publish_change(AUTOCOMPLETE_VERSION_KEY, _autocomplete_index, lambda: _autocomplete_index.update_user(user))
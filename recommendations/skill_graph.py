@@ -0,0 +1,89 @@
+"""
+Skill Relation Graph for PeerLearn
+Admin-edited SkillRelation rows loaded into an in-memory weighted adjacency map,
+with the multi-hop closure precomputed so lookups are a single dict access
+"""
+
+import threading
+import time
+from .index_version import current_version, bump_version
+
+GRAPH_VERSION_KEY = 'recommendations_skill_graph_version'
+REBUILD_INTERVAL = 3600
+MAX_HOPS = 2
+HOP_DECAY = 0.5  # Each hop past the first scales the path weight down
+
+
+class SkillGraph:
+    """Weighted directed skill graph with a precomputed closure up to MAX_HOPS"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.built_at = 0
+        self.edges = {}    # skill -> {related skill: weight}
+        self.closure = {}  # skill -> {reachable skill: best decayed path weight}
+
+    def build(self, version):
+        """Reload every relation and recompute the closure"""
+        from .models import SkillRelation
+
+        edges = {}
+        for skill, related_skill, weight in SkillRelation.objects.values_list('skill', 'related_skill', 'weight'):
+            if skill != related_skill and weight > 0:
+                edges.setdefault(skill, {})[related_skill] = weight
+
+        closure = {skill: self._reachable(edges, skill) for skill in edges}
+
+        with self.lock:
+            self.edges = edges
+            self.closure = closure
+            self.version = version
+            self.built_at = time.monotonic()
+
+    @staticmethod
+    def _reachable(edges, start):
+        """Best path weight to every skill within MAX_HOPS of start (breadth-first, max over paths)"""
+        best = {}
+        frontier = {start: 1.0}
+        for hop in range(MAX_HOPS):
+            decay = HOP_DECAY ** hop
+            next_frontier = {}
+            for skill, path_weight in frontier.items():
+                for related_skill, weight in edges.get(skill, {}).items():
+                    if related_skill == start:
+                        continue
+                    reach = path_weight * weight
+                    if reach * decay > best.get(related_skill, 0):
+                        best[related_skill] = reach * decay
+                    if reach > next_frontier.get(related_skill, 0):
+                        next_frontier[related_skill] = reach
+            frontier = next_frontier
+        return best
+
+    def related(self, skill):
+        """Skills related to the given one, with weights in (0, 1]"""
+        with self.lock:
+            return dict(self.closure.get(skill.strip().lower(), {}))
+
+    def skills(self):
+        """Every skill that has outgoing relations"""
+        with self.lock:
+            return list(self.edges)
+
+
+_skill_graph = SkillGraph()
+
+
+def get_skill_graph():
+    """Return the process-wide graph, reloading it after an edit in any process"""
+    version = current_version(GRAPH_VERSION_KEY)
+    if (_skill_graph.version != version or
+            time.monotonic() - _skill_graph.built_at > REBUILD_INTERVAL):
+        _skill_graph.build(version)
+    return _skill_graph
+
+
+def publish_change():
+    """Mark the graph stale everywhere after a relation was edited"""
+    bump_version(GRAPH_VERSION_KEY)
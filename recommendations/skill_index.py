@@ -0,0 +1,201 @@
+"""
+Inverted Skill Index for PeerLearn Recommendations
+Maps normalized skill tokens to upcoming session IDs and mentor skills to mentor IDs,
+so content-based candidates come from set lookups instead of full session scans
+"""
+
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from django.utils import timezone
+from .index_version import current_version, publish_change
+
+INDEX_VERSION_KEY = 'recommendations_skill_index_version'
+REBUILD_INTERVAL = 3600  # Drop sessions that went stale without a save at least hourly
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+def tokenize(text):
+    """Split text into normalized skill tokens ("Node.js & C++" -> {'node', 'js', 'c++'})"""
+    return set(TOKEN_PATTERN.findall((text or '').lower()))
+
+
+def parse_skills(skills_data):
+    """Parse skills from JSON list or comma-separated text into lowercase names"""
+    if isinstance(skills_data, str):
+        try:
+            skills_data = json.loads(skills_data)
+        except (ValueError, TypeError):
+            skills_data = [s.strip() for s in skills_data.split(',') if s.strip()]
+
+    if isinstance(skills_data, list):
+        return [str(skill).lower().strip() for skill in skills_data if skill]
+
+    return []
+
+
+class SkillIndex:
+    """In-memory inverted index over scheduled sessions and their mentors' skills"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = None
+        self.built_at = 0
+        self._reset()
+
+    def _reset(self):
+        self.token_sessions = defaultdict(set)   # token -> session ids
+        self.session_text = {}                   # session id -> lowercased title + description
+        self.session_mentor = {}                 # session id -> mentor id
+        self.mentor_sessions = defaultdict(set)  # mentor id -> session ids
+        self.skill_mentors = defaultdict(set)    # mentor skill -> mentor ids
+        self.mentor_skills = {}                  # mentor id -> set of mentor skills
+
+    def build(self, version):
+        """Rebuild the whole index from upcoming scheduled sessions"""
+        from sessions.models import Session
+        from users.models import User
+
+        sessions = Session.objects.filter(
+            status='scheduled',
+            schedule__gte=timezone.now()
+        ).values_list('id', 'mentor_id', 'title', 'description')
+
+        with self.lock:
+            self._reset()
+            for session_id, mentor_id, title, description in sessions:
+                self._add_session(session_id, mentor_id, title, description)
+
+            mentors = User.objects.filter(id__in=list(self.mentor_sessions)).values_list('id', 'skills')
+            for mentor_id, skills in mentors:
+                self._set_mentor_skills(mentor_id, skills)
+
+            self.version = version
+            self.built_at = time.monotonic()
+
+    def _add_session(self, session_id, mentor_id, title, description):
+        text = f"{title} {description}".lower()
+        self.session_text[session_id] = text
+        self.session_mentor[session_id] = mentor_id
+        self.mentor_sessions[mentor_id].add(session_id)
+        for token in tokenize(text):
+            self.token_sessions[token].add(session_id)
+
+    def _remove_session(self, session_id):
+        text = self.session_text.pop(session_id, None)
+        if text is None:
+            return
+        for token in tokenize(text):
+            session_ids = self.token_sessions.get(token)
+            if session_ids is not None:
+                session_ids.discard(session_id)
+                if not session_ids:
+                    del self.token_sessions[token]
+
+        mentor_id = self.session_mentor.pop(session_id)
+        mentor_session_ids = self.mentor_sessions.get(mentor_id)
+        if mentor_session_ids is not None:
+            mentor_session_ids.discard(session_id)
+            if not mentor_session_ids:
+                del self.mentor_sessions[mentor_id]
+                self._set_mentor_skills(mentor_id, '')
+
+    def _set_mentor_skills(self, mentor_id, skills_data):
+        for skill in self.mentor_skills.pop(mentor_id, ()):
+            mentor_ids = self.skill_mentors.get(skill)
+            if mentor_ids is not None:
+                mentor_ids.discard(mentor_id)
+                if not mentor_ids:
+                    del self.skill_mentors[skill]
+
+        skills = set(parse_skills(skills_data or ''))
+        if skills:
+            self.mentor_skills[mentor_id] = skills
+            for skill in skills:
+                self.skill_mentors[skill].add(mentor_id)
+
+    def update_session(self, session):
+        """Re-index a single session after it was saved"""
+        with self.lock:
+            self._remove_session(session.pk)
+            if session.status == 'scheduled' and session.schedule and session.schedule >= timezone.now():
+                if session.mentor_id not in self.mentor_skills:
+                    self._set_mentor_skills(session.mentor_id, session.mentor.skills)
+                self._add_session(session.pk, session.mentor_id, session.title, session.description)
+
+    def remove_session(self, session_id):
+        with self.lock:
+            self._remove_session(session_id)
+
+    def update_mentor(self, user):
+        """Refresh a mentor's skills; returns True if the index changed"""
+        with self.lock:
+            if user.pk not in self.mentor_sessions:
+                return False
+            skills = set(parse_skills(user.skills or ''))
+            if skills == self.mentor_skills.get(user.pk, set()):
+                return False
+            self._set_mentor_skills(user.pk, user.skills)
+            return True
+
+    def sessions_for_skill(self, skill):
+        """Session IDs whose title or description contains the skill phrase"""
+        tokens = tokenize(skill)
+        if not tokens:
+            return set()
+
+        with self.lock:
+            # Intersect the smallest posting lists first, then confirm the phrase on the survivors
+            postings = sorted((self.token_sessions.get(token, set()) for token in tokens), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting
+                if not candidates:
+                    return set()
+            return {session_id for session_id in candidates if skill in self.session_text[session_id]}
+
+    def mentor_skills_matching(self, skill):
+        """Mentor skills that contain, or are contained in, the given skill"""
+        with self.lock:
+            return [
+                mentor_skill for mentor_skill in self.skill_mentors
+                if skill in mentor_skill or mentor_skill in skill
+            ]
+
+    def sessions_for_mentor_skill(self, mentor_skill):
+        """Session IDs run by mentors who list the given skill"""
+        with self.lock:
+            session_ids = set()
+            for mentor_id in self.skill_mentors.get(mentor_skill, ()):
+                session_ids |= self.mentor_sessions.get(mentor_id, set())
+            return session_ids
+
+
+_skill_index = SkillIndex()
+
+
+def get_skill_index():
+    """Return the process-wide index, rebuilding it if another process changed it or it aged out"""
+    version = current_version(INDEX_VERSION_KEY)
+    if (_skill_index.version != version or
+            time.monotonic() - _skill_index.built_at > REBUILD_INTERVAL):
+        _skill_index.build(version)
+    return _skill_index
+
+
+def index_session(session):
+    """Incrementally index a saved session"""
+    publish_change(INDEX_VERSION_KEY, _skill_index, lambda: _skill_index.update_session(session))
+
+
+def unindex_session(session_id):
+    """Drop a deleted session from the index"""
+    publish_change(INDEX_VERSION_KEY, _skill_index, lambda: _skill_index.remove_session(session_id))
+
+
+def index_mentor(user):
+    """Refresh the index after a user's skills may have changed"""
+    publish_change(INDEX_VERSION_KEY, _skill_index, lambda: _skill_index.update_mentor(user))
@@ -0,0 +1,154 @@
+"""
+Skill Phrase Extraction and Statistics
+Each session's skill phrases are extracted once when it is saved: everything listed in
+its skills, plus known skill phrases found in its title and description. A scheduled
+job rolls the phrases up into SkillPhraseStat counts and week-over-week growth, which
+skill suggestions rank and label from.
+"""
+
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from sessions.models import Session
+from .models import SessionSkillPhrase, SkillPhraseStat
+from .skill_index import TOKEN_PATTERN, parse_skills
+
+VOCABULARY_KEY = 'recommendations_skill_phrase_vocabulary'
+VOCABULARY_TTL = 3600
+MAX_PHRASE_LENGTH = 100
+MAX_PHRASE_WORDS = 3
+ACTIVE_STATUSES = ['open', 'scheduled']
+GROWTH_WINDOW = timedelta(days=7)
+
+
+def phrase_key(phrase):
+    """Token form a phrase is matched by in free text ("Node.js" -> "node js")"""
+    return ' '.join(TOKEN_PATTERN.findall(phrase.lower()))
+
+
+def listed_phrases(skills_data):
+    """Skill phrases listed in a skills field"""
+    return {phrase[:MAX_PHRASE_LENGTH] for phrase in parse_skills(skills_data or '') if phrase}
+
+
+def build_vocabulary(phrases):
+    """Map token forms to phrases, skipping ones too short to find reliably in text"""
+    vocabulary = {}
+    for phrase in phrases:
+        key = phrase_key(phrase)
+        if len(key) >= 2 and key.count(' ') < MAX_PHRASE_WORDS:
+            vocabulary.setdefault(key, phrase)
+    return vocabulary
+
+
+def get_vocabulary():
+    """Known skill phrases from the last stats refresh and the skill graph, keyed by token form"""
+    vocabulary = cache.get(VOCABULARY_KEY)
+    if vocabulary is None:
+        from .skill_graph import get_skill_graph
+
+        phrases = set(SkillPhraseStat.objects.values_list('phrase', flat=True).distinct())
+        phrases.update(get_skill_graph().skills())
+        vocabulary = build_vocabulary(phrases)
+        cache.set(VOCABULARY_KEY, vocabulary, VOCABULARY_TTL)
+    return vocabulary
+
+
+def extract_phrases(title, description, skills, vocabulary):
+    """
+    Skill phrases for one session
+
+    Returns:
+        Dict of phrase -> True if listed in skills, False if found in the title or description
+    """
+    phrases = dict.fromkeys(listed_phrases(skills), True)
+    vocabulary = {**vocabulary, **build_vocabulary(phrases)}
+
+    tokens = TOKEN_PATTERN.findall(f"{title} {description}".lower())
+    for length in range(1, MAX_PHRASE_WORDS + 1):
+        for start in range(len(tokens) - length + 1):
+            phrase = vocabulary.get(' '.join(tokens[start:start + length]))
+            if phrase is not None and phrase not in phrases:
+                phrases[phrase] = False
+    return phrases
+
+
+def sync_session(session, vocabulary=None):
+    """Make a session's SessionSkillPhrase rows match its current text"""
+    wanted = extract_phrases(session.title, session.description, session.skills, vocabulary or get_vocabulary())
+    current = dict(SessionSkillPhrase.objects.filter(session=session).values_list('phrase', 'listed'))
+
+    stale = [phrase for phrase, listed in current.items() if wanted.get(phrase) != listed]
+    if stale:
+        SessionSkillPhrase.objects.filter(session=session, phrase__in=stale).delete()
+    added = [phrase for phrase in wanted if phrase not in current or phrase in stale]
+    if added:
+        SessionSkillPhrase.objects.bulk_create(
+            [SessionSkillPhrase(session=session, phrase=phrase, listed=wanted[phrase]) for phrase in added],
+            ignore_conflicts=True
+        )
+
+
+def extract_all(batch_size=500):
+    """Re-extract every session's phrases, with a vocabulary of everything listed anywhere; returns phrases stored"""
+    sessions = list(Session.objects.values_list('id', 'title', 'description', 'skills'))
+
+    phrases = set(SkillPhraseStat.objects.values_list('phrase', flat=True).distinct())
+    for _, _, _, skills in sessions:
+        phrases |= listed_phrases(skills)
+    vocabulary = build_vocabulary(phrases)
+
+    rows = [
+        SessionSkillPhrase(session_id=session_id, phrase=phrase, listed=listed)
+        for session_id, title, description, skills in sessions
+        for phrase, listed in extract_phrases(title, description, skills, vocabulary).items()
+    ]
+    with transaction.atomic():
+        SessionSkillPhrase.objects.all().delete()
+        SessionSkillPhrase.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def refresh_stats():
+    """
+    Recompute SkillPhraseStat from the extracted phrases with one grouped query
+
+    Phrases no session mentions any more are dropped. Returns stat rows written.
+    """
+    now = timezone.now()
+    recent_start = now - GROWTH_WINDOW
+    previous_start = recent_start - GROWTH_WINDOW
+
+    counts = SessionSkillPhrase.objects.values('phrase', 'session__category').annotate(
+        session_count=Count('id', filter=Q(session__status__in=ACTIVE_STATUSES)),
+        recent_count=Count('id', filter=Q(session__created_at__gte=recent_start)),
+        previous_count=Count('id', filter=Q(session__created_at__gte=previous_start, session__created_at__lt=recent_start))
+    )
+
+    stats = [
+        SkillPhraseStat(
+            phrase=row['phrase'],
+            domain=row['session__category'] or '',
+            session_count=row['session_count'],
+            recent_count=row['recent_count'],
+            previous_count=row['previous_count'],
+            growth=SkillPhraseStat.calculate_growth(row['recent_count'], row['previous_count']),
+            updated_at=now,
+        )
+        for row in counts
+    ]
+
+    with transaction.atomic():
+        SkillPhraseStat.objects.bulk_create(
+            stats,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['phrase', 'domain'],
+            update_fields=['session_count', 'recent_count', 'previous_count', 'growth', 'updated_at'],
+        )
+        SkillPhraseStat.objects.filter(updated_at__lt=now).delete()
+
+    cache.delete(VOCABULARY_KEY)
+    return len(stats)
@@ -0,0 +1,61 @@
+"""
+Bounded Top-K Selection for Recommendation Scoring
+Keeps the k best-scoring items seen so far in a min-heap, so scorers can stream
+candidates and skip the ones whose best possible score cannot make the cut
+"""
+
+import heapq
+import itertools
+
+
+class TopK:
+    """Min-heap of the k highest-scoring items; ties keep the earlier item, like a stable sort"""
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []                   # (score, -sequence, item), worst entry first
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    @property
+    def threshold(self):
+        """Score a new item must beat to get in, or None while the heap still has room"""
+        if len(self.heap) < self.k:
+            return None
+        return self.heap[0][0]
+
+    def can_enter(self, upper_bound):
+        """Whether an item whose score is at most upper_bound could still be kept"""
+        threshold = self.threshold
+        return threshold is None or upper_bound > threshold
+
+    def push(self, score, item):
+        """Offer an item; returns True if it was kept"""
+        if self.k <= 0:
+            return False
+        entry = (score, -next(self.counter), item)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+            return True
+        if score > self.heap[0][0]:
+            heapq.heapreplace(self.heap, entry)
+            return True
+        return False
+
+    def items(self):
+        """Kept items, best first"""
+        return [item for _, _, item in sorted(self.heap, reverse=True)]
+
+    def scored_items(self):
+        """Kept (score, item) pairs, best first"""
+        return [(score, item) for score, _, item in sorted(self.heap, reverse=True)]
+
+
+def top_k(iterable, k, key):
+    """The k items with the highest key, best first, in a single pass"""
+    heap = TopK(k)
+    for item in iterable:
+        heap.push(key(item), item)
+    return heap.items()
@@ -0,0 +1,141 @@
+"""
+Trending Sessions Leaderboard
+Bookings are counted into hourly per-session buckets as they are made or cancelled;
+trending reads a cached, pre-sorted leaderboard summed over the last seven days
+instead of joining and counting bookings on every request. Each booking moves its
+session within the cached leaderboard; a full rebuild only happens when it expires.
+"""
+
+import time
+from datetime import timedelta, timezone as dt_timezone
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+from sessions.models import Booking
+from .models import SessionBookingBucket
+
+WINDOW = timedelta(days=7)
+LEADERBOARD_KEY = 'recommendations_trending_leaderboard'
+LEADERBOARD_SIZE = 50
+LEADERBOARD_TTL = 300  # The window slides, so rebuild at least this often even without bookings
+
+
+def counts_toward_trending(status):
+    """Whether a booking in this status counts as a booking for trending"""
+    return status != 'cancelled'
+
+
+def bucket_hour(moment):
+    """Start of the UTC hour a booking falls into"""
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def record_booking(session_id, created_at, delta):
+    """Add delta (+1 / -1) to the session's bucket for the hour the booking was made"""
+    if created_at is None or created_at < timezone.now() - WINDOW:
+        return  # Already outside the window, nothing reads it
+
+    hour = bucket_hour(created_at)
+    updated = SessionBookingBucket.objects.filter(session_id=session_id, hour=hour).update(count=F('count') + delta)
+    # Only increments create buckets; a missing bucket has nothing to decrement, and a
+    # cascading session delete must not recreate rows for the session being removed
+    if not updated and delta > 0:
+        try:
+            with transaction.atomic():
+                SessionBookingBucket.objects.create(session_id=session_id, hour=hour, count=delta)
+        except IntegrityError:
+            # Another request created the bucket first
+            SessionBookingBucket.objects.filter(session_id=session_id, hour=hour).update(count=F('count') + delta)
+
+    update_leaderboard(session_id)
+
+
+def window_buckets():
+    """Buckets of upcoming scheduled sessions that are still inside the window"""
+    now = timezone.now()
+    return SessionBookingBucket.objects.filter(
+        hour__gte=bucket_hour(now - WINDOW),
+        session__status='scheduled',
+        session__schedule__gte=now
+    )
+
+
+def update_leaderboard(session_id):
+    """
+    Move one session to its new place in the cached leaderboard
+
+    Sessions off a full leaderboard never have more bookings than its last entry, so an
+    entry can only be patched in place while it stays at or above that count; when it
+    drops below, an unlisted session might overtake it and the leaderboard is rebuilt on
+    the next read instead. The expiry is kept, so the sliding window is still recounted
+    at least every LEADERBOARD_TTL seconds.
+    """
+    cached = cache.get(LEADERBOARD_KEY)
+    if cached is None:
+        return
+    remaining = LEADERBOARD_TTL - (time.time() - cached['built_at'])
+    if remaining <= 1:
+        return
+
+    recent_bookings = window_buckets().filter(session_id=session_id).aggregate(total=Sum('count'))['total'] or 0
+    entries = cached['entries']
+    others = [entry for entry in entries if entry[0] != session_id]
+    if (len(entries) >= LEADERBOARD_SIZE and len(others) < len(entries) and
+            recent_bookings < entries[-1][1]):
+        cache.delete(LEADERBOARD_KEY)
+        return
+
+    if recent_bookings >= 1:
+        others.append((session_id, recent_bookings))
+        others.sort(key=lambda entry: entry[1], reverse=True)
+    cached['entries'] = others[:LEADERBOARD_SIZE]
+    cache.set(LEADERBOARD_KEY, cached, int(remaining))
+
+
+def get_leaderboard():
+    """
+    Upcoming scheduled sessions by bookings in the window, most first
+
+    Returns:
+        List of (session_id, recent_bookings) pairs, at most LEADERBOARD_SIZE long
+    """
+    cached = cache.get(LEADERBOARD_KEY)
+    if cached is None:
+        cached = {
+            'built_at': time.time(),
+            'entries': list(
+                window_buckets().values('session_id').annotate(
+                    recent_bookings=Sum('count')
+                ).filter(recent_bookings__gte=1).order_by('-recent_bookings').values_list(
+                    'session_id', 'recent_bookings'
+                )[:LEADERBOARD_SIZE]
+            ),
+        }
+        cache.set(LEADERBOARD_KEY, cached, LEADERBOARD_TTL)
+    return cached['entries']
+
+
+def rebuild_buckets():
+    """Recount the window's buckets from bookings and drop expired ones; returns buckets written"""
+    window_start = bucket_hour(timezone.now() - WINDOW)
+    counts = Booking.objects.filter(
+        created_at__gte=window_start
+    ).exclude(status='cancelled').annotate(
+        hour=TruncHour('created_at', tzinfo=dt_timezone.utc)
+    ).values('session_id', 'hour').annotate(count=Count('id'))
+
+    buckets = [SessionBookingBucket(session_id=row['session_id'], hour=row['hour'], count=row['count']) for row in counts]
+    with transaction.atomic():
+        SessionBookingBucket.objects.all().delete()
+        SessionBookingBucket.objects.bulk_create(buckets, batch_size=500)
+
+    cache.delete(LEADERBOARD_KEY)
+    return len(buckets)
+
+
+def prune_buckets():
+    """Delete buckets that have slid out of the window"""
+    deleted, _ = SessionBookingBucket.objects.filter(hour__lt=bucket_hour(timezone.now() - WINDOW)).delete()
+    return deleted
@@ -7,6 +7,7 @@ from sessions.models import Session, Booking, Feedback
 from users.models import User
 from .models import PopularityMetric
 from .recommendation_engine import get_recommendations_for_user, get_mentor_recommendations_for_user
+from . import trending, popularity
 
 @login_required
 def recommendations_page(request):
@@ -28,18 +29,7 @@ def recommendations_page(request):
         recommended_mentors = []
     
     # Get trending sessions (last 7 days activity)
-    from datetime import timedelta
-    recent_date = timezone.now() - timedelta(days=7)
-    trending_sessions = Session.objects.filter(
-        status='scheduled',
-        schedule__gte=timezone.now(),
-        bookings__created_at__gte=recent_date
-    ).exclude(
-        bookings__learner=request.user,
-        bookings__status='confirmed'
-    ).annotate(
-        recent_bookings=Count('bookings', filter=Q(bookings__created_at__gte=recent_date))
-    ).filter(recent_bookings__gte=1).order_by('-recent_bookings')[:5]
+    trending_sessions = _trending_for_user(request.user, limit=5)
     
     # Get popular sessions with ratings
     popular_sessions = Session.objects.filter(
@@ -49,10 +39,7 @@ def recommendations_page(request):
     ).exclude(
         bookings__learner=request.user,
         bookings__status='confirmed'
-    ).select_related('popularity', 'mentor').order_by(
-        '-popularity__rating_average',
-        '-popularity__booking_count'
-    )[:5]
+    ).select_related('popularity', 'mentor').order_by('-popularity__score')[:5]
     
     # Get all available sessions as backup
     all_sessions = Session.objects.filter(
@@ -78,23 +65,18 @@ def recommendations_page(request):
 @login_required
 def trending_sessions(request):
     """Get trending sessions based on popularity metrics"""
-    from datetime import timedelta
-    recent_date = timezone.now() - timedelta(days=7)
-    
-    trending = Session.objects.filter(
-        status='scheduled',
-        schedule__gte=timezone.now(),
-        bookings__created_at__gte=recent_date
-    ).exclude(
-        bookings__learner=request.user,
-        bookings__status='confirmed'
-    ).annotate(
-        recent_bookings=Count('bookings', filter=Q(bookings__created_at__gte=recent_date)),
-        avg_rating=Avg('feedback__rating')
-    ).filter(recent_bookings__gte=1).order_by('-recent_bookings', '-avg_rating')
+    trending_list = _trending_for_user(request.user)
+    ratings = dict(
+        Feedback.objects.filter(session__in=trending_list).values('session_id').annotate(
+            avg_rating=Avg('rating')
+        ).values_list('session_id', 'avg_rating')
+    )
+    for session in trending_list:
+        session.avg_rating = ratings.get(session.id)
+    trending_list.sort(key=lambda session: (-session.recent_bookings, -(session.avg_rating or 0)))
     
     data = []
-    for session in trending:
+    for session in trending_list:
         data.append({
             'id': session.id,
             'title': session.title,
@@ -128,17 +110,31 @@ def recommended_sessions(request):
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+def _trending_for_user(user, limit=None):
+    """Leaderboard sessions the user has not booked, each with recent_bookings set"""
+    leaderboard = trending.get_leaderboard()
+    sessions = Session.objects.filter(
+        id__in=[session_id for session_id, _ in leaderboard],
+        status='scheduled',
+        schedule__gte=timezone.now()
+    ).exclude(
+        id__in=Booking.objects.filter(learner=user, status='confirmed').values('session_id')
+    ).select_related('mentor').in_bulk()
+    
+    results = []
+    for session_id, recent_bookings in leaderboard:
+        session = sessions.get(session_id)
+        if session is None:
+            continue
+        session.recent_bookings = recent_bookings
+        results.append(session)
+        if limit and len(results) >= limit:
+            break
+    return results
+
 def update_session_popularity(session_id, action):
-    """Helper function to update popularity metrics"""
-    try:
-        session = Session.objects.get(id=session_id)
-        popularity, created = PopularityMetric.objects.get_or_create(session=session)
-        
-        if action == 'view':
-            popularity.view_count += 1
-        elif action == 'book':
-            popularity.booking_count += 1
-        
-        popularity.save()
-    except:
-        pass
\ No newline at end of file
+    """Helper function to update popularity metrics (buffered, flushed in batches)"""
+    if action == 'view':
+        popularity.record_view(session_id)
+    elif action == 'book':
+        popularity.record_booking(session_id)
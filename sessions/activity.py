@@ -0,0 +1,83 @@
+"""
+Participant Activity Tracker
+Live-session consumers record when each participant was last heard from in memory;
+a background task in the event loop writes the latest timestamps to
+SessionParticipant.last_activity with one bulk_update per interval, instead of a
+lookup and save for every WebSocket frame.
+"""
+
+import asyncio
+import logging
+import threading
+from channels.db import database_sync_to_async
+from django.utils import timezone
+from .models import SessionParticipant
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 10  # Seconds a last-seen timestamp can wait before it is written
+BATCH_SIZE = 500
+
+
+class ActivityTracker:
+    """Latest activity per SessionParticipant id, flushed to the database in batches"""
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.pending = {}  # participant id -> last seen
+        self._task = None
+
+    def touch(self, participant_id):
+        """Record activity now; cheap enough to call for every frame"""
+        if participant_id is None:
+            return
+        with self.lock:
+            self.pending[participant_id] = timezone.now()
+
+    def _take(self, participant_ids=None):
+        with self.lock:
+            if participant_ids is None:
+                taken, self.pending = self.pending, {}
+            else:
+                taken = {
+                    participant_id: self.pending.pop(participant_id)
+                    for participant_id in participant_ids if participant_id in self.pending
+                }
+        return taken
+
+    def flush(self, participant_ids=None):
+        """
+        Write pending timestamps, all of them or only the given participants'
+
+        Returns:
+            Number of participants written
+        """
+        taken = self._take(participant_ids)
+        if taken:
+            SessionParticipant.objects.bulk_update(
+                [SessionParticipant(pk=participant_id, last_activity=last_seen)
+                 for participant_id, last_seen in taken.items()],
+                ['last_activity'],
+                batch_size=BATCH_SIZE
+            )
+        return len(taken)
+
+    async def flush_async(self, participant_ids=None):
+        return await database_sync_to_async(self.flush)(participant_ids)
+
+    def start(self):
+        """Start the periodic flush in the running event loop unless it is already going"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush_async()
+            except Exception as e:
+                logger.error(f"Failed to flush participant activity: {e}")
+
+
+activity_tracker = ActivityTracker()
@@ -1,4 +1,5 @@
-from django.http import JsonResponse, Http404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
@@ -12,11 +13,12 @@ import json
 from .models import Session, Booking, Request, Notification, Feedback
 from users.models import User
 from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from asgiref.sync import async_to_sync, sync_to_async
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder as DRFJSONEncoder
 from django.db.models import Count, Avg, Sum
 from .matching import get_mentor_recommendations, get_session_recommendations
 
@@ -1806,11 +1808,13 @@ def find_mentors_api(request):
             'domain': data.get('domain', ''),
             'urgency': data.get('urgency', 'flexible'),
             'budget': data.get('budget', ''),
-            'preferred_times': data.get('preferred_times', [])
+            'preferred_times': data.get('preferred_times', []),
+            'duration': data.get('duration', 60),
+            'timezone': request.user.timezone
         }
         
         # Get mentor recommendations
-        recommendations = get_mentor_recommendations(learner_profile, max_results=10)
+        recommendations = get_mentor_recommendations(learner_profile, max_results=10, parallel=True)
         
         # Format response
         mentors_data = []
@@ -1918,7 +1922,9 @@ def request_mentor_match_api(request):
             'domain': data.get('domain', ''),
             'urgency': data.get('urgency', 'flexible'),
             'budget': data.get('budget', ''),
-            'preferred_times': data.get('preferred_times', [])
+            'preferred_times': data.get('preferred_times', []),
+            'duration': session_request.duration,
+            'timezone': request.user.timezone
         }
         
         recommendations = get_mentor_recommendations(learner_profile, max_results=5)
@@ -2986,89 +2992,96 @@ def get_real_time_feedback_updates(request):
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)
 
+def _ai_matching_query(data):
+    """Learner profile and echoed search query for the AI matching endpoints, or None without a topic"""
+    topic = data.get('topic', '').strip()
+    if not topic:
+        return None, None
+    
+    level = data.get('level', 'beginner')
+    duration = data.get('duration', '60')
+    budget = data.get('budget', '')
+    urgency = data.get('urgency', 'flexible')
+    
+    # Create learner profile for matching
+    learner_profile = {
+        'skills': [topic.lower()],
+        'domain': topic.lower(),
+        'level': level,
+        'duration': int(duration) if str(duration).isdigit() else 60,
+        'budget': budget,
+        'urgency': urgency,
+        'preferred_times': []
+    }
+    search_query = {
+        'topic': topic,
+        'level': level,
+        'duration': duration,
+        'urgency': urgency
+    }
+    return learner_profile, search_query
+
+def _ai_mentor_match_data(match):
+    """Serialize one mentor match for the AI matching endpoints"""
+    mentor = match['mentor']
+    return {
+        'id': str(mentor.id),
+        'name': mentor.get_full_name() or mentor.username,
+        'username': mentor.username,
+        'profile_image': mentor.profile_image.url if mentor.profile_image else None,
+        'score': match['score'],
+        'match_reasons': match['match_reasons'],
+        'stats': match['stats'],
+        'availability': match['availability'],
+        'skills': mentor.skills or '',
+        'domain': getattr(mentor, 'domain', ''),
+        'profile_url': f'/mentors/{mentor.id}/profile/'
+    }
+
+def _ai_session_match_data(session):
+    """Serialize one session match for the AI matching endpoints"""
+    return {
+        'id': str(session.id),
+        'title': session.title,
+        'description': session.description,
+        'mentor_name': session.mentor.get_full_name() or session.mentor.username,
+        'schedule': session.schedule.isoformat(),
+        'duration': session.duration,
+        'price': float(session.price) if session.price else 0,
+        'category': session.category,
+        'skills': session.skills or '',
+        'available_spots': session.remaining_spots,
+        'session_url': f'/sessions/{session.id}/'
+    }
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def ai_matching_api(request):
     """AI-powered mentor and session matching"""
     try:
-        from .matching import get_mentor_recommendations, get_session_recommendations
+        learner_profile, search_query = _ai_matching_query(request.data)
         
-        data = request.data
-        topic = data.get('topic', '').strip()
-        level = data.get('level', 'beginner')
-        duration = data.get('duration', '60')
-        budget = data.get('budget', '')
-        urgency = data.get('urgency', 'flexible')
-        
-        if not topic:
+        if learner_profile is None:
             return Response({
                 'success': False,
                 'error': 'Topic is required for AI matching'
             }, status=400)
         
-        # Create learner profile for matching
-        learner_profile = {
-            'skills': [topic.lower()],
-            'domain': topic.lower(),
-            'level': level,
-            'duration': int(duration) if duration.isdigit() else 60,
-            'budget': budget,
-            'urgency': urgency,
-            'preferred_times': []
-        }
-        
         # Get mentor recommendations
-        mentor_matches = get_mentor_recommendations(learner_profile, max_results=5)
+        mentor_matches = get_mentor_recommendations(learner_profile, max_results=5, parallel=True)
         
         # Get session recommendations
         session_matches = get_session_recommendations(request.user, limit=5)
         
-        # Format mentor results
-        mentors_data = []
-        for match in mentor_matches:
-            mentor = match['mentor']
-            mentors_data.append({
-                'id': str(mentor.id),
-                'name': mentor.get_full_name() or mentor.username,
-                'username': mentor.username,
-                'profile_image': mentor.profile_image.url if mentor.profile_image else None,
-                'score': match['score'],
-                'match_reasons': match['match_reasons'],
-                'stats': match['stats'],
-                'availability': match['availability'],
-                'skills': mentor.skills or '',
-                'domain': getattr(mentor, 'domain', ''),
-                'profile_url': f'/mentors/{mentor.id}/profile/'
-            })
-        
-        # Format session results
-        sessions_data = []
-        for session in session_matches:
-            sessions_data.append({
-                'id': str(session.id),
-                'title': session.title,
-                'description': session.description,
-                'mentor_name': session.mentor.get_full_name() or session.mentor.username,
-                'schedule': session.schedule.isoformat(),
-                'duration': session.duration,
-                'price': float(session.price) if session.price else 0,
-                'category': session.category,
-                'skills': session.skills or '',
-                'available_spots': session.remaining_spots,
-                'session_url': f'/sessions/{session.id}/'
-            })
+        mentors_data = [_ai_mentor_match_data(match) for match in mentor_matches]
+        sessions_data = [_ai_session_match_data(session) for session in session_matches]
         
         return Response({
             'success': True,
             'data': {
                 'mentors': mentors_data,
                 'sessions': sessions_data,
-                'search_query': {
-                    'topic': topic,
-                    'level': level,
-                    'duration': duration,
-                    'urgency': urgency
-                }
+                'search_query': search_query
             },
             'message': f'Found {len(mentors_data)} mentors and {len(sessions_data)} sessions matching your criteria'
         })
@@ -3079,6 +3092,77 @@ def ai_matching_api(request):
             'error': f'AI matching failed: {str(e)}'
         }, status=500)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def ai_matching_stream_api(request):
+    """
+    AI matching as a stream of newline-delimited JSON events
+    
+    Emits a "query" event at once, a "mentor" event per mentor match as soon as
+    mentors are ranked, a "session" event per session match, then "done" (or
+    "error"), so the UI can render mentors before session matching finishes.
+    """
+    learner_profile, search_query = _ai_matching_query(request.data)
+    
+    if learner_profile is None:
+        return Response({
+            'success': False,
+            'error': 'Topic is required for AI matching'
+        }, status=400)
+    
+    user = request.user
+    
+    def events():
+        yield _ndjson_line({'type': 'query', 'search_query': search_query})
+        try:
+            mentor_count = session_count = 0
+            for match in get_mentor_recommendations(learner_profile, max_results=5, parallel=True):
+                mentor_count += 1
+                yield _ndjson_line({'type': 'mentor', 'mentor': _ai_mentor_match_data(match)})
+            
+            for session in get_session_recommendations(user, limit=5):
+                session_count += 1
+                yield _ndjson_line({'type': 'session', 'session': _ai_session_match_data(session)})
+            
+            yield _ndjson_line({
+                'type': 'done',
+                'message': f'Found {mentor_count} mentors and {session_count} sessions matching your criteria'
+            })
+        except Exception as e:
+            yield _ndjson_line({'type': 'error', 'error': f'AI matching failed: {str(e)}'})
+    
+    return _streaming_events_response(request, events())
+
+def _ndjson_line(event):
+    # DRF's encoder, so values render exactly as in the JSON endpoints
+    return json.dumps(event, cls=DRFJSONEncoder) + '\n'
+
+def _streaming_events_response(request, events):
+    """
+    Stream a synchronous event generator without buffering
+    
+    Under ASGI, Django would drain a plain generator into a list before sending
+    it, so each event is pulled on the sync thread and yielded asynchronously.
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        next_event = sync_to_async(next)
+        
+        async def stream():
+            while True:
+                event = await next_event(events, None)
+                if event is None:
+                    break
+                yield event
+        
+        content = stream()
+    else:
+        content = events
+    
+    response = StreamingHttpResponse(content, content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Keep proxies from holding events back
+    return response
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_admin_session_feedback(request):
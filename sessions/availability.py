@@ -0,0 +1,329 @@
+"""
+Mentor Availability Index
+Expands each mentor's weekly availability into concrete free slots over the matching
+window, minus their scheduled and live sessions, and keeps them as sorted interval
+arrays so overlap with a learner's preferred times costs a couple of binary searches
+per mentor instead of a query.
+
+User.availability maps days to time ranges in the mentor's own timezone:
+    {"monday": ["09:00-12:00", "14:00-18:00"], "sat": [["10:00", "13:00"]], "weekday": "evening"}
+
+Preferred times (Request.preferred_times, learner profiles) are a list of:
+    "2026-10-20T18:00/2026-10-20T20:00" or {"start": ..., "end": ...}   one-off ranges
+    "monday 18:00-21:00", "weekend", "weekday evening", "evening"        recurring slots
+"""
+
+import bisect
+import threading
+import time
+from datetime import datetime, timedelta, time as dt_time
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from recommendations.index_version import current_version, bump_version
+
+AVAILABILITY_VERSION_KEY = 'sessions_availability_version'
+REBUILD_INTERVAL = 900  # The window slides, so rebuild at least this often even without edits
+WINDOW = timedelta(days=7)  # Same look-ahead as the upcoming-session count
+MAX_SESSION_LENGTH = timedelta(days=1)  # How far back a still-running session can have started
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+DAY_GROUPS = {
+    'weekday': range(5),
+    'weekdays': range(5),
+    'weekend': (5, 6),
+    'weekends': (5, 6),
+    'daily': range(7),
+    'any': range(7),
+}
+DAY_PARTS = {
+    'morning': ('06:00', '12:00'),
+    'afternoon': ('12:00', '17:00'),
+    'evening': ('17:00', '21:00'),
+    'night': ('21:00', '24:00'),
+    'anytime': ('00:00', '24:00'),
+}
+
+
+def _get_zone(name):
+    try:
+        return ZoneInfo(name or 'UTC')
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo('UTC')
+
+
+def _parse_days(token):
+    """Weekday numbers for a day name, abbreviation or group, or None"""
+    token = token.strip().lower()
+    if token in DAY_GROUPS:
+        return list(DAY_GROUPS[token])
+    for number, name in enumerate(WEEKDAYS):
+        if token in (name, name[:3]):
+            return [number]
+    return None
+
+
+def _parse_clock(text):
+    """Minutes after midnight for "HH:MM" or "HH" (24:00 allowed)"""
+    hours, _, minutes = str(text).strip().partition(':')
+    value = int(hours) * 60 + int(minutes or 0)
+    if not 0 <= value <= 1440:
+        raise ValueError(f"Time out of range: {text}")
+    return value
+
+
+def _parse_range(value):
+    """(start, end) minutes for "09:00-12:00", ["09:00", "12:00"] or a day part name"""
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        start, end = value
+    elif str(value).strip().lower() in DAY_PARTS:
+        start, end = DAY_PARTS[str(value).strip().lower()]
+    else:
+        start, _, end = str(value).partition('-')
+    start, end = _parse_clock(start), _parse_clock(end)
+    if end <= start:
+        end += 1440  # Runs past midnight
+    return start, end
+
+
+def _is_clock_pair(value):
+    if not (isinstance(value, (list, tuple)) and len(value) == 2):
+        return False
+    try:
+        _parse_clock(value[0])
+        _parse_clock(value[1])
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+def parse_weekly_availability(availability):
+    """
+    Weekly windows from a User.availability dict
+
+    Returns:
+        List of (weekday, start minute, end minute); unreadable entries are skipped
+    """
+    windows = []
+    if not isinstance(availability, dict):
+        return windows
+
+    for day, ranges in availability.items():
+        days = _parse_days(str(day))
+        if days is None:
+            continue
+        if isinstance(ranges, str) or _is_clock_pair(ranges):
+            ranges = [ranges]
+        for value in ranges or []:
+            try:
+                start, end = _parse_range(value)
+            except (ValueError, TypeError):
+                continue
+            windows.extend((weekday, start, end) for weekday in days)
+    return windows
+
+
+def _parse_preferred_slot(text):
+    """Weekly windows for "monday 18:00-21:00", "weekend", "weekday evening", "evening"..."""
+    tokens = text.split()
+    if not tokens:
+        return []
+    days = _parse_days(tokens[0])
+    if days is None:
+        days = list(DAY_GROUPS['daily'])
+    else:
+        tokens = tokens[1:]
+    try:
+        start, end = _parse_range(' '.join(tokens)) if tokens else (0, 1440)
+    except (ValueError, TypeError):
+        return []
+    return [(weekday, start, end) for weekday in days]
+
+
+def _merge(intervals):
+    """Sort and merge (start, end) pairs into disjoint intervals"""
+    merged = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def _subtract(free, busy):
+    """Parts of the disjoint free intervals not covered by the disjoint busy ones"""
+    result = []
+    index = 0
+    for start, end in free:
+        while index < len(busy) and busy[index][1] <= start:
+            index += 1
+        cursor = start
+        scan = index
+        while scan < len(busy) and busy[scan][0] < end:
+            if busy[scan][0] > cursor:
+                result.append((cursor, busy[scan][0]))
+            cursor = max(cursor, busy[scan][1])
+            scan += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def expand_weekly(windows, zone, start, end):
+    """Concrete (start, end) epoch-second intervals for weekly windows between two datetimes"""
+    intervals = []
+    # Windows opening the day before can run past midnight into the range
+    day = start.astimezone(zone).date() - timedelta(days=1)
+    last_day = end.astimezone(zone).date()
+    lower, upper = start.timestamp(), end.timestamp()
+    while day <= last_day:
+        midnight = datetime.combine(day, dt_time(), tzinfo=zone)
+        for weekday, start_minute, end_minute in windows:
+            if weekday == day.weekday():
+                interval_start = (midnight + timedelta(minutes=start_minute)).timestamp()
+                interval_end = (midnight + timedelta(minutes=end_minute)).timestamp()
+                intervals.append((max(interval_start, lower), min(interval_end, upper)))
+        day += timedelta(days=1)
+    return _merge(intervals)
+
+
+def preferred_intervals(preferred_times, zone_name='UTC', start=None, end=None):
+    """
+    Learner's preferred times as disjoint epoch-second intervals within the window
+
+    Recurring slots are read in the learner's timezone; one-off ranges without
+    an offset are too. Unreadable entries are skipped.
+    """
+    start = start or timezone.now()
+    end = end or start + WINDOW
+    zone = _get_zone(zone_name)
+    lower, upper = start.timestamp(), end.timestamp()
+
+    weekly = []
+    intervals = []
+    for value in preferred_times or []:
+        if isinstance(value, dict):
+            bounds = (value.get('start'), value.get('end'))
+        elif isinstance(value, str) and '/' in value:
+            bounds = tuple(value.split('/', 1))
+        elif isinstance(value, str):
+            weekly.extend(_parse_preferred_slot(value))
+            continue
+        else:
+            continue
+
+        moments = [parse_datetime(str(bound).strip()) if bound else None for bound in bounds]
+        if None in moments:
+            continue
+        moments = [moment if timezone.is_aware(moment) else moment.replace(tzinfo=zone) for moment in moments]
+        intervals.append((max(moments[0].timestamp(), lower), min(moments[1].timestamp(), upper)))
+
+    if weekly:
+        intervals.extend(expand_weekly(weekly, zone, start, end))
+    return _merge(intervals)
+
+
+class MentorCalendar:
+    """A mentor's free time as sorted disjoint intervals with running totals"""
+
+    __slots__ = ('starts', 'ends', 'prefix')
+
+    def __init__(self, intervals):
+        self.starts = [start for start, _ in intervals]
+        self.ends = [end for _, end in intervals]
+        self.prefix = [0]
+        for start, end in intervals:
+            self.prefix.append(self.prefix[-1] + end - start)
+
+    def overlap(self, start, end):
+        """Free seconds inside [start, end)"""
+        first = bisect.bisect_right(self.ends, start)
+        stop = bisect.bisect_left(self.starts, end)
+        if first >= stop:
+            return 0
+        total = self.prefix[stop] - self.prefix[first]
+        total -= max(0, start - self.starts[first])
+        total -= max(0, self.ends[stop - 1] - end)
+        return total
+
+
+class AvailabilityIndex:
+    """Free-slot calendars for every verified mentor who has published availability"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.built_at = 0
+        self.calendars = {}  # mentor id -> MentorCalendar
+
+    def build(self, version):
+        """Expand every mentor's weekly availability and carve out their sessions"""
+        from django.contrib.auth import get_user_model
+        from .models import Session
+
+        User = get_user_model()
+        start = timezone.now()
+        end = start + WINDOW + timedelta(seconds=REBUILD_INTERVAL)
+
+        free = {}
+        for mentor_id, availability, zone_name in User.objects.filter(
+            role='mentor', is_active=True, is_verified=True
+        ).values_list('id', 'availability', 'timezone'):
+            windows = parse_weekly_availability(availability)
+            if windows:
+                free[mentor_id] = expand_weekly(windows, _get_zone(zone_name), start, end)
+
+        busy = {}
+        for mentor_id, schedule, duration in Session.objects.filter(
+            mentor_id__in=list(free),
+            status__in=['scheduled', 'live'],
+            schedule__gte=start - MAX_SESSION_LENGTH,
+            schedule__lt=end
+        ).values_list('mentor_id', 'schedule', 'duration'):
+            session_start = schedule.timestamp()
+            busy.setdefault(mentor_id, []).append((session_start, session_start + (duration or 0) * 60))
+
+        calendars = {
+            mentor_id: MentorCalendar(_subtract(intervals, _merge(busy.get(mentor_id, []))))
+            for mentor_id, intervals in free.items()
+        }
+
+        with self.lock:
+            self.calendars = calendars
+            self.version = version
+            self.built_at = time.monotonic()
+
+    def has_calendar(self, mentor_id):
+        return mentor_id in self.calendars
+
+    def free_minutes(self, mentor_id, intervals):
+        """
+        Minutes of the mentor's free time inside the given disjoint intervals
+
+        Returns None for mentors who have not published availability.
+        """
+        calendar = self.calendars.get(mentor_id)
+        if calendar is None:
+            return None
+        return sum(calendar.overlap(start, end) for start, end in intervals) / 60
+
+
+_availability_index = AvailabilityIndex()
+
+
+def get_availability_index():
+    """Return the process-wide index, rebuilding it after an edit in any process or as the window slides"""
+    version = current_version(AVAILABILITY_VERSION_KEY)
+    if (_availability_index.version != version or
+            time.monotonic() - _availability_index.built_at > REBUILD_INTERVAL):
+        _availability_index.build(version)
+    return _availability_index
+
+
+def publish_change():
+    """Mark the index stale everywhere after availability or a session schedule changed"""
+    bump_version(AVAILABILITY_VERSION_KEY)
@@ -2,6 +2,7 @@ import json
 import uuid
 import asyncio
 import logging
+import time
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
@@ -10,10 +11,25 @@ from datetime import datetime
 from django.core.cache import cache
 from django.db.models import Q
 from .models import Session, RoomToken, SessionParticipant
+from .activity import activity_tracker
+from .room_levels import room_levels
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+CONNECTION_TIMEOUT = 300  # Refreshed every ping, so only connections that went away expire
+ICE_BATCH_WINDOW = 0.01  # Seconds candidates for the same peer are held to go out as one message
+MAX_ICE_BATCH = 50
+AUDIO_LEVEL_INTERVAL = 0.2  # At most 5 audio level updates a second per participant
+AUDIO_LEVEL_CHANGE = 0.1  # Relative change in level that is worth passing on
+NETWORK_WRITE_INTERVAL = 60  # Seconds between stored network metrics while the quality holds
+
+
+def connection_cache_key(user_id, session_id):
+    """Cache key of a user's live connection to a session, used to route signaling to their channel"""
+    return f'user_connection_{user_id}_{session_id}'
+
+
 class SessionConsumer(AsyncWebsocketConsumer):
     """Enhanced WebSocket consumer for WebRTC signaling and session updates with Zoom-like features"""
     
@@ -23,6 +39,15 @@ class SessionConsumer(AsyncWebsocketConsumer):
         self.user = self.scope['user']
         self.user_id = str(self.user.id)
         self.connection_id = str(uuid.uuid4())
+        # Loaded once by verify_session_access and mark_user_joined
+        self.session = None
+        self.participant_id = None
+        self.peer_channels = {}  # user id -> channel name, learned from join notifications
+        self.pending_candidates = {}  # target user id (None for everyone) -> ICE candidates to forward
+        self.candidate_timers = {}  # target user id -> task forwarding its pending candidates
+        self.monitor_task = None
+        self.last_audio_level = None  # (level, quality, monotonic time) last passed on
+        self.last_network_write = None  # (quality, monotonic time) last stored
         
         logger.info(f"User {self.user_id} ({self.user.username}) attempting to connect to session {self.session_id}")
         
@@ -45,10 +70,13 @@ class SessionConsumer(AsyncWebsocketConsumer):
         )
         
         await self.accept()
+        await self.register_connection()
         logger.info(f"User {self.user_id} ({self.user.username}) successfully connected to session {self.session_id}")
         
         # Mark user as active participant
         await self.mark_user_joined()
+        activity_tracker.start()
+        room_levels.start()
         
         # Send current session state
         session_data = await self.send_session_state()
@@ -71,18 +99,33 @@ class SessionConsumer(AsyncWebsocketConsumer):
                 'username': self.user.username,
                 'is_mentor': getattr(self.user, 'is_mentor', False),
                 'connection_id': self.connection_id,
+                'channel_name': self.channel_name,
                 'join_time': timezone.now().isoformat(),
             }
         )
         
         # Start connection monitoring
-        asyncio.create_task(self.monitor_connection())
+        self.monitor_task = asyncio.create_task(self.monitor_connection())
     
     async def disconnect(self, close_code):
         logger.info(f"User {self.user_id} disconnecting from session {self.session_id} with code {close_code}")
         
-        # Mark user as left
-        await self.mark_user_left()
+        # Stop monitoring so it cannot re-register this channel after it is gone
+        if self.monitor_task is not None:
+            self.monitor_task.cancel()
+        room_levels.remove(self.session_group_name, self.user_id)
+        
+        # Forward candidates still waiting for their batch while peers can be reached
+        for target_user in list(self.pending_candidates):
+            try:
+                await self.flush_ice_candidates(target_user)
+            except Exception as e:
+                logger.error(f"Error forwarding ICE candidates from user {self.user_id}: {e}")
+        
+        if self.participant_id is not None:
+            # Write any activity still waiting for the next batch, then mark user as left
+            await activity_tracker.flush_async([self.participant_id])
+            await self.mark_user_left()
         
         # Notify others that user left
         await self.channel_layer.group_send(
@@ -92,6 +135,7 @@ class SessionConsumer(AsyncWebsocketConsumer):
                 'user_id': self.user_id,
                 'username': self.user.username,
                 'connection_id': self.connection_id,
+                'channel_name': self.channel_name,
                 'leave_time': timezone.now().isoformat(),
                 'reason': self._get_disconnect_reason(close_code),
             }
@@ -103,8 +147,10 @@ class SessionConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         
-        # Clean up cache entries
-        cache.delete(f'user_connection_{self.user_id}_{self.session_id}')
+        # Clean up cache entries, unless a newer connection of the same user replaced ours
+        connection = await cache.aget(connection_cache_key(self.user_id, self.session_id))
+        if connection and connection.get('channel_name') == self.channel_name:
+            await cache.adelete(connection_cache_key(self.user_id, self.session_id))
         
         logger.info(f"User {self.user_id} disconnected from session {self.session_id}")
     
@@ -115,14 +161,15 @@ class SessionConsumer(AsyncWebsocketConsumer):
             
             logger.debug(f"Received {message_type} from user {self.user_id} in session {self.session_id}")
             
-            # Update last activity
-            await self.update_last_activity()
+            # Update last activity (written in batches)
+            activity_tracker.touch(self.participant_id)
             
             # Route message to appropriate handler
             message_handlers = {
                 'webrtc_offer': self.handle_webrtc_offer,
                 'webrtc_answer': self.handle_webrtc_answer,
                 'ice_candidate': self.handle_ice_candidate,
+                'ice_candidates': self.handle_ice_candidates,
                 'chat_message': self.handle_chat_message,
                 'ready_check': self.handle_ready_check,
                 'network_quality': self.handle_network_quality,
@@ -163,12 +210,15 @@ class SessionConsumer(AsyncWebsocketConsumer):
             await self.send_error("Invalid offer data")
             return
         
+        # Candidates gathered before this offer must reach the peer first
+        await self.flush_ice_candidates(target_user)
+        
         # Store offer in cache for reliability
         cache_key = f'webrtc_offer_{self.user_id}_{target_user or "broadcast"}_{self.session_id}'
         cache.set(cache_key, data.get('offer'), timeout=300)  # 5 minutes
         
-        await self.channel_layer.group_send(
-            self.session_group_name,
+        await self.send_signal(
+            target_user,
             {
                 'type': 'webrtc_signal',
                 'signal_type': 'offer',
@@ -190,12 +240,14 @@ class SessionConsumer(AsyncWebsocketConsumer):
             await self.send_error("Invalid answer data")
             return
         
+        await self.flush_ice_candidates(target_user)
+        
         # Store answer in cache
         cache_key = f'webrtc_answer_{self.user_id}_{target_user}_{self.session_id}'
         cache.set(cache_key, data.get('answer'), timeout=300)
         
-        await self.channel_layer.group_send(
-            self.session_group_name,
+        await self.send_signal(
+            target_user,
             {
                 'type': 'webrtc_signal',
                 'signal_type': 'answer',
@@ -210,26 +262,70 @@ class SessionConsumer(AsyncWebsocketConsumer):
         logger.info(f"WebRTC answer sent from {self.user_id} to {target_user} in session {self.session_id}")
 
     async def handle_ice_candidate(self, data):
-        """Forward ICE candidate to specific peer"""
-        target_user = data.get('to_user')
+        """Queue an ICE candidate for a specific peer"""
         candidate = data.get('candidate')
         
         if not candidate:
             await self.send_error("Invalid ICE candidate")
             return
         
-        await self.channel_layer.group_send(
-            self.session_group_name,
-            {
-                'type': 'webrtc_signal',
-                'signal_type': 'ice_candidate',
-                'candidate': candidate,
-                'from_user': self.user_id,
-                'to_user': target_user,
-                'connection_id': self.connection_id,
-                'timestamp': timezone.now().isoformat(),
-            }
-        )
+        await self.queue_ice_candidates(data.get('to_user'), [candidate])
+
+    async def handle_ice_candidates(self, data):
+        """Queue a batch of ICE candidates gathered by the client for a specific peer"""
+        candidates = data.get('candidates')
+        
+        if not isinstance(candidates, list) or not candidates or not all(candidates):
+            await self.send_error("Invalid ICE candidates")
+            return
+        
+        await self.queue_ice_candidates(data.get('to_user'), candidates)
+
+    async def queue_ice_candidates(self, target_user, candidates):
+        """
+        Hold candidates briefly so a burst for the same peer is forwarded as one message
+
+        The first candidate for a peer starts a short timer; everything queued for that
+        peer before it fires goes out together.
+        """
+        pending = self.pending_candidates.get(target_user)
+        if pending is None:
+            pending = self.pending_candidates[target_user] = []
+            self.candidate_timers[target_user] = asyncio.create_task(self._flush_ice_candidates_later(target_user))
+        pending.extend(candidates)
+        
+        if len(pending) >= MAX_ICE_BATCH:
+            await self.flush_ice_candidates(target_user)
+
+    async def _flush_ice_candidates_later(self, target_user):
+        await asyncio.sleep(ICE_BATCH_WINDOW)
+        try:
+            await self.flush_ice_candidates(target_user)
+        except Exception as e:
+            logger.error(f"Error forwarding ICE candidates from user {self.user_id}: {e}")
+
+    async def flush_ice_candidates(self, target_user):
+        """Forward the candidates queued for a peer: a lone one as before, several as one batch"""
+        timer = self.candidate_timers.pop(target_user, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        candidates = self.pending_candidates.pop(target_user, None)
+        if not candidates:
+            return
+        
+        event = {
+            'type': 'webrtc_signal',
+            'from_user': self.user_id,
+            'to_user': target_user,
+            'connection_id': self.connection_id,
+            'timestamp': timezone.now().isoformat(),
+        }
+        if len(candidates) == 1:
+            event.update(signal_type='ice_candidate', candidate=candidates[0])
+        else:
+            event.update(signal_type='ice_candidates', candidates=candidates)
+        
+        await self.send_signal(target_user, event)
 
     async def handle_chat_message(self, data):
         """Handle chat messages during session with enhanced features"""
@@ -295,22 +391,36 @@ class SessionConsumer(AsyncWebsocketConsumer):
         latency = data.get('latency', 0.0)
         bandwidth = data.get('bandwidth', 0.0)
         
-        # Update network metrics in database
-        await self.update_network_metrics(quality, packet_loss, latency, bandwidth)
-        
-        await self.channel_layer.group_send(
-            self.session_group_name,
-            {
-                'type': 'network_quality_update',
-                'user_id': self.user_id,
-                'username': self.user.username,
-                'quality': quality,
-                'packet_loss': packet_loss,
-                'latency': latency,
-                'bandwidth': bandwidth,
-                'timestamp': timezone.now().isoformat(),
-            }
+        # Metrics ride along with the room's next levels snapshot
+        room_levels.update(
+            self.session_group_name, self.user_id,
+            network_quality=quality, packet_loss=packet_loss, latency=latency, bandwidth=bandwidth
         )
+        
+        now = time.monotonic()
+        previous = self.last_network_write
+        quality_changed = previous is None or previous[0] != quality
+        
+        # Store metrics when the quality changes, otherwise only now and then
+        if quality_changed or now - previous[1] >= NETWORK_WRITE_INTERVAL:
+            await self.update_network_metrics(quality, packet_loss, latency, bandwidth)
+            self.last_network_write = (quality, now)
+        
+        # Only a change of quality is announced right away
+        if quality_changed:
+            await self.channel_layer.group_send(
+                self.session_group_name,
+                {
+                    'type': 'network_quality_update',
+                    'user_id': self.user_id,
+                    'username': self.user.username,
+                    'quality': quality,
+                    'packet_loss': packet_loss,
+                    'latency': latency,
+                    'bandwidth': bandwidth,
+                    'timestamp': timezone.now().isoformat(),
+                }
+            )
 
     async def handle_connection_test(self, data):
         """Handle connection test requests"""
@@ -348,7 +458,7 @@ class SessionConsumer(AsyncWebsocketConsumer):
         username = self.user.username
         
         # Update last activity
-        await self.update_last_activity()
+        activity_tracker.touch(self.participant_id)
         
         # Broadcast live assurance to other participants
         await self.channel_layer.group_send(
@@ -431,6 +541,7 @@ class SessionConsumer(AsyncWebsocketConsumer):
                 'user_id': self.user_id,
                 'username': self.user.username,
                 'is_mentor': self.user.is_mentor,
+                'channel_name': self.channel_name,
                 'join_time': timezone.now().isoformat(),
             }
         )
@@ -449,22 +560,24 @@ class SessionConsumer(AsyncWebsocketConsumer):
                 pass
 
     async def handle_audio_level(self, data):
-        """Handle audio level updates from participants"""
+        """Record audio level updates for the room's next levels snapshot, dropping ticks too soon or too small to notice"""
         level = data.get('level', 0)
         quality = data.get('quality', 'Silent')
+        now = time.monotonic()
         
-        # Broadcast audio level to other participants
-        await self.channel_layer.group_send(
-            self.session_group_name,
-            {
-                'type': 'audio_level_update',
-                'user_id': self.user_id,
-                'username': self.user.username,
-                'level': level,
-                'quality': quality,
-                'timestamp': timezone.now().isoformat(),
-            }
-        )
+        if self.last_audio_level is not None:
+            last_level, last_quality, last_time = self.last_audio_level
+            if now - last_time < AUDIO_LEVEL_INTERVAL:
+                return
+            try:
+                small_change = abs(level - last_level) <= AUDIO_LEVEL_CHANGE * max(abs(level), abs(last_level))
+            except TypeError:
+                small_change = False
+            if quality == last_quality and small_change:
+                return
+        
+        self.last_audio_level = (level, quality, now)
+        room_levels.update(self.session_group_name, self.user_id, level=level, quality=quality)
 
     async def handle_get_session_state(self, data):
         """Handle request for current session state"""
@@ -499,16 +612,40 @@ class SessionConsumer(AsyncWebsocketConsumer):
             'timestamp': timezone.now().isoformat(),
         }))
 
+    async def register_connection(self):
+        """Record this connection's channel so peers can signal it directly"""
+        await cache.aset(connection_cache_key(self.user_id, self.session_id), {
+            'last_seen': timezone.now().isoformat(),
+            'connection_id': self.connection_id,
+            'channel_name': self.channel_name
+        }, timeout=CONNECTION_TIMEOUT)
+
+    async def send_signal(self, target_user, event):
+        """
+        Deliver a signaling event to the target user's channel only
+
+        Without a target, or when the target's channel is unknown, the event goes to
+        the whole session group and each consumer keeps only what is addressed to it.
+        """
+        channel_name = None
+        if target_user:
+            channel_name = self.peer_channels.get(target_user)
+            if channel_name is None:
+                connection = await cache.aget(connection_cache_key(target_user, self.session_id))
+                if connection:
+                    channel_name = self.peer_channels[target_user] = connection['channel_name']
+        
+        if channel_name:
+            await self.channel_layer.send(channel_name, event)
+        else:
+            await self.channel_layer.group_send(self.session_group_name, event)
+
     async def monitor_connection(self):
         """Monitor connection quality and send periodic updates"""
         while True:
             try:
-                # Update connection status in cache
-                cache.set(f'user_connection_{self.user_id}_{self.session_id}', {
-                    'last_seen': timezone.now().isoformat(),
-                    'connection_id': self.connection_id,
-                    'channel_name': self.channel_name
-                }, timeout=300)
+                # Keep this connection's routing entry from expiring
+                await self.register_connection()
                 
                 # Send periodic ping
                 await self.send(text_data=json.dumps({
@@ -537,206 +674,146 @@ class SessionConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def verify_session_access(self):
-        """Verify if user has access to this session with enhanced checks"""
-        try:
-            session = Session.objects.get(id=self.session_id)
-            
-            # Check if user is mentor
-            if session.mentor == self.user:
-                return True
-            
-            # Check if user has a valid booking
-            from .models import Booking
-            valid_statuses = ['confirmed', 'booked', 'attended']
-            
-            booking = Booking.objects.filter(
-                session=session, 
-                learner=self.user,
-                status__in=valid_statuses
-            ).first()
-            
-            if booking:
-                return True
-            
-            # Allow access if session is live and user has any booking history
-            if session.status == 'live':
-                has_any_booking = Booking.objects.filter(
-                    session=session, 
-                    learner=self.user
-                ).exists()
-                return has_any_booking
-            
-            return False
-            
-        except Session.DoesNotExist:
+        """Verify if user has access to this session, keeping the session for the rest of the connection"""
+        session = Session.objects.filter(id=self.session_id).only('id', 'title', 'status', 'mentor_id').first()
+        if session is None:
             return False
+        self.session = session
+        
+        # Check if user is mentor
+        if session.mentor_id == self.user.id:
+            return True
+        
+        # Check if user has a valid booking
+        from .models import Booking
+        valid_statuses = ['confirmed', 'booked', 'attended']
+        
+        if Booking.objects.filter(session_id=session.id, learner=self.user, status__in=valid_statuses).exists():
+            return True
+        
+        # Allow access if session is live and user has any booking history
+        if session.status == 'live':
+            return Booking.objects.filter(session_id=session.id, learner=self.user).exists()
+        
+        return False
 
     @database_sync_to_async
     def mark_user_joined(self):
-        """Mark user as joined to session with enhanced tracking"""
-        try:
-            session = Session.objects.get(id=self.session_id)
-            
-            # Remove any existing disconnected participants for this user first
-            SessionParticipant.objects.filter(
-                session=session,
-                user=self.user,
-                connection_status='disconnected'
-            ).delete()
-            
-            participant, created = SessionParticipant.objects.get_or_create(
-                session=session,
-                user=self.user,
-                defaults={
-                    'is_mentor': self.user.is_mentor,
-                    'connection_status': 'connected',
-                    'joined_at': timezone.now()
-                }
+        """Mark user as joined to session, keeping the participant id for later updates"""
+        # Remove any existing disconnected participants for this user first
+        SessionParticipant.objects.filter(
+            session_id=self.session.id,
+            user=self.user,
+            connection_status='disconnected'
+        ).delete()
+        
+        now = timezone.now()
+        participant, created = SessionParticipant.objects.get_or_create(
+            session_id=self.session.id,
+            user=self.user,
+            defaults={
+                'is_mentor': self.user.is_mentor,
+                'connection_status': 'connected',
+                'joined_at': now
+            }
+        )
+        self.participant_id = participant.pk
+        
+        if not created:
+            # Update existing participant record
+            SessionParticipant.objects.filter(pk=self.participant_id).update(
+                joined_at=now,
+                left_at=None,
+                connection_status='connected',
+                last_activity=now
             )
-            
-            if not created:
-                # Update existing participant record
-                participant.joined_at = timezone.now()
-                participant.left_at = None
-                participant.connection_status = 'connected'
-                if participant.connection_status == 'disconnected':
-                    participant.reconnection_count += 1
-                participant.save()
-                logger.info(f"User {self.user_id} reconnected to session {self.session_id}")
-            else:
-                logger.info(f"User {self.user_id} joined session {self.session_id} for the first time")
-                
-            # Note: current_participants is a property that auto-calculates
-            logger.info(f"Session {self.session_id} now has {session.current_participants} active participants")
-                
-        except Session.DoesNotExist:
-            logger.error(f"Session {self.session_id} not found when marking user joined")
+            logger.info(f"User {self.user_id} reconnected to session {self.session_id}")
+        else:
+            logger.info(f"User {self.user_id} joined session {self.session_id} for the first time")
 
     @database_sync_to_async
     def update_network_metrics(self, quality: str, packet_loss: float, latency: float, bandwidth: float):
         """Update network quality metrics"""
-        try:
-            session = Session.objects.get(id=self.session_id)
-            participant = SessionParticipant.objects.get(session=session, user=self.user)
-            
-            participant.network_quality = quality
-            participant.packet_loss = packet_loss
-            participant.latency = latency
-            participant.bandwidth = bandwidth
-            participant.save()
-            
-        except (Session.DoesNotExist, SessionParticipant.DoesNotExist):
+        updated = SessionParticipant.objects.filter(pk=self.participant_id).update(
+            network_quality=quality,
+            packet_loss=packet_loss,
+            latency=latency,
+            bandwidth=bandwidth,
+            last_activity=timezone.now()
+        )
+        if not updated:
             logger.error(f"Could not update network metrics for user {self.user_id} in session {self.session_id}")
 
     @database_sync_to_async
     def get_active_participants(self):
         """Get list of active participants"""
-        try:
-            session = Session.objects.get(id=self.session_id)
-            participants = SessionParticipant.objects.filter(
-                session=session,
-                left_at__isnull=True,
-                connection_status='connected'
-            ).select_related('user')
-            
-            return [
-                {
-                    'user_id': str(p.user.id),
-                    'username': p.user.username,
-                    'is_mentor': p.is_mentor,
-                    'connection_status': p.connection_status,
-                    'network_quality': p.network_quality,
-                }
-                for p in participants
-            ]
-            
-        except Session.DoesNotExist:
-            return []
+        participants = SessionParticipant.objects.filter(
+            session_id=self.session_id,
+            left_at__isnull=True,
+            connection_status='connected'
+        ).select_related('user')
+        
+        return [
+            {
+                'user_id': str(p.user.id),
+                'username': p.user.username,
+                'is_mentor': p.is_mentor,
+                'connection_status': p.connection_status,
+                'network_quality': p.network_quality,
+            }
+            for p in participants
+        ]
 
     @database_sync_to_async
     def mark_user_left(self):
         """Mark user as left from session"""
-        try:
-            session = Session.objects.get(id=self.session_id)
-            participant = SessionParticipant.objects.filter(
-                session=session,
-                user=self.user
-            ).first()
-            
-            if participant:
-                participant.left_at = timezone.now()
-                participant.connection_status = 'disconnected'
-                participant.save()
-                
-            # Note: current_participants property auto-calculates
-            logger.info(f"User {self.user_id} left session {self.session_id}. Active participants: {session.current_participants}")
-                
-        except Session.DoesNotExist:
-            logger.error(f"Session {self.session_id} not found when marking user left")
+        now = timezone.now()
+        SessionParticipant.objects.filter(pk=self.participant_id).update(
+            left_at=now,
+            connection_status='disconnected',
+            last_activity=now
+        )
+        
+        logger.info(f"User {self.user_id} left session {self.session_id}")
 
     @database_sync_to_async
     def update_participant_ready_status(self, is_ready: bool):
-        """Update participant ready status"""
-        try:
-            session = Session.objects.get(id=self.session_id)
-            participant = SessionParticipant.objects.get(session=session, user=self.user)
-            participant.is_ready = is_ready
-            participant.save()
-        except (Session.DoesNotExist, SessionParticipant.DoesNotExist):
-            logger.error(f"Could not update ready status for user {self.user_id} in session {self.session_id}")
+        """Record a learner's ready status on their booking, where the dashboards read it"""
+        from .models import Booking
+        Booking.objects.filter(session_id=self.session.id, learner=self.user).update(is_ready=is_ready)
 
     @database_sync_to_async
     def send_session_state(self):
         """Send current session state to user"""
-        try:
-            session = Session.objects.get(id=self.session_id)
-            participants = SessionParticipant.objects.filter(
-                session=session,
-                left_at__isnull=True
-            ).select_related('user')
-            
-            session_data = {
-                'session_id': str(session.id),
-                'title': session.title,
-                'status': session.status,
-                'participants': [
-                    {
-                        'user_id': str(p.user.id),
-                        'username': p.user.username,
-                        'is_mentor': p.is_mentor,
-                        'is_ready': getattr(p, 'is_ready', False),
-                        'connection_status': p.connection_status,
-                        'network_quality': p.network_quality,
-                    }
-                    for p in participants if p.user != self.user
-                ]
-            }
-            
-            return session_data
-            
-        except Session.DoesNotExist:
-            return {}
-
-    @database_sync_to_async
-    def update_last_activity(self):
-        """Update user's last activity timestamp"""
-        try:
-            session = Session.objects.get(id=self.session_id)
-            participant = SessionParticipant.objects.filter(
-                session=session,
-                user=self.user
-            ).first()
-            
-            if participant:
-                participant.last_activity = timezone.now()
-                participant.save()
-                
-        except Session.DoesNotExist:
-            pass
+        participants = SessionParticipant.objects.filter(
+            session_id=self.session.id,
+            left_at__isnull=True
+        ).select_related('user')
+        
+        session_data = {
+            'session_id': str(self.session.id),
+            'title': self.session.title,
+            'status': self.session.status,
+            'participants': [
+                {
+                    'user_id': str(p.user.id),
+                    'username': p.user.username,
+                    'is_mentor': p.is_mentor,
+                    'is_ready': getattr(p, 'is_ready', False),
+                    'connection_status': p.connection_status,
+                    'network_quality': p.network_quality,
+                }
+                for p in participants if p.user_id != self.user.id
+            ]
+        }
+        
+        return session_data
 
     # Group message handlers
     async def user_joined(self, event):
         """Send user joined notification"""
+        if event.get('channel_name'):
+            self.peer_channels[event['user_id']] = event['channel_name']
         await self.send(text_data=json.dumps({
             'type': 'user_joined',
             'user_id': event['user_id'],
@@ -747,6 +824,8 @@ class SessionConsumer(AsyncWebsocketConsumer):
     
     async def user_left(self, event):
         """Send user left notification"""
+        if self.peer_channels.get(event['user_id']) == event.get('channel_name'):
+            self.peer_channels.pop(event['user_id'], None)
         await self.send(text_data=json.dumps({
             'type': 'user_left',
             'user_id': event['user_id'],
@@ -858,6 +937,14 @@ class SessionConsumer(AsyncWebsocketConsumer):
             'timestamp': event['timestamp'],
         }))
 
+    async def levels_snapshot(self, event):
+        """Send the room's latest audio levels and network metrics"""
+        await self.send(text_data=json.dumps({
+            'type': 'levels_snapshot',
+            'levels': event['levels'],
+            'timestamp': event['timestamp'],
+        }))
+
     async def mentor_ready(self, event):
         """Handle mentor ready status - FIXED: Added missing handler"""
         await self.send(text_data=json.dumps({
@@ -870,6 +957,7 @@ class SessionConsumer(AsyncWebsocketConsumer):
 
     async def session_started(self, event):
         """Handle session started notification"""
+        self.session.status = 'live'
         await self.send(text_data=json.dumps({
             'type': 'session_started',
             'session_id': event['session_id'],
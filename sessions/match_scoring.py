@@ -0,0 +1,189 @@
+"""
+Mentor Match Scoring Functions
+Pure scoring over plain-data mentor records, shared by MentorMatchingEngine's
+in-process path and its process-pool workers. Nothing here touches Django, so
+records and contexts pickle cleanly and workers start without app setup.
+
+A mentor record is a dict with: id, skills (set of lowercase names), domain,
+hourly_rate, hours_since_active (None if unknown), avg_rating,
+completed_sessions, upcoming_sessions and free_minutes (free time in the
+learner's preferred slots, None without a calendar or preferred times).
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+
+def skills_score(mentor_skills: set, required_skills: set, related_matches: float, skill_weights: Dict) -> float:
+    """Calculate skill matching score"""
+
+    if not required_skills:
+        return 0
+
+    exact_matches = len(mentor_skills.intersection(required_skills))
+
+    score = (exact_matches * skill_weights['exact_match'] +
+             related_matches * skill_weights['related_match'])
+
+    # Normalize by number of required skills
+    return min(score / len(required_skills) * 2, 25)
+
+
+def related_score(mentor_skills: set, related_by_required: Dict) -> float:
+    """
+    Sum over required skills of the strongest relation to any mentor skill
+
+    related_by_required maps each required skill to its {related skill: weight}
+    closure from the skill graph.
+    """
+    score = 0.0
+    for related in related_by_required.values():
+        if related:
+            score += max((related.get(skill, 0) for skill in mentor_skills), default=0)
+    return score
+
+
+def domain_score(learner_domain: str, mentor_domain: str, skill_weights: Dict) -> float:
+    """Calculate domain expertise matching"""
+
+    if learner_domain and mentor_domain:
+        if learner_domain == mentor_domain:
+            return skill_weights['domain_match']
+        elif learner_domain in mentor_domain or mentor_domain in learner_domain:
+            return skill_weights['domain_match'] * 0.7
+
+    return 0
+
+
+def availability_score(upcoming_sessions: int, urgency: str, availability_weights: Dict,
+                       free_minutes: Optional[float] = None, needed_minutes: float = 60) -> float:
+    """Calculate availability matching score"""
+
+    if free_minutes is None:
+        # Lower session count = better availability
+        availability_factor = max(0, 10 - upcoming_sessions)
+    else:
+        # Share of the requested time the mentor has free in the learner's preferred slots
+        availability_factor = 10 * min(free_minutes, needed_minutes) / needed_minutes
+
+    # Urgency matching
+    urgency_score = availability_weights.get(urgency, 4)
+
+    return (availability_factor + urgency_score) / 2
+
+
+def max_availability_score(urgency: str, availability_weights: Dict) -> float:
+    """Best availability score any mentor can get (no upcoming sessions)"""
+    return (10 + availability_weights.get(urgency, 4)) / 2
+
+
+def rating_score(avg_rating: float, completed_sessions: int, rating_weights: Dict) -> float:
+    """Calculate rating and reputation score"""
+
+    rating_boost = (avg_rating / 5) * rating_weights['rating_boost']
+    session_boost = min(completed_sessions / 10, 1) * rating_weights['session_count_boost']
+
+    return rating_boost + session_boost
+
+
+def parse_max_budget(learner_budget) -> Optional[int]:
+    """Upper end of a budget like "₹500-1000" or "500", or None if absent or unparseable"""
+
+    if not learner_budget:
+        return None
+
+    try:
+        if '-' in str(learner_budget):
+            budget_range = [int(x.strip('₹').strip()) for x in str(learner_budget).split('-')]
+            return max(budget_range)
+        return int(str(learner_budget).strip('₹').strip())
+    except (ValueError, TypeError):
+        return None
+
+
+def price_score(learner_budget, mentor_rate) -> float:
+    """Calculate price compatibility score"""
+
+    max_budget = parse_max_budget(learner_budget)
+    if max_budget is None or not mentor_rate:
+        return 5  # Neutral score
+
+    if mentor_rate <= max_budget:
+        return 10  # Perfect price match
+    elif mentor_rate <= max_budget * 1.2:
+        return 7   # Slightly over budget
+    elif mentor_rate <= max_budget * 1.5:
+        return 4   # Moderately over budget
+    else:
+        return 1   # Significantly over budget
+
+
+def activity_score(hours_since_active: Optional[float]) -> float:
+    """Calculate recent activity boost"""
+
+    if hours_since_active is not None:
+        if hours_since_active < 1:
+            return 5  # Very recently active
+        elif hours_since_active < 24:
+            return 3  # Active today
+        elif hours_since_active < 168:  # 1 week
+            return 1  # Active this week
+
+    return 0
+
+
+def score_mentor(record: Dict, context: Dict, min_score: float = None) -> Optional[float]:
+    """
+    Comprehensive matching score for one mentor record
+
+    With min_score set, returns None when the mentor's upper bound (everything
+    else plus the best possible availability score) cannot exceed it.
+    """
+    skill_weights = context['skill_weights']
+
+    # 1. Skills matching
+    related_matches = related_score(record['skills'], context['related_by_required'])
+    skills = skills_score(record['skills'], context['required_skills'], related_matches, skill_weights)
+
+    # 2. Domain matching
+    domain = domain_score(context['learner_domain'], record['domain'], skill_weights)
+
+    # 3. Rating and experience boost
+    rating = rating_score(record['avg_rating'], record['completed_sessions'], context['rating_weights'])
+
+    # 4. Price compatibility
+    price = price_score(context['budget'], record['hourly_rate'])
+
+    # 5. Recent activity boost
+    activity = activity_score(record['hours_since_active'])
+
+    # 6. Availability matching only if it can matter
+    if min_score is not None:
+        upper_bound = (skills + domain + rating + price + activity +
+                       max_availability_score(context['urgency'], context['availability_weights']))
+        if upper_bound <= min_score:
+            return None
+    availability = availability_score(
+        record['upcoming_sessions'], context['urgency'], context['availability_weights'],
+        record['free_minutes'], context['needed_minutes']
+    )
+
+    return round(skills + domain + availability + rating + price + activity, 2)
+
+
+def score_chunk(records: List[Dict], context: Dict, k: int, min_score: float) -> List[Tuple[float, object]]:
+    """
+    Best k (score, mentor id) pairs above min_score in a chunk, best first
+
+    Ties keep the earlier record, so merging chunks in order reproduces a
+    single sequential pass.
+    """
+    best = []  # (score, position) kept sorted best first
+    for position, record in enumerate(records):
+        floor = min_score if len(best) < k else max(min_score, best[-1][0])
+        score = score_mentor(record, context, min_score=floor)
+        if score is None or score <= floor:
+            continue
+        best.append((score, position))
+        best.sort(key=lambda entry: (-entry[0], entry[1]))
+        del best[k:]
+    return [(score, records[position]['id']) for score, position in best]
@@ -3,15 +3,60 @@ Intelligent Learner-Mentor Matching System
 Matches learners with mentors based on skills, interests, availability, and preferences
 """
 
+import hashlib
 import json
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 from typing import List, Dict, Tuple
-from django.db.models import Q, Count, Avg
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, Count, Avg, F
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import datetime, timedelta
+from recommendations.index_version import current_version, bump_version
+from recommendations.topk import TopK
+from recommendations.skill_graph import get_skill_graph
+from recommendations.models import MentorStats, MentorSkillTag
+from . import match_scoring
+from .availability import get_availability_index, preferred_intervals
 from .models import Session, Booking, Feedback
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+MIN_MATCH_SCORE = 20  # Mentors must score above this to be suggested
+EXPLORATION_SIZE = 20  # Top-rated mentors scored even without a shared skill
+MATCHABLE_MENTOR = {'role': 'mentor', 'is_active': True, 'is_verified': True}  # Who may be suggested at all
+MATCH_CACHE_VERSION_KEY = 'sessions_mentor_match_version'
+MATCH_CACHE_TTL = 120  # Availability and activity drift, so cached matches stay short-lived
+
+_scoring_pool = None
+_scoring_pool_lock = threading.Lock()
+
+
+def _get_scoring_pool(workers: int) -> ProcessPoolExecutor:
+    """Process-wide scoring pool, started on first use"""
+    global _scoring_pool
+    with _scoring_pool_lock:
+        if _scoring_pool is None:
+            # Spawned workers import only match_scoring, never a forked copy of Django state
+            _scoring_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _scoring_pool
+
+
+def _shutdown_scoring_pool():
+    """Drop a broken pool so the next parallel call starts a fresh one"""
+    global _scoring_pool
+    with _scoring_pool_lock:
+        if _scoring_pool is not None:
+            _scoring_pool.shutdown(wait=False, cancel_futures=True)
+            _scoring_pool = None
+
 
 class MentorMatchingEngine:
     """Advanced matching engine for learner-mentor connections"""
@@ -36,73 +81,185 @@ class MentorMatchingEngine:
             'session_count_boost': 3,
             'response_time_boost': 2
         }
+        
+        self._skill_graph = None
+        self._availability_index = None
 
-    def find_best_mentors(self, learner_profile: Dict, max_results: int = 10) -> List[Dict]:
+    def find_best_mentors(self, learner_profile: Dict, max_results: int = 10, parallel: bool = False) -> List[Dict]:
         """
         Find the best mentors for a learner based on comprehensive matching
         
         Args:
             learner_profile: Dict containing learner's requirements
             max_results: Maximum number of mentors to return
+            parallel: Score in the worker pool when the candidate set reaches
+                MENTOR_MATCHING_PARALLEL_THRESHOLD
             
         Returns:
             List of matched mentors with scores
         """
         
-        # Get all available mentors
-        mentors = User.objects.filter(
-            role='mentor',
-            is_active=True,
-            is_verified=True
-        ).select_related().prefetch_related('mentor_sessions', 'received_feedback')
+        # Get all available mentors (rating and experience come joined from MentorStats)
+        mentors = User.objects.filter(**MATCHABLE_MENTOR).select_related('mentor_stats')
         
-        matched_mentors = []
+        # Only score mentors sharing an exact or related skill, plus a few top-rated ones
+        required_skills = set(skill.strip().lower() for skill in learner_profile.get('skills', []))
+        if required_skills:
+            mentors = mentors.filter(
+                Q(id__in=self._get_skill_candidates(required_skills)) |
+                Q(id__in=self._get_exploration_candidates())
+            )
+        mentors = list(mentors)
+        
+        # Upcoming session counts for every mentor in one grouped query
+        upcoming = self._get_upcoming_counts()
+        context = self._get_scoring_context(learner_profile)
+        
+        top_mentors = None
+        if parallel and len(mentors) >= settings.MENTOR_MATCHING_PARALLEL_THRESHOLD:
+            top_mentors = self._score_in_pool(mentors, upcoming, context, max_results)
+        
+        if top_mentors is None:
+            # Stream mentors through a bounded heap; anyone whose best possible score
+            # cannot beat the threshold or the current k-th best is dropped early
+            top_mentors = TopK(max_results)
+            
+            for mentor in mentors:
+                threshold = top_mentors.threshold
+                min_score = MIN_MATCH_SCORE if threshold is None else max(MIN_MATCH_SCORE, threshold)
+                active, scheduled = upcoming.get(mentor.id, (0, 0))
+                score = self._calculate_mentor_score(
+                    mentor, learner_profile, min_score=min_score, upcoming_sessions=active, context=context
+                )
+                if score is not None and score > MIN_MATCH_SCORE:
+                    top_mentors.push(score, mentor)
+        
+        # Reasons, availability and stats are only built for the mentors returned
+        return [
+            {
+                'mentor': mentor,
+                'score': score,
+                'match_reasons': self._get_match_reasons(mentor, learner_profile, context),
+                'availability': self._get_mentor_availability(mentor, upcoming.get(mentor.id, (0, 0))[1]),
+                'stats': self._get_mentor_stats(mentor)
+            }
+            for score, mentor in top_mentors.scored_items()
+        ]
+
+    def _score_in_pool(self, mentors: List[User], upcoming: Dict, context: Dict, max_results: int):
+        """
+        Score mentors in contiguous chunks across the worker pool
+        
+        Each worker returns its chunk's best max_results; merging them in chunk
+        order gives the same ranking, ties included, as the sequential loop.
+        Returns a TopK of mentors, or None if the pool is unavailable.
+        """
         
-        for mentor in mentors:
-            score = self._calculate_mentor_score(mentor, learner_profile)
-            if score > 20:  # Minimum threshold
-                matched_mentors.append({
-                    'mentor': mentor,
-                    'score': score,
-                    'match_reasons': self._get_match_reasons(mentor, learner_profile),
-                    'availability': self._get_mentor_availability(mentor),
-                    'stats': self._get_mentor_stats(mentor)
-                })
+        now = timezone.now()
+        records = [
+            self._get_mentor_record(mentor, upcoming.get(mentor.id, (0, 0))[0], now, context)
+            for mentor in mentors
+        ]
         
-        # Sort by score and return top results
-        matched_mentors.sort(key=lambda x: x['score'], reverse=True)
-        return matched_mentors[:max_results]
+        workers = settings.MENTOR_MATCHING_WORKERS
+        chunk_size = -(-len(records) // (workers * 2))
+        chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+        
+        try:
+            results = list(_get_scoring_pool(workers).map(
+                match_scoring.score_chunk, chunks,
+                repeat(context), repeat(max_results), repeat(MIN_MATCH_SCORE)
+            ))
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Mentor scoring pool failed, scoring in process: {e}")
+            _shutdown_scoring_pool()
+            return None
+        
+        mentors_by_id = {mentor.id: mentor for mentor in mentors}
+        top_mentors = TopK(max_results)
+        for chunk_best in results:
+            for score, mentor_id in chunk_best:
+                top_mentors.push(score, mentors_by_id[mentor_id])
+        return top_mentors
 
-    def _calculate_mentor_score(self, mentor: User, learner_profile: Dict) -> float:
-        """Calculate comprehensive matching score for a mentor"""
+    def _get_scoring_context(self, learner_profile: Dict) -> Dict:
+        """Learner-side scoring inputs as plain data, shared by every mentor scored"""
         
-        total_score = 0
+        if self._skill_graph is None:
+            self._skill_graph = get_skill_graph()
         
-        # 1. Skills matching
-        skills_score = self._calculate_skills_score(mentor, learner_profile)
-        total_score += skills_score
+        required_skills = set(skill.strip().lower() for skill in learner_profile.get('skills', []))
         
-        # 2. Domain matching
-        domain_score = self._calculate_domain_score(mentor, learner_profile)
-        total_score += domain_score
+        try:
+            needed_minutes = max(int(learner_profile.get('duration') or 60), 1)
+        except (ValueError, TypeError):
+            needed_minutes = 60
         
-        # 3. Availability matching
-        availability_score = self._calculate_availability_score(mentor, learner_profile)
-        total_score += availability_score
+        return {
+            'required_skills': required_skills,
+            'related_by_required': {skill: self._skill_graph.related(skill) for skill in required_skills},
+            'learner_domain': learner_profile.get('domain', '').lower(),
+            'urgency': learner_profile.get('urgency', 'flexible'),
+            'budget': learner_profile.get('budget'),
+            'preferred_intervals': preferred_intervals(
+                learner_profile.get('preferred_times'), learner_profile.get('timezone', 'UTC')
+            ),
+            'needed_minutes': needed_minutes,
+            'skill_weights': self.skill_weights,
+            'availability_weights': self.availability_weights,
+            'rating_weights': self.rating_weights,
+        }
+
+    def _get_mentor_record(self, mentor: User, upcoming_sessions: int, now: datetime = None,
+                           context: Dict = None) -> Dict:
+        """Mentor-side scoring inputs as a plain, picklable record"""
+        
+        now = now or timezone.now()
+        avg_rating, completed_sessions = self._get_rollup(mentor)
+        last_active = getattr(mentor, 'last_active', None)
+        
+        return {
+            'id': mentor.id,
+            'skills': set(skill.strip().lower() for skill in (mentor.skills or '').split(',') if skill.strip()),
+            'domain': getattr(mentor, 'domain', '').lower() if hasattr(mentor, 'domain') else '',
+            'hourly_rate': getattr(mentor, 'hourly_rate', 0),
+            'hours_since_active': (now - last_active).total_seconds() / 3600 if last_active else None,
+            'avg_rating': avg_rating,
+            'completed_sessions': completed_sessions,
+            'upcoming_sessions': upcoming_sessions,
+            'free_minutes': self._get_free_minutes(mentor, context) if context else None,
+        }
+
+    def _get_free_minutes(self, mentor: User, context: Dict):
+        """Mentor's free minutes in the learner's preferred slots, or None if either side is unknown"""
+        
+        if not context['preferred_intervals']:
+            return None
+        
+        # Loaded once per engine; the index itself is shared and rebuilds after schedule edits
+        if self._availability_index is None:
+            self._availability_index = get_availability_index()
         
-        # 4. Rating and experience boost
-        rating_score = self._calculate_rating_score(mentor)
-        total_score += rating_score
+        return self._availability_index.free_minutes(mentor.id, context['preferred_intervals'])
+
+    def _calculate_mentor_score(self, mentor: User, learner_profile: Dict, min_score: float = None,
+                                upcoming_sessions: int = None, context: Dict = None) -> float:
+        """
+        Calculate comprehensive matching score for a mentor
         
-        # 5. Price compatibility
-        price_score = self._calculate_price_score(mentor, learner_profile)
-        total_score += price_score
+        With min_score set, returns None without scoring availability when the
+        mentor's upper bound cannot exceed it. upcoming_sessions is the mentor's
+        prefetched 7-day scheduled/live count; it is queried when not given.
+        """
         
-        # 6. Recent activity boost
-        activity_score = self._calculate_activity_score(mentor)
-        total_score += activity_score
+        if upcoming_sessions is None:
+            upcoming_sessions = self._count_upcoming_sessions(mentor)
+        if context is None:
+            context = self._get_scoring_context(learner_profile)
         
-        return round(total_score, 2)
+        return match_scoring.score_mentor(
+            self._get_mentor_record(mentor, upcoming_sessions, context=context), context, min_score
+        )
 
     def _calculate_skills_score(self, mentor: User, learner_profile: Dict) -> float:
         """Calculate skill matching score"""
@@ -113,14 +270,8 @@ class MentorMatchingEngine:
         if not required_skills:
             return 0
         
-        exact_matches = len(mentor_skills.intersection(required_skills))
         related_matches = self._find_related_skills(mentor_skills, required_skills)
-        
-        score = (exact_matches * self.skill_weights['exact_match'] + 
-                related_matches * self.skill_weights['related_match'])
-        
-        # Normalize by number of required skills
-        return min(score / len(required_skills) * 2, 25)
+        return match_scoring.skills_score(mentor_skills, required_skills, related_matches, self.skill_weights)
 
     def _calculate_domain_score(self, mentor: User, learner_profile: Dict) -> float:
         """Calculate domain expertise matching"""
@@ -128,55 +279,96 @@ class MentorMatchingEngine:
         learner_domain = learner_profile.get('domain', '').lower()
         mentor_domain = getattr(mentor, 'domain', '').lower() if hasattr(mentor, 'domain') else ''
         
-        if learner_domain and mentor_domain:
-            if learner_domain == mentor_domain:
-                return self.skill_weights['domain_match']
-            elif learner_domain in mentor_domain or mentor_domain in learner_domain:
-                return self.skill_weights['domain_match'] * 0.7
-        
-        return 0
+        return match_scoring.domain_score(learner_domain, mentor_domain, self.skill_weights)
 
-    def _calculate_availability_score(self, mentor: User, learner_profile: Dict) -> float:
+    def _calculate_availability_score(self, mentor: User, learner_profile: Dict, upcoming_sessions: int = None) -> float:
         """Calculate availability matching score"""
         
-        urgency = learner_profile.get('urgency', 'flexible')
-        preferred_times = learner_profile.get('preferred_times', [])
+        context = self._get_scoring_context(learner_profile)
         
         # Check mentor's upcoming availability
-        upcoming_sessions = Session.objects.filter(
+        if upcoming_sessions is None:
+            upcoming_sessions = self._count_upcoming_sessions(mentor)
+        
+        return match_scoring.availability_score(
+            upcoming_sessions, context['urgency'], self.availability_weights,
+            self._get_free_minutes(mentor, context), context['needed_minutes']
+        )
+
+    def _count_upcoming_sessions(self, mentor: User) -> int:
+        """Scheduled or live sessions the mentor has in the next 7 days"""
+        
+        return Session.objects.filter(
             mentor=mentor,
             schedule__gte=timezone.now(),
             schedule__lte=timezone.now() + timedelta(days=7),
             status__in=['scheduled', 'live']
         ).count()
+
+    def _get_skill_candidates(self, required_skills: set):
+        """Subquery of mentors tagged with a required skill or one related to it in the skill graph"""
         
-        # Lower session count = better availability
-        availability_factor = max(0, 10 - upcoming_sessions)
+        if self._skill_graph is None:
+            self._skill_graph = get_skill_graph()
         
-        # Urgency matching
-        urgency_score = self.availability_weights.get(urgency, 4)
+        candidate_skills = set(required_skills)
+        for skill in required_skills:
+            candidate_skills.update(self._skill_graph.related(skill))
         
-        return (availability_factor + urgency_score) / 2
+        return MentorSkillTag.objects.filter(skill__in=candidate_skills).values('mentor_id')
+
+    def _get_exploration_candidates(self):
+        """Subquery of the best-rated matchable mentors, scored even without a skill overlap"""
+        
+        return MentorStats.objects.filter(
+            **{f'mentor__{field}': value for field, value in MATCHABLE_MENTOR.items()}
+        ).order_by('-avg_rating', '-completed_sessions').values('mentor_id')[:EXPLORATION_SIZE]
+
+    def _get_upcoming_counts(self) -> Dict:
+        """
+        Sessions in the next 7 days for every verified mentor, in one grouped query
+        
+        Returns:
+            Dict of mentor_id -> (scheduled or live count, scheduled-only count)
+        """
+        
+        now = timezone.now()
+        rows = Session.objects.filter(
+            mentor__role='mentor',
+            mentor__is_active=True,
+            mentor__is_verified=True,
+            schedule__gte=now,
+            schedule__lte=now + timedelta(days=7),
+            status__in=['scheduled', 'live']
+        ).values('mentor_id').annotate(
+            active=Count('id'),
+            scheduled=Count('id', filter=Q(status='scheduled'))
+        ).values_list('mentor_id', 'active', 'scheduled')
+        
+        return {mentor_id: (active, scheduled) for mentor_id, active, scheduled in rows}
+
+    def _max_availability_score(self, learner_profile: Dict) -> float:
+        """Best availability score any mentor can get for this learner (no upcoming sessions)"""
+        
+        return match_scoring.max_availability_score(learner_profile.get('urgency', 'flexible'), self.availability_weights)
 
     def _calculate_rating_score(self, mentor: User) -> float:
         """Calculate rating and reputation score"""
         
-        # Get mentor's average rating
-        avg_rating = Feedback.objects.filter(
-            session__mentor=mentor
-        ).aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0
+        # Average rating and completed sessions from the rollup
+        avg_rating, completed_sessions = self._get_rollup(mentor)
         
-        # Get total sessions completed
-        completed_sessions = Session.objects.filter(
-            mentor=mentor,
-            status='completed'
-        ).count()
+        return match_scoring.rating_score(avg_rating, completed_sessions, self.rating_weights)
+
+    def _get_rollup(self, mentor: User) -> Tuple[float, int]:
+        """Average rating and completed session count from the mentor's MentorStats row"""
         
-        # Calculate score
-        rating_boost = (avg_rating / 5) * self.rating_weights['rating_boost']
-        session_boost = min(completed_sessions / 10, 1) * self.rating_weights['session_count_boost']
+        stats = getattr(mentor, 'mentor_stats', None)
+        if stats is None:
+            return 0, 0  # No sessions or feedback recorded yet
         
-        return rating_boost + session_boost
+        avg_rating = stats.avg_rating if stats.rating_count else 0
+        return avg_rating, stats.completed_sessions
 
     def _calculate_price_score(self, mentor: User, learner_profile: Dict) -> float:
         """Calculate price compatibility score"""
@@ -184,69 +376,35 @@ class MentorMatchingEngine:
         learner_budget = learner_profile.get('budget')
         mentor_rate = getattr(mentor, 'hourly_rate', 0)
         
-        if not learner_budget or not mentor_rate:
-            return 5  # Neutral score
-        
-        try:
-            # Extract numeric budget (assuming format like "₹500-1000" or "500")
-            if '-' in str(learner_budget):
-                budget_range = [int(x.strip('₹').strip()) for x in str(learner_budget).split('-')]
-                max_budget = max(budget_range)
-            else:
-                max_budget = int(str(learner_budget).strip('₹').strip())
-            
-            if mentor_rate <= max_budget:
-                return 10  # Perfect price match
-            elif mentor_rate <= max_budget * 1.2:
-                return 7   # Slightly over budget
-            elif mentor_rate <= max_budget * 1.5:
-                return 4   # Moderately over budget
-            else:
-                return 1   # Significantly over budget
-                
-        except (ValueError, TypeError):
-            return 5  # Neutral if can't parse
+        return match_scoring.price_score(learner_budget, mentor_rate)
 
     def _calculate_activity_score(self, mentor: User) -> float:
         """Calculate recent activity boost"""
         
         # Check last activity
+        hours_since_active = None
         if hasattr(mentor, 'last_active') and mentor.last_active:
             hours_since_active = (timezone.now() - mentor.last_active).total_seconds() / 3600
-            
-            if hours_since_active < 1:
-                return 5  # Very recently active
-            elif hours_since_active < 24:
-                return 3  # Active today
-            elif hours_since_active < 168:  # 1 week
-                return 1  # Active this week
-        
-        return 0
-
-    def _find_related_skills(self, mentor_skills: set, required_skills: set) -> int:
-        """Find related skills using simple keyword matching"""
-        
-        skill_relations = {
-            'python': ['django', 'flask', 'fastapi', 'programming'],
-            'javascript': ['react', 'vue', 'angular', 'node.js', 'web development'],
-            'web development': ['html', 'css', 'javascript', 'frontend', 'backend'],
-            'data science': ['python', 'r', 'statistics', 'machine learning', 'analytics'],
-            'machine learning': ['python', 'tensorflow', 'pytorch', 'data science', 'ai'],
-            'mobile development': ['android', 'ios', 'react native', 'flutter', 'swift', 'kotlin'],
-        }
         
-        related_count = 0
-        for required_skill in required_skills:
-            if required_skill in skill_relations:
-                related_skills = set(skill_relations[required_skill])
-                if mentor_skills.intersection(related_skills):
-                    related_count += 1
+        return match_scoring.activity_score(hours_since_active)
+
+    def _find_related_skills(self, mentor_skills: set, required_skills: set) -> float:
+        """Weighted count of required skills the mentor covers through the skill relation graph"""
+        
+        # Loaded once per engine; the graph itself is shared and reloads after admin edits
+        if self._skill_graph is None:
+            self._skill_graph = get_skill_graph()
         
-        return related_count
+        return match_scoring.related_score(
+            mentor_skills, {skill: self._skill_graph.related(skill) for skill in required_skills}
+        )
 
-    def _get_match_reasons(self, mentor: User, learner_profile: Dict) -> List[str]:
+    def _get_match_reasons(self, mentor: User, learner_profile: Dict, context: Dict = None) -> List[str]:
         """Get human-readable reasons for the match"""
         
+        if context is None:
+            context = self._get_scoring_context(learner_profile)
+        
         reasons = []
         
         # Skill matches
@@ -257,20 +415,18 @@ class MentorMatchingEngine:
         if skill_matches:
             reasons.append(f"Expert in {', '.join(list(skill_matches)[:3])}")
         
+        # Free time in the learner's preferred slots
+        free_minutes = self._get_free_minutes(mentor, context)
+        if free_minutes is not None and free_minutes >= context['needed_minutes']:
+            reasons.append("Free at your preferred times")
+        
         # Rating
-        avg_rating = Feedback.objects.filter(
-            session__mentor=mentor
-        ).aggregate(avg_rating=Avg('rating'))['avg_rating']
+        avg_rating, completed_sessions = self._get_rollup(mentor)
         
         if avg_rating and avg_rating >= 4.5:
             reasons.append(f"Highly rated ({avg_rating:.1f}/5 stars)")
         
         # Experience
-        completed_sessions = Session.objects.filter(
-            mentor=mentor,
-            status='completed'
-        ).count()
-        
         if completed_sessions > 10:
             reasons.append(f"Experienced ({completed_sessions} sessions completed)")
         
@@ -282,16 +438,17 @@ class MentorMatchingEngine:
         
         return reasons[:4]  # Limit to top 4 reasons
 
-    def _get_mentor_availability(self, mentor: User) -> Dict:
+    def _get_mentor_availability(self, mentor: User, upcoming_sessions: int = None) -> Dict:
         """Get mentor's availability information"""
         
         # Get upcoming sessions
-        upcoming_sessions = Session.objects.filter(
-            mentor=mentor,
-            schedule__gte=timezone.now(),
-            schedule__lte=timezone.now() + timedelta(days=7),
-            status__in=['scheduled']
-        ).count()
+        if upcoming_sessions is None:
+            upcoming_sessions = Session.objects.filter(
+                mentor=mentor,
+                schedule__gte=timezone.now(),
+                schedule__lte=timezone.now() + timedelta(days=7),
+                status__in=['scheduled']
+            ).count()
         
         # Determine availability status
         if upcoming_sessions == 0:
@@ -312,10 +469,7 @@ class MentorMatchingEngine:
     def _get_mentor_stats(self, mentor: User) -> Dict:
         """Get mentor's statistics"""
         
-        total_sessions = Session.objects.filter(mentor=mentor, status='completed').count()
-        avg_rating = Feedback.objects.filter(
-            session__mentor=mentor
-        ).aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0
+        avg_rating, total_sessions = self._get_rollup(mentor)
         
         response_time = "< 1 hour"  # This would be calculated from actual data
         
@@ -334,58 +488,92 @@ class MentorMatchingEngine:
                              for interest in (learner.interests or '').split(',') 
                              if interest.strip())
         
-        # Get upcoming sessions
-        upcoming_sessions = Session.objects.filter(
+        # Upcoming sessions with room left, booked seats counted in SQL
+        now = timezone.now()
+        upcoming_sessions = list(Session.objects.filter(
             status='scheduled',
-            schedule__gte=timezone.now(),
-            max_participants__gt=Count('bookings')
-        ).select_related('mentor').prefetch_related('bookings')
-        
-        scored_sessions = []
-        
-        for session in upcoming_sessions:
+            schedule__gte=now
+        ).annotate(
+            booked=Count('bookings', filter=Q(bookings__status='confirmed'))
+        ).filter(
+            booked__lt=F('max_participants')
+        ).values_list('id', 'mentor_id', 'skills', 'schedule', 'max_participants', 'booked'))
+        
+        # Mentor ratings from the MentorStats rollup in one query
+        mentor_ratings = dict(MentorStats.objects.filter(
+            mentor_id__in={mentor_id for _, mentor_id, _, _, _, _ in upcoming_sessions},
+            rating_count__gt=0
+        ).values_list('mentor_id', 'avg_rating'))
+        
+        top_sessions = TopK(limit)
+        
+        for session_id, mentor_id, skills, schedule, max_participants, booked in upcoming_sessions:
             score = 0
             
             # Interest matching
             session_skills = set(skill.strip().lower() 
-                               for skill in (session.skills or '').split(',') 
+                               for skill in (skills or '').split(',') 
                                if skill.strip())
             
             interest_matches = len(learner_interests.intersection(session_skills))
             score += interest_matches * 5
             
             # Mentor rating
-            mentor_rating = Feedback.objects.filter(
-                session__mentor=session.mentor
-            ).aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0
-            
-            score += mentor_rating
+            score += mentor_ratings.get(mentor_id, 0)
             
             # Availability (sooner is better, but not too soon)
-            hours_until_session = (session.schedule - timezone.now()).total_seconds() / 3600
+            hours_until_session = (schedule - now).total_seconds() / 3600
             if 24 <= hours_until_session <= 168:  # 1-7 days
                 score += 3
             elif 2 <= hours_until_session < 24:  # 2-24 hours
                 score += 5
             
             # Session popularity (not too full, not empty)
-            fill_rate = session.current_participants / session.max_participants
+            fill_rate = booked / max_participants
             if 0.3 <= fill_rate <= 0.8:
                 score += 2
             
             if score > 5:  # Minimum threshold
-                scored_sessions.append((session, score))
+                top_sessions.push(score, session_id)
         
-        # Sort by score and return top sessions
-        scored_sessions.sort(key=lambda x: x[1], reverse=True)
-        return [session for session, score in scored_sessions[:limit]]
+        # Load only the sessions returned, best first
+        session_ids = top_sessions.items()
+        sessions = Session.objects.select_related('mentor').in_bulk(session_ids)
+        return [sessions[session_id] for session_id in session_ids if session_id in sessions]
 
 
 # Utility functions for easy access
-def get_mentor_recommendations(learner_profile: Dict, max_results: int = 10) -> List[Dict]:
-    """Get mentor recommendations for a learner profile"""
-    engine = MentorMatchingEngine()
-    return engine.find_best_mentors(learner_profile, max_results)
+def get_mentor_recommendations(learner_profile: Dict, max_results: int = 10, parallel: bool = False) -> List[Dict]:
+    """Get mentor recommendations for a learner profile, served from the match cache when possible"""
+    cache_key = _match_cache_key(learner_profile, max_results)
+    matches = cache.get(cache_key)
+    if matches is None:
+        engine = MentorMatchingEngine()
+        matches = engine.find_best_mentors(learner_profile, max_results, parallel=parallel)
+        cache.set(cache_key, matches, MATCH_CACHE_TTL)
+    return matches
+
+def _match_cache_key(learner_profile: Dict, max_results: int) -> str:
+    """
+    Cache key from only the profile fields that affect scoring, normalized the
+    way the scorer reads them, so equivalent profiles share one entry
+    """
+    canonical = json.dumps([
+        sorted(set(skill.strip().lower() for skill in learner_profile.get('skills', []))),
+        learner_profile.get('domain', '').lower(),
+        learner_profile.get('urgency', 'flexible'),
+        match_scoring.parse_max_budget(learner_profile.get('budget')),
+        learner_profile.get('preferred_times') or [],
+        learner_profile.get('timezone', 'UTC') if learner_profile.get('preferred_times') else None,
+        learner_profile.get('duration') if learner_profile.get('preferred_times') else None,
+        max_results,
+    ], sort_keys=True, default=str)
+    profile_hash = hashlib.sha1(canonical.encode()).hexdigest()
+    return f"mentor_matches:{current_version(MATCH_CACHE_VERSION_KEY)}:{profile_hash}"
+
+def invalidate_match_cache():
+    """Drop every cached match list after mentor data changed"""
+    bump_version(MATCH_CACHE_VERSION_KEY)
 
 def get_session_recommendations(learner: User, limit: int = 5) -> List[Session]:
     """Get session recommendations for a learner"""
@@ -0,0 +1,67 @@
+"""
+Room Levels Snapshots
+Audio levels and network metrics are reported many times a second across a live room.
+Consumers record each participant's latest values here, and one task per process sends
+every room that changed a single "levels" snapshot per interval, instead of fanning out
+each report to the whole session group.
+"""
+
+import asyncio
+import logging
+from channels.layers import get_channel_layer
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_INTERVAL = 0.5  # Seconds between snapshots of a room that changed
+
+
+class RoomLevels:
+    """Latest levels per participant for each session group served by this process"""
+
+    def __init__(self, interval=SNAPSHOT_INTERVAL):
+        self.interval = interval
+        self.rooms = {}  # group name -> {user id -> levels}
+        self.changed = set()  # group names with updates since their last snapshot
+        self._task = None
+
+    def update(self, group_name, user_id, **levels):
+        """Record new values for a participant; they go out with the room's next snapshot"""
+        entry = self.rooms.setdefault(group_name, {}).setdefault(user_id, {'user_id': user_id})
+        entry.update(levels)
+        self.changed.add(group_name)
+
+    def remove(self, group_name, user_id):
+        room = self.rooms.get(group_name)
+        if room is None:
+            return
+        room.pop(user_id, None)
+        if not room:
+            del self.rooms[group_name]
+            self.changed.discard(group_name)
+
+    def snapshot(self, group_name):
+        return [dict(levels) for levels in self.rooms.get(group_name, {}).values()]
+
+    def start(self):
+        """Start sending snapshots from the running event loop unless it is already going"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        channel_layer = get_channel_layer()
+        while True:
+            await asyncio.sleep(self.interval)
+            changed, self.changed = self.changed, set()
+            for group_name in changed:
+                try:
+                    await channel_layer.group_send(group_name, {
+                        'type': 'levels_snapshot',
+                        'levels': self.snapshot(group_name),
+                        'timestamp': timezone.now().isoformat(),
+                    })
+                except Exception as e:
+                    logger.error(f"Failed to send levels snapshot to {group_name}: {e}")
+
+
+room_levels = RoomLevels()
@@ -98,6 +98,7 @@ urlpatterns = [
     path('api/recommended-sessions/', api_views.get_recommended_sessions_api, name='get_recommended_sessions_api'),
     path('api/request-mentor-match/', api_views.request_mentor_match_api, name='request_mentor_match_api'),
     path('api/ai-matching/', api_views.ai_matching_api, name='api_ai_matching'),
+    path('api/ai-matching/stream/', api_views.ai_matching_stream_api, name='api_ai_matching_stream'),
     path('api/connection-status/<uuid:session_id>/', api_views.get_connection_status_api, name='get_connection_status_api'),
     path('api/update-connection/<uuid:session_id>/', api_views.update_connection_status_api, name='update_connection_status_api'),
     path('api/live-sessions/', api_views.get_live_sessions_advanced, name='api_live_sessions_advanced'),
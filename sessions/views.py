@@ -15,6 +15,7 @@ from .forms import SessionForm, FeedbackForm
 import razorpay
 import os
 from django.db.models import Avg, Count
+from recommendations.popularity import record_view
 
 @login_required
 def session_list(request):
@@ -96,6 +97,8 @@ def session_detail_new(request, session_id):
             learner=request.user
         ).first()
     
+    record_view(session.id)
+    
     context = {
         'session': session,
         'user_booking': user_booking,
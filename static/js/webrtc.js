@@ -7,6 +7,8 @@ class PeerLearnVideoManager {
     constructor() {
         this.localStream = null;
         this.peerConnections = new Map();
+        this.pendingIceCandidates = new Map(); // userId -> candidates waiting to be sent together
+        this.iceBatchDelay = 10; // ms to gather a burst of candidates into one message
         this.socket = null;
         this.sessionId = null;
         this.userId = null;
@@ -381,6 +383,9 @@ class PeerLearnVideoManager {
             case 'ice_candidate':
                 this.handleIceCandidate(data);
                 break;
+            case 'webrtc_signal':
+                this.handleWebRTCSignal(data);
+                break;
             case 'user_left':
                 this.handleUserLeft(data);
                 break;
@@ -389,6 +394,27 @@ class PeerLearnVideoManager {
         }
     }
 
+    /**
+     * Route a signal relayed by the session consumer by its signal_type
+     */
+    handleWebRTCSignal(data) {
+        const message = { ...data, fromUserId: data.from_user };
+        switch (data.signal_type) {
+            case 'offer':
+                this.handleWebRTCOffer(message);
+                break;
+            case 'answer':
+                this.handleWebRTCAnswer(message);
+                break;
+            case 'ice_candidate':
+                this.handleIceCandidate(message);
+                break;
+            case 'ice_candidates':
+                (data.candidates || []).forEach(candidate => this.handleIceCandidate({ ...message, candidate }));
+                break;
+        }
+    }
+
     /**
      * Handle new user joining
      */
@@ -424,12 +450,9 @@ class PeerLearnVideoManager {
             // Handle ICE candidates
             peerConnection.onicecandidate = (event) => {
                 if (event.candidate) {
-                    this.sendMessage({
-                        type: 'ice_candidate',
-                        candidate: event.candidate,
-                        toUserId: userId,
-                        fromUserId: this.userId
-                    });
+                    this.queueIceCandidate(userId, event.candidate);
+                } else {
+                    this.flushIceCandidates(userId);
                 }
             };
             
@@ -510,6 +533,34 @@ class PeerLearnVideoManager {
         }
     }
 
+    /**
+     * Queue an ICE candidate so a burst for the same peer is sent as one message
+     */
+    queueIceCandidate(userId, candidate) {
+        if (!this.pendingIceCandidates.has(userId)) {
+            this.pendingIceCandidates.set(userId, []);
+            setTimeout(() => this.flushIceCandidates(userId), this.iceBatchDelay);
+        }
+        this.pendingIceCandidates.get(userId).push(candidate.toJSON ? candidate.toJSON() : candidate);
+    }
+
+    /**
+     * Send the ICE candidates queued for a peer
+     */
+    flushIceCandidates(userId) {
+        const candidates = this.pendingIceCandidates.get(userId);
+        this.pendingIceCandidates.delete(userId);
+        if (candidates && candidates.length) {
+            this.sendMessage({
+                type: 'ice_candidates',
+                candidates: candidates,
+                toUserId: userId,
+                to_user: userId,
+                fromUserId: this.userId
+            });
+        }
+    }
+
     /**
      * Handle ICE candidate
      */
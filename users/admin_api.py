@@ -10,7 +10,8 @@ from django.contrib.auth import get_user_model
 from django.core.mail import send_mass_mail
 from django.template.loader import render_to_string
 from django.conf import settings
-from django.db.models import Q, Count, Sum, Avg
+from django.db.models import Q, Count, Sum, Avg, Value
+from django.db.models.functions import Coalesce, NullIf
 from datetime import datetime, timedelta
 from django.utils import timezone
 import json
@@ -1466,8 +1467,8 @@ def admin_real_data_api(request):
         
         # Top Performers
         top_mentors = list(User.objects.filter(role='mentor').annotate(
-            session_count=Count('mentor_sessions'),
-            avg_rating=Avg('mentor_sessions__feedback__rating')
+            session_count=Coalesce('mentor_stats__total_sessions', 0),
+            avg_rating=NullIf('mentor_stats__avg_rating', Value(0.0))
         ).order_by('-session_count')[:5].values(
             'id', 'username', 'first_name', 'last_name', 'session_count', 'avg_rating'
         ))
@@ -6,9 +6,17 @@ import json
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Sum
 from sessions.models import Session
+from recommendations.models import SkillPhraseStat
 from recommendations.recommendation_engine import RecommendationEngine
+from recommendations.skill_autocomplete import get_autocomplete_index
+from recommendations.skill_graph import get_skill_graph
+
+# Suggestion domains that are named differently from session categories
+DOMAIN_CATEGORIES = {
+    'machine-learning': 'ai-ml',
+}
 
 
 @csrf_exempt
@@ -16,10 +24,11 @@ from recommendations.recommendation_engine import RecommendationEngine
 def get_skill_suggestions(request):
     """
     Get intelligent skill suggestions based on:
-    1. Current active sessions
-    2. Popular skills in selected domains
+    1. Skills listed on current active sessions and user profiles
+    2. Popular skills in selected domains (from skill phrase statistics)
     3. ML recommendation engine patterns
-    4. Trending skills across the platform
+    4. Trending skills across the platform (by week-over-week growth)
+    5. Skills related to matching ones in the skill graph
     """
     try:
         data = json.loads(request.body)
@@ -45,6 +54,10 @@ def get_skill_suggestions(request):
         trending_skills = get_trending_skills(query, role)
         suggestions.extend(trending_skills)
         
+        # 4. Related Skills from the skill graph
+        related_skills = get_related_skills(query)
+        suggestions.extend(related_skills)
+        
         # Remove duplicates and sort by relevance
         unique_suggestions = {}
         for suggestion in suggestions:
@@ -52,10 +65,11 @@ def get_skill_suggestions(request):
             if skill_name not in unique_suggestions:
                 unique_suggestions[skill_name] = suggestion
             else:
-                # Merge session counts for duplicates
+                # Sources count the same sessions, so keep the largest count rather than adding them up
                 existing = unique_suggestions[skill_name]
-                existing['sessions'] += suggestion['sessions']
-                existing['trend'] = '🔥 Hot' if existing['sessions'] > 20 else existing['trend']
+                if suggestion['sessions'] > existing['sessions']:
+                    existing['sessions'] = suggestion['sessions']
+                    existing['trend'] = suggestion['trend']
         
         # Sort by relevance (session count + query match)
         sorted_suggestions = sorted(
@@ -67,8 +81,11 @@ def get_skill_suggestions(request):
             reverse=True
         )
         
+        top_suggestions = sorted_suggestions[:8]  # Top 8 suggestions
+        apply_growth_trends(top_suggestions)
+        
         return JsonResponse({
-            'suggestions': sorted_suggestions[:8],  # Top 8 suggestions
+            'suggestions': top_suggestions,
             'total_found': len(sorted_suggestions)
         })
         
@@ -78,53 +95,22 @@ def get_skill_suggestions(request):
 
 
 def get_skills_from_active_sessions(query, domains, role):
-    """Get skills from currently active sessions matching the query"""
+    """Get skills listed on open sessions and user profiles with a word starting with the query"""
     suggestions = []
     
     try:
-        # Filter sessions based on role and domains
-        session_filter = Q(status__in=['open', 'scheduled'])
-        
-        if domains:
-            domain_filter = Q()
-            for domain in domains:
-                domain_filter |= Q(description__icontains=domain.replace('-', ' '))
-                domain_filter |= Q(title__icontains=domain.replace('-', ' '))
-                domain_filter |= Q(skills__icontains=domain.replace('-', ' '))
-            session_filter &= domain_filter
-        
-        sessions = Session.objects.filter(session_filter)
-        
-        # Extract skills from session titles and descriptions
-        skill_counts = {}
-        
-        for session in sessions:
-            # Check title and description for skills
-            text_content = f"{session.title} {session.description} {session.skills}".lower()
+        # Prefix lookup in the in-memory phrase index instead of scanning session text
+        for skill, session_count, user_count in get_autocomplete_index().search(query, domains):
+            category = categorize_skill(skill, domains)
+            trend = get_skill_trend(session_count)
             
-            # Common skill patterns to extract
-            if query in text_content:
-                # Extract skill from context
-                words = text_content.split()
-                for i, word in enumerate(words):
-                    if query in word:
-                        # Try to get the full skill name (might be multiple words)
-                        skill_phrase = extract_skill_phrase(words, i, query)
-                        if skill_phrase and len(skill_phrase) >= len(query):
-                            skill_counts[skill_phrase] = skill_counts.get(skill_phrase, 0) + 1
-        
-        # Convert to suggestions format
-        for skill, count in skill_counts.items():
-            if count > 0:
-                category = categorize_skill(skill, domains)
-                trend = get_skill_trend(count)
-                
-                suggestions.append({
-                    'skill': skill.title(),
-                    'sessions': count,
-                    'category': category,
-                    'trend': trend
-                })
+            suggestions.append({
+                'skill': skill.title(),
+                'sessions': session_count,
+                'users': user_count,  # Profiles listing the skill, kept apart from session counts
+                'category': category,
+                'trend': trend
+            })
     
     except Exception as e:
         print(f"Error getting skills from sessions: {e}")
@@ -133,113 +119,99 @@ def get_skills_from_active_sessions(query, domains, role):
 
 
 def get_popular_domain_skills(query, domains, role):
-    """Get popular skills within selected domains"""
-    domain_skills = {
-        'web-development': [
-            'React', 'Vue.js', 'Angular', 'Node.js', 'Express.js', 'JavaScript', 'TypeScript',
-            'HTML5', 'CSS3', 'Sass', 'Webpack', 'Next.js', 'Nuxt.js', 'GraphQL', 'REST API'
-        ],
-        'mobile-development': [
-            'React Native', 'Flutter', 'Swift', 'Kotlin', 'Ionic', 'Xamarin', 'Java',
-            'Objective-C', 'Android Studio', 'Xcode', 'Firebase', 'React Native'
-        ],
-        'data-science': [
-            'Python', 'R', 'Pandas', 'NumPy', 'Matplotlib', 'Seaborn', 'Scikit-learn',
-            'TensorFlow', 'PyTorch', 'Jupyter', 'SQL', 'Machine Learning', 'Deep Learning'
-        ],
-        'machine-learning': [
-            'TensorFlow', 'PyTorch', 'Scikit-learn', 'Keras', 'OpenCV', 'Natural Language Processing',
-            'Computer Vision', 'Neural Networks', 'Deep Learning', 'MLOps', 'Model Deployment'
-        ],
-        'design': [
-            'Figma', 'Adobe XD', 'Sketch', 'Photoshop', 'Illustrator', 'UI Design', 'UX Design',
-            'Prototyping', 'Wireframing', 'Design Systems', 'User Research', 'Usability Testing'
-        ],
-        'business': [
-            'Digital Marketing', 'SEO', 'Social Media Marketing', 'Content Marketing',
-            'Product Management', 'Project Management', 'Analytics', 'Strategy', 'Leadership'
-        ],
-        'devops': [
-            'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Jenkins', 'CI/CD', 'Terraform',
-            'Ansible', 'Linux', 'Bash', 'Git', 'Monitoring', 'DevOps'
-        ],
-        'blockchain': [
-            'Solidity', 'Ethereum', 'Bitcoin', 'Web3.js', 'Smart Contracts', 'DeFi',
-            'NFTs', 'Blockchain Development', 'Cryptocurrency', 'Hardhat', 'Truffle'
-        ],
-        'cybersecurity': [
-            'Ethical Hacking', 'Penetration Testing', 'Network Security', 'CISSP',
-            'Security Analysis', 'Malware Analysis', 'Incident Response', 'Risk Assessment'
-        ]
-    }
-    
+    """Get the most-used skills within selected domains from the phrase statistics"""
     suggestions = []
+    categories = [DOMAIN_CATEGORIES.get(domain, domain) for domain in domains]
+    if not categories:
+        return suggestions
+    
+    category_names = dict(Session.CATEGORY_CHOICES)
+    stats = SkillPhraseStat.objects.filter(
+        phrase_matches(query),
+        domain__in=categories,
+        session_count__gt=0
+    ).order_by('-session_count')[:10]
     
-    for domain in domains:
-        if domain in domain_skills:
-            domain_skill_list = domain_skills[domain]
-            for skill in domain_skill_list:
-                if query.lower() in skill.lower():
-                    # Simulate session count based on skill popularity
-                    base_sessions = len(domain_skill_list) - domain_skill_list.index(skill)
-                    session_count = base_sessions + (5 if skill.lower().startswith(query.lower()) else 0)
-                    
-                    suggestions.append({
-                        'skill': skill,
-                        'sessions': session_count,
-                        'category': domain.replace('-', ' ').title(),
-                        'trend': get_skill_trend(session_count)
-                    })
+    for stat in stats:
+        suggestions.append({
+            'skill': stat.phrase.title(),
+            'sessions': stat.session_count,
+            'category': category_names.get(stat.domain, stat.domain.replace('-', ' ').title()),
+            'trend': get_skill_trend(stat.session_count, stat.growth)
+        })
     
     return suggestions
 
 
 def get_trending_skills(query, role):
-    """Get trending skills across the platform"""
-    trending_skills = [
-        {'skill': 'AI & Machine Learning', 'base_sessions': 45, 'category': 'Technology'},
-        {'skill': 'React', 'base_sessions': 38, 'category': 'Frontend'},
-        {'skill': 'Python', 'base_sessions': 42, 'category': 'Programming'},
-        {'skill': 'Data Analysis', 'base_sessions': 35, 'category': 'Analytics'},
-        {'skill': 'UI/UX Design', 'base_sessions': 32, 'category': 'Design'},
-        {'skill': 'Cloud Computing', 'base_sessions': 28, 'category': 'Infrastructure'},
-        {'skill': 'Digital Marketing', 'base_sessions': 25, 'category': 'Marketing'},
-        {'skill': 'Blockchain', 'base_sessions': 22, 'category': 'Technology'},
-        {'skill': 'Cybersecurity', 'base_sessions': 20, 'category': 'Security'},
-        {'skill': 'Product Management', 'base_sessions': 18, 'category': 'Business'}
-    ]
+    """Get the fastest-growing skills across the platform over the last week"""
+    rows = SkillPhraseStat.objects.filter(phrase_matches(query)).values('phrase').annotate(
+        recent=Sum('recent_count'),
+        previous=Sum('previous_count'),
+        sessions=Sum('session_count')
+    ).filter(recent__gt=0).order_by('-recent')[:20]
     
-    suggestions = []
+    trending = []
+    for row in rows:
+        growth = SkillPhraseStat.calculate_growth(row['recent'], row['previous'])
+        if growth > 0:
+            trending.append((growth, row))
+    trending.sort(key=lambda item: item[0], reverse=True)
     
-    for skill_data in trending_skills:
-        skill = skill_data['skill']
-        if query.lower() in skill.lower():
-            session_count = skill_data['base_sessions']
-            if skill.lower().startswith(query.lower()):
-                session_count += 10  # Boost exact matches
-            
-            suggestions.append({
-                'skill': skill,
-                'sessions': session_count,
-                'category': skill_data['category'],
-                'trend': get_skill_trend(session_count)
-            })
+    suggestions = []
+    for growth, row in trending[:5]:
+        suggestions.append({
+            'skill': row['phrase'].title(),
+            'sessions': row['sessions'],
+            'category': 'Trending',
+            'trend': get_skill_trend(row['sessions'], growth)
+        })
     
     return suggestions
 
 
-def extract_skill_phrase(words, index, query):
-    """Extract a skill phrase from word list starting at index"""
-    try:
-        # Try to capture 1-3 words as a skill phrase
-        for length in [3, 2, 1]:
-            if index + length <= len(words):
-                phrase = ' '.join(words[index:index + length])
-                if query in phrase and len(phrase) <= 30:  # Reasonable skill name length
-                    return phrase.strip()
-        return query
-    except:
-        return query
+def apply_growth_trends(suggestions):
+    """Relabel suggestions whose phrases have statistics from their real week-over-week growth"""
+    by_phrase = {suggestion['skill'].lower(): suggestion for suggestion in suggestions}
+    rows = SkillPhraseStat.objects.filter(phrase__in=list(by_phrase)).values('phrase').annotate(
+        recent=Sum('recent_count'),
+        previous=Sum('previous_count')
+    )
+    for row in rows:
+        # title() does not always round-trip through lower() (apostrophes, some Unicode)
+        suggestion = by_phrase.get(row['phrase'])
+        if suggestion is None:
+            continue
+        growth = SkillPhraseStat.calculate_growth(row['recent'], row['previous'])
+        suggestion['trend'] = get_skill_trend(suggestion['sessions'], growth)
+
+
+def phrase_matches(query):
+    """Phrases with a word starting with the query"""
+    return Q(phrase__startswith=query) | Q(phrase__contains=f' {query}')
+
+
+def get_related_skills(query):
+    """Get skills related (via the skill graph) to known skills matching the query, with their active session counts"""
+    graph = get_skill_graph()
+    related = set()
+    
+    for skill in graph.skills():
+        if query in skill:
+            related.update(graph.related(skill))
+    
+    index = get_autocomplete_index()
+    suggestions = []
+    for skill in related:
+        session_count = index.session_count(skill)
+        suggestions.append({
+            'skill': skill.title(),
+            'sessions': session_count,
+            'category': 'Related',
+            'trend': get_skill_trend(session_count)
+        })
+    
+    return suggestions
 
 
 def categorize_skill(skill, domains):
@@ -263,13 +235,19 @@ def categorize_skill(skill, domains):
         return 'Technology'
 
 
-def get_skill_trend(session_count):
-    """Get trend indicator based on session count"""
-    if session_count >= 30:
+def get_skill_trend(session_count, growth=None):
+    """Get trend indicator from week-over-week growth when known, else from session count"""
+    if growth is not None:
+        if growth >= 1 and session_count >= 3:
+            return '🔥 Hot'
+        elif growth > 0.25:
+            return '📈 Growing'
+    elif session_count >= 30:
         return '🔥 Hot'
     elif session_count >= 20:
         return '📈 Growing'
-    elif session_count >= 10:
+    
+    if session_count >= 10:
         return '⭐ Popular'
     else:
-        return '💡 Emerging'
\ No newline at end of file
+        return '💡 Emerging'
@@ -13,7 +13,8 @@ from .forms import UserRegistrationForm, UserProfileForm, ProfileForm
 from .models import User
 from sessions.models import Session, Booking, Request
 from recommendations.recommendation_engine import get_recommendations_for_user, get_mentor_recommendations_for_user
-from django.db.models import Count, Avg, Q, Sum
+from django.db.models import Count, Avg, Q, Sum, Value
+from django.db.models.functions import Coalesce, NullIf
 
 def landing_page(request):
     """Coursera-style landing page with ONLY future sessions and real mentors"""
@@ -610,8 +611,8 @@ def admin_dashboard(request):
     
     # Top Performers
     top_mentors = User.objects.filter(role='mentor').annotate(
-        session_count=Count('mentor_sessions'),
-        avg_rating=Avg('mentor_sessions__feedback__rating')
+        session_count=Coalesce('mentor_stats__total_sessions', 0),
+        avg_rating=NullIf('mentor_stats__avg_rating', Value(0.0))
     ).order_by('-session_count')[:5]
     
     context = {